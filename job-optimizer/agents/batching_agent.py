@@ -26,6 +26,9 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from models.job import Job
 from models.machine import Machine, Constraint
 from models.schedule import Schedule, JobAssignment
+from utils.placement import MachineTimeline
+from utils.processing_times import ProcessingTimeMatrix
+from utils.resources import OperatorPool
 
 
 class BatchingAgent:
@@ -137,7 +140,7 @@ Format your response as specific recommendations."""
         2. Places rush jobs first in their product groups
         3. Sequences jobs to minimize setup transitions
         4. Distributes batches across available machines
-        5. SKIPS DOWNTIME WINDOWS
+        5. SKIPS DOWNTIME WINDOWS, filling idle gaps before them
         
         Args:
             jobs: List of jobs to schedule
@@ -163,11 +166,16 @@ Format your response as specific recommendations."""
         
         # Create schedule
         schedule = Schedule()
-        current_time = {m.machine_id: constraint.shift_start for m in machines}
-        current_product = {m.machine_id: None for m in machines}
         
-        # Distribute product groups across machines to balance load
-        machine_loads = {m.machine_id: 0 for m in machines}
+        # One timeline per machine: placement fills idle gaps (e.g. before
+        # downtime) instead of only appending at the end. Operators are
+        # shared by all timelines.
+        operators = OperatorPool(constraint.operators, machines)
+        timelines = {
+            m.machine_id: MachineTimeline(m, constraint, operators=operators)
+            for m in machines
+        }
+        durations = ProcessingTimeMatrix(jobs, machines)
         
         # Flatten jobs while preserving priority (rush first, then by product group)
         all_jobs_sorted = []
@@ -176,87 +184,27 @@ Format your response as specific recommendations."""
         
         for job in all_jobs_sorted:
             # Find best machine (compatible and least loaded)
-            compatible_machines = [
-                m for m in machines
-                if m.can_produce(job.product_type) and job.can_run_on(m.machine_id)
-            ]
+            compatible_machines = durations.compatible(job)
             
             if not compatible_machines:
                 continue
             
-            # Try machines in order of lowest load
-            compatible_machines.sort(key=lambda m: machine_loads[m.machine_id])
+            # Try machines in order of load plus this job's duration there,
+            # so faster machines win when loads are similar
+            compatible_machines.sort(
+                key=lambda m: timelines[m.machine_id].load + durations.duration(job.job_id, m.machine_id)
+            )
             
-            assigned = False
             for best_machine in compatible_machines:
-                machine_id = best_machine.machine_id
-                
-                # Calculate setup time
-                prev_product = current_product[machine_id]
-                if prev_product and prev_product != job.product_type:
-                    setup_time = constraint.get_setup_time(prev_product, job.product_type)
-                elif prev_product == job.product_type:
-                    setup_time = constraint.get_setup_time(job.product_type, job.product_type)
-                else:
-                    setup_time = 0  # First job on machine
-                
-                # Calculate proposed start and end times
-                start = current_time[machine_id]
-                start_minutes = start.hour * 60 + start.minute + setup_time
-                end_minutes = start_minutes + job.processing_time
-                
-                # Check if this time range overlaps with any downtime
-                proposed_start = time(start_minutes // 60, start_minutes % 60)
-                proposed_end = time(min(end_minutes // 60, 23), end_minutes % 60)
-                
-                # Check for downtime conflicts
-                has_conflict = False
-                for downtime in best_machine.downtime_windows:
-                    if downtime.overlaps_with(proposed_start, proposed_end):
-                        has_conflict = True
-                        # Skip past the downtime
-                        dt_end_minutes = downtime.end_time.hour * 60 + downtime.end_time.minute
-                        current_time[machine_id] = time(dt_end_minutes // 60, dt_end_minutes % 60)
-                        break
-                
-                if has_conflict:
-                    # Try again with updated time after downtime
-                    start = current_time[machine_id]
-                    start_minutes = start.hour * 60 + start.minute + setup_time
-                    end_minutes = start_minutes + job.processing_time
-                    
-                    proposed_start = time(start_minutes // 60, start_minutes % 60)
-                    proposed_end = time(min(end_minutes // 60, 23), end_minutes % 60)
-                    
-                    # Check again
-                    still_conflict = False
-                    for downtime in best_machine.downtime_windows:
-                        if downtime.overlaps_with(proposed_start, proposed_end):
-                            still_conflict = True
-                            break
-                    
-                    if still_conflict:
-                        # Can't fit on this machine, try next one
-                        continue
-                
-                # No conflict, create assignment
-                assignment = JobAssignment(
-                    job=job,
-                    machine_id=machine_id,
-                    start_time=proposed_start,
-                    end_time=proposed_end,
-                    setup_time_before=setup_time
-                )
-                
-                schedule.add_assignment(assignment)
-                
-                # Update tracking
-                current_time[machine_id] = proposed_end
-                current_product[machine_id] = job.product_type
-                machine_loads[machine_id] += job.processing_time + setup_time
-                
-                assigned = True
-                break  # Successfully assigned, move to next job
+                # Earliest gap that fits setup + processing, avoiding downtime
+                duration = durations.duration(job.job_id, best_machine.machine_id)
+                if timelines[best_machine.machine_id].place(job, duration=duration) is not None:
+                    break  # Successfully assigned, move to next job
+        
+        for machine_id, timeline in timelines.items():
+            machine_jobs = timeline.assignments()
+            if machine_jobs:
+                schedule.set_machine_jobs(machine_id, machine_jobs)
         
         # Generate explanation
         explanation = f"""BATCHING AGENT RECOMMENDATIONS:
@@ -267,10 +215,10 @@ IMPLEMENTATION:
 - Prioritized {sum(1 for j in jobs if j.is_rush)} rush jobs
 - Distributed across {len(machines)} machines
 - Sequenced jobs to minimize setup transitions
-- Avoided machine downtime windows
+- Avoided machine downtime windows (idle gaps before them are filled)
 
 RESULT:
-- Total jobs scheduled: {len(schedule.get_all_jobs())} / {len(jobs)}
+- Total jobs scheduled: {schedule.num_assignments} / {len(jobs)}
 - Product batching applied to reduce changeover time
 """
         
@@ -14,7 +14,7 @@ Uses Groq's llama-3.3-70b-versatile for load balancing decisions.
 """
 
 import os
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import time
 from collections import defaultdict
 
@@ -24,6 +24,14 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from models.job import Job
 from models.machine import Machine, Constraint
 from models.schedule import Schedule, JobAssignment
+from utils.load_flow import assign_load, sequence_assignment
+from utils.relief import relieve_bottlenecks
+from utils.processing_times import ProcessingTimeMatrix
+from utils.bounds import compute_lower_bounds, report_gap
+
+
+# Modes of rebalance_schedule()
+RELIEF_MODES = ("global", "incremental")
 
 
 class BottleneckAgent:
@@ -135,20 +143,52 @@ Provide specific recommendations."""
         schedule: Schedule,
         machines: List[Machine],
         constraint: Constraint,
-        all_jobs: List[Job]
+        all_jobs: List[Job],
+        gap_tolerance: Optional[float] = None,
+        mode: str = "global"
     ) -> Tuple[Schedule, str]:
         """
         Create a rebalanced schedule that reduces bottlenecks.
         
+        Modes:
+            global: reassign every job by min-cost flow and re-sequence
+                all machines (see utils.load_flow)
+            incremental: keep the input schedule and move only the jobs
+                needed to relieve overloaded machines; untouched machines
+                keep their batching sequence (see utils.relief)
+        
         Args:
             schedule: Original schedule (may be from batching agent)
             machines: List of available machines
             constraint: Scheduling constraints
             all_jobs: Complete list of all jobs
+            gap_tolerance: If set, return the original schedule unchanged
+                (without calling the LLM) when it is already within this
+                relative gap of the lower bound (see utils.bounds)
+            mode: "global" or "incremental"
             
         Returns:
             Tuple of (rebalanced Schedule, explanation)
+        
+        Raises:
+            ValueError: If the mode is unknown
         """
+        if mode not in RELIEF_MODES:
+            raise ValueError(f"Unknown relief mode '{mode}'. Use one of: {', '.join(RELIEF_MODES)}")
+        
+        if gap_tolerance is not None:
+            # Score a copy - the caller's schedule and KPIs stay untouched
+            candidate = schedule.copy()
+            candidate.calculate_kpis(machines, constraint)
+            is_valid, _ = candidate.validate(machines, constraint, jobs=all_jobs)
+            gap = report_gap(candidate, compute_lower_bounds(all_jobs, machines, constraint), constraint, all_jobs)
+            if is_valid and gap is not None and gap <= gap_tolerance:
+                explanation = (
+                    f"BOTTLENECK AGENT: schedule is within {gap:.1%} of the lower bound "
+                    f"(tolerance {gap_tolerance:.1%}); rebalancing skipped."
+                )
+                return candidate, explanation
+        
         # Get LLM analysis
         llm_analysis = self.analyze_load_distribution(schedule, machines, constraint)
         
@@ -165,100 +205,23 @@ Provide specific recommendations."""
         min_load = min(machine_loads.values()) if machine_loads else 0
         avg_load = sum(machine_loads.values()) / len(machines) if machines else 0
         
-        # Create new schedule with load balancing
-        new_schedule = Schedule()
-        remaining_jobs = all_jobs.copy()
+        if mode == "incremental":
+            return self._relieve_incrementally(schedule, machines, constraint, all_jobs, llm_analysis, max_load, min_load)
         
-        # Sort jobs by priority (rush first) then by processing time (longest first)
-        remaining_jobs.sort(
-            key=lambda j: (0 if j.is_rush else 1, -j.processing_time)
+        # Global load assignment: min-cost flow over compatibility classes
+        # (see utils.load_flow), then sequencing on gap-filling timelines
+        # that share one operator pool
+        durations = ProcessingTimeMatrix(all_jobs, machines)
+        assignment = assign_load(all_jobs, machines, constraint, reference=schedule, durations=durations)
+        new_schedule = sequence_assignment(
+            assignment, all_jobs, machines, constraint, durations,
+            created_by="Multi-Agent Optimizer"
         )
         
-        # Assign jobs using load-balancing strategy
-        current_time = {m.machine_id: constraint.shift_start for m in machines}
-        current_loads = {m.machine_id: 0 for m in machines}
-        current_product = {m.machine_id: None for m in machines}
-        
-        for job in remaining_jobs:
-            # Find compatible machines
-            compatible = [
-                m for m in machines
-                if m.can_produce(job.product_type) and job.can_run_on(m.machine_id)
-            ]
-            
-            if not compatible:
-                continue
-            
-            # Sort by current load (lowest first)
-            compatible.sort(key=lambda m: current_loads[m.machine_id])
-            
-            assigned = False
-            for best_machine in compatible:
-                machine_id = best_machine.machine_id
-                
-                # Calculate setup time
-                prev_product = current_product[machine_id]
-                if prev_product:
-                    setup_time = constraint.get_setup_time(prev_product, job.product_type)
-                else:
-                    setup_time = 0
-                
-                # Calculate proposed timing
-                start = current_time[machine_id]
-                start_minutes = start.hour * 60 + start.minute + setup_time
-                end_minutes = start_minutes + job.processing_time
-                
-                proposed_start = time(start_minutes // 60, start_minutes % 60)
-                proposed_end = time(min(end_minutes // 60, 23), end_minutes % 60)
-                
-                # Check for downtime conflicts
-                has_conflict = False
-                for downtime in best_machine.downtime_windows:
-                    if downtime.overlaps_with(proposed_start, proposed_end):
-                        has_conflict = True
-                        # Skip past the downtime
-                        dt_end_minutes = downtime.end_time.hour * 60 + downtime.end_time.minute
-                        current_time[machine_id] = time(dt_end_minutes // 60, dt_end_minutes % 60)
-                        break
-                
-                if has_conflict:
-                    # Try again after downtime
-                    start = current_time[machine_id]
-                    start_minutes = start.hour * 60 + start.minute + setup_time
-                    end_minutes = start_minutes + job.processing_time
-                    
-                    proposed_start = time(start_minutes // 60, start_minutes % 60)
-                    proposed_end = time(min(end_minutes // 60, 23), end_minutes % 60)
-                    
-                    # Check again
-                    still_conflict = False
-                    for downtime in best_machine.downtime_windows:
-                        if downtime.overlaps_with(proposed_start, proposed_end):
-                            still_conflict = True
-                            break
-                    
-                    if still_conflict:
-                        # Can't fit on this machine, try next one
-                        continue
-                
-                # No conflict, create assignment
-                assignment = JobAssignment(
-                    job=job,
-                    machine_id=machine_id,
-                    start_time=proposed_start,
-                    end_time=proposed_end,
-                    setup_time_before=setup_time
-                )
-                
-                new_schedule.add_assignment(assignment)
-                
-                # Update tracking
-                current_time[machine_id] = proposed_end
-                current_product[machine_id] = job.product_type
-                current_loads[machine_id] += job.processing_time + setup_time
-                
-                assigned = True
-                break  # Successfully assigned
+        current_loads = {
+            m.machine_id: sum(a.get_duration_minutes() for a in new_schedule.get_machine_jobs(m.machine_id))
+            for m in machines
+        }
         
         # Calculate improvement
         new_max_load = max(current_loads.values()) if current_loads else 0
@@ -282,11 +245,58 @@ Rebalanced Load Distribution:
 - Improvement: {improvement} min reduction in imbalance
 
 STRATEGY:
-- Used load-aware assignment (always choose least-loaded compatible machine)
+- Min-cost flow over {assignment.num_classes} job classes: optimal max load {assignment.max_load:.0f} min
+  (setup-aware: products stay on machines that already run them where possible)
+- Rounded to whole jobs and sequenced rush first, grouped by product
 - Preserved rush job priority
-- Avoided machine downtime windows
+- Avoided machine downtime windows (idle gaps before them are filled)
 - Balanced {len(all_jobs)} jobs across {len(machines)} machines
-- Successfully scheduled: {len(new_schedule.get_all_jobs())} / {len(all_jobs)} jobs
+- Successfully scheduled: {new_schedule.num_assignments} / {len(all_jobs)} jobs
+"""
+        
+        new_schedule.explanation = explanation
+        return new_schedule, explanation
+    
+    def _relieve_incrementally(
+        self,
+        schedule: Schedule,
+        machines: List[Machine],
+        constraint: Constraint,
+        all_jobs: List[Job],
+        llm_analysis: str,
+        max_load: int,
+        min_load: int
+    ) -> Tuple[Schedule, str]:
+        """Incremental mode of rebalance_schedule(): move as few jobs as possible."""
+        new_schedule, relief = relieve_bottlenecks(schedule, machines, constraint, all_jobs)
+        
+        current_loads = {
+            m.machine_id: sum(a.get_duration_minutes() for a in new_schedule.get_machine_jobs(m.machine_id))
+            for m in machines
+        }
+        new_max_load = max(current_loads.values()) if current_loads else 0
+        new_min_load = min(current_loads.values()) if current_loads else 0
+        moves = "\n".join(f"  - {move}" for move in relief.moves) or "  - none needed"
+        
+        explanation = f"""BOTTLENECK AGENT ANALYSIS:
+{llm_analysis}
+
+INCREMENTAL BOTTLENECK RELIEF:
+- Achievable max load: {relief.target_load:.0f} min
+- Overloaded machines: {', '.join(relief.overloaded) or 'none'}
+- Max load: {max_load} -> {new_max_load} min
+- Imbalance: {max_load - min_load} -> {new_max_load - new_min_load} min
+
+JOBS MOVED ({len(relief.moves)} of {schedule.num_assignments}):
+{moves}
+
+STRATEGY:
+- Started from the input schedule; only overloaded machines gave up jobs
+- Each move takes the job that best covers the machine's excess load
+- Targets already running the job's product are preferred (keeps batches)
+- Machines without moves keep their sequence and times unchanged
+- Placed {len(relief.placed)} previously unscheduled job(s)
+- Successfully scheduled: {new_schedule.num_assignments} / {len(all_jobs)} jobs
 """
         
         new_schedule.explanation = explanation
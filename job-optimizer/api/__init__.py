@@ -0,0 +1 @@
+"""API package - headless HTTP scheduling service (see api/server.py)"""
@@ -0,0 +1,247 @@
+"""
+Scheduling Service - Headless HTTP API for n8n and other automation
+
+Exposes the schedulers over HTTP so workflows can call them without the
+Streamlit UI:
+
+    POST /schedule      jobs (+ optional machines/constraint) -> schedule
+    POST /reschedule    schedule + breakdown -> repaired schedule (or stable re-plan)
+    POST /compare       jobs -> all strategies side by side (KPIs + runtime)
+    POST /insert        schedule + newly arrived jobs -> schedule with them inserted
+    GET  /health        liveness
+    GET  /ready         readiness plus queue statistics
+
+Requests are solved on a process pool so CPU-heavy scheduling never
+blocks the event loop. At most SCHEDULER_WORKERS requests run at once;
+up to SCHEDULER_MAX_QUEUE more wait in line, and anything beyond that is
+rejected with 503 so callers can back off and retry.
+
+Run locally:
+    uvicorn api.server:app --port 8000
+    curl -X POST localhost:8000/schedule -H 'Content-Type: application/json' \\
+         -d '{"jobs": [...], "strategy": "baseline", "rule": "atcs"}'
+
+Configuration (environment variables):
+    SCHEDULER_WORKERS     Worker processes (default: CPU count)
+    SCHEDULER_MAX_QUEUE   Requests allowed to wait (default: 4 x workers)
+    SCHEDULER_TIMEOUT_S   Per-request timeout in seconds (default: 60)
+    SCHEDULER_CACHE_SIZE  Results cached in memory per worker (default: 128)
+    SCHEDULER_CACHE_DIR   Folder for a shared on-disk result cache (optional)
+"""
+
+import asyncio
+import os
+import sys
+import time as clock
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Tuple
+
+from fastapi import FastAPI, HTTPException, Request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.worker import (
+    RequestError, run_schedule_request, run_reschedule_request, run_compare_request, run_insert_request
+)
+
+
+class WorkerPool:
+    """
+    Process pool with a bounded waiting line.
+
+    Admission is decided up front: if the line is full the request is
+    rejected immediately instead of piling up behind a slow backlog.
+
+    A worker slot is held until the job in the worker process actually
+    finishes, not until the request gives up: a request that times out
+    answers 504 but its slot stays taken while the solver keeps running,
+    so no more than `workers` jobs ever run at once. If a worker process
+    dies, the pool is replaced so later requests don't all fail.
+    """
+
+    def __init__(self, workers: int, max_queue: int, timeout_s: float):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout_s = timeout_s
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self._slots = asyncio.Semaphore(workers)
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.restarts = 0
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        """Replace a broken executor (once, however many requests saw it break)."""
+        if self.executor is not broken:
+            return
+        self.restarts += 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _start(self, handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+               payload: Dict[str, Any]) -> Tuple[ProcessPoolExecutor, Future]:
+        """Submit to the executor, replacing it first if it is already broken."""
+        executor = self.executor
+        try:
+            return executor, executor.submit(handler, payload)
+        except BrokenProcessPool:
+            self._restart(executor)
+            return self.executor, self.executor.submit(handler, payload)
+
+    async def submit(self, handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+                     payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a handler in the pool, waiting for a free worker if needed.
+
+        Raises:
+            HTTPException: 503 when the line is full, 504 on timeout,
+                400 for invalid requests, 500 for solver errors
+        """
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="scheduler busy, retry later",
+                                headers={"Retry-After": "1"})
+
+        queued_at = clock.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        queue_ms = (clock.perf_counter() - queued_at) * 1000
+
+        loop = asyncio.get_running_loop()
+
+        def release():
+            self.running -= 1
+            self._slots.release()
+
+        self.running += 1
+        try:
+            executor, job = self._start(handler, payload)
+        except Exception as e:
+            release()
+            self.failed += 1
+            raise HTTPException(status_code=500, detail=f"scheduling failed: {e}")
+        def on_done(_):
+            try:
+                loop.call_soon_threadsafe(release)
+            except RuntimeError:
+                pass  # Event loop already closed (shutdown)
+
+        # The slot is freed when the worker is done, even after a timeout
+        job.add_done_callback(on_done)
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(job), timeout=self.timeout_s)
+        except asyncio.TimeoutError:
+            self.failed += 1
+            raise HTTPException(status_code=504, detail=f"scheduling exceeded {self.timeout_s:.0f}s")
+        except RequestError as e:
+            self.failed += 1
+            raise HTTPException(status_code=400, detail=str(e))
+        except BrokenProcessPool:
+            self.failed += 1
+            self._restart(executor)
+            raise HTTPException(status_code=500, detail="scheduling failed: worker process crashed")
+        except Exception as e:
+            self.failed += 1
+            raise HTTPException(status_code=500, detail=f"scheduling failed: {e}")
+
+        self.completed += 1
+        result.setdefault("timings", {})["queue_ms"] = round(queue_ms, 2)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "restarts": self.restarts
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    workers = int(os.getenv("SCHEDULER_WORKERS", os.cpu_count() or 1))
+    app.state.pool = WorkerPool(
+        workers=workers,
+        max_queue=int(os.getenv("SCHEDULER_MAX_QUEUE", 4 * workers)),
+        timeout_s=float(os.getenv("SCHEDULER_TIMEOUT_S", 60))
+    )
+    app.state.started = clock.time()
+    yield
+    app.state.pool.shutdown()
+
+
+app = FastAPI(title="Multi-Agent Job Optimizer", lifespan=lifespan)
+
+
+async def _json_body(request: Request) -> Dict[str, Any]:
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="body must be valid JSON")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="body must be a JSON object")
+    return payload
+
+
+@app.post("/schedule")
+async def schedule(request: Request) -> Dict[str, Any]:
+    """Create a schedule with the requested strategy."""
+    return await request.app.state.pool.submit(run_schedule_request, await _json_body(request))
+
+
+@app.post("/reschedule")
+async def reschedule(request: Request) -> Dict[str, Any]:
+    """Repair a running schedule after a machine breakdown."""
+    return await request.app.state.pool.submit(run_reschedule_request, await _json_body(request))
+
+
+@app.post("/compare")
+async def compare(request: Request) -> Dict[str, Any]:
+    """Run several strategies concurrently and compare KPIs and runtime."""
+    return await request.app.state.pool.submit(run_compare_request, await _json_body(request))
+
+
+@app.post("/insert")
+async def insert(request: Request) -> Dict[str, Any]:
+    """Insert newly arrived jobs into the current schedule."""
+    return await request.app.state.pool.submit(run_insert_request, await _json_body(request))
+
+
+@app.get("/health")
+async def health() -> Dict[str, Any]:
+    """Liveness probe."""
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready(request: Request) -> Dict[str, Any]:
+    """Readiness probe: not ready while the waiting line is full."""
+    pool = request.app.state.pool
+    if pool.waiting >= pool.max_queue:
+        raise HTTPException(status_code=503, detail=pool.stats())
+    return {
+        "status": "ready",
+        "uptime_s": round(clock.time() - request.app.state.started, 1),
+        "pool": pool.stats()
+    }
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.getenv("SCHEDULER_HOST", "0.0.0.0"), port=int(os.getenv("SCHEDULER_PORT", 8000)))
@@ -0,0 +1,481 @@
+"""
+API Worker - Request handlers that run inside the worker pool
+
+Each handler takes the decoded JSON body and returns a JSON-ready dict.
+Only plain dicts cross the process boundary, so pickling stays cheap and
+the handlers can run in any executor.
+
+Request format (all plant fields optional, defaulting to
+config/default_policy.yaml):
+
+    {
+      "jobs": [Job.to_dict(), ...],
+      "machines": [{"machine_id": "M1", "capabilities": ["P_A"], ...}],
+      "constraint": {"shift": {...}, "setup_times": {...}, ...},
+      "strategy": "anytime" | "baseline" | "batching" | "bottleneck",
+      "rule": "atcs",
+      "relief": "global" | "incremental",
+      "budget_ms": 5000,
+      "decompose": false,
+      "seed": Schedule.to_dict() of the previous plan (optional),
+      "cache": true
+    }
+
+machines and constraint use the same layout as the YAML config file.
+Results are cached per worker process by a content hash of the request
+(see utils.result_cache); set SCHEDULER_CACHE_DIR to share an on-disk
+cache between workers, or send "cache": false to force a fresh run.
+
+With a seed, jobs that were already in the previous plan keep their
+machine and order and new jobs are inserted (see utils.warm_start); the
+improvers then start from there instead of from scratch.
+"""
+
+import hashlib
+import json
+import os
+import time as clock
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.job import Job
+from models.machine import Machine, Constraint
+from models.schedule import Schedule, JobAssignment
+from utils.config_loader import (
+    load_plant_model, load_constraint_from_config, load_machines_from_config,
+    validate_plant, parse_time
+)
+from utils.result_cache import ScheduleCache
+
+
+STRATEGIES = ("anytime", "baseline", "batching", "bottleneck")
+
+# One cache per worker process; the optional disk tier is shared
+RESULT_CACHE = ScheduleCache(
+    max_entries=int(os.getenv("SCHEDULER_CACHE_SIZE", 128)),
+    directory=os.getenv("SCHEDULER_CACHE_DIR") or None
+)
+
+
+class RequestError(ValueError):
+    """The request body is invalid (reported as HTTP 400)."""
+
+
+def parse_plant(payload: Dict[str, Any]) -> Tuple[List[Machine], Constraint]:
+    """
+    Build machines and constraint from a request, falling back to the
+    default config for whatever is missing.
+
+    Raises:
+        RequestError: If the plant is invalid
+    """
+    try:
+        if "machines" in payload:
+            machines = load_machines_from_config(payload)
+        else:
+            machines = load_plant_model().fresh_machines()
+        if "constraint" in payload:
+            constraint = load_constraint_from_config(payload["constraint"])
+        else:
+            constraint = load_plant_model().fresh_constraint()
+    except (KeyError, TypeError, ValueError) as e:
+        raise RequestError(f"invalid plant: {e}") from e
+
+    problems = validate_plant(constraint, machines)
+    if problems:
+        raise RequestError("invalid plant: " + "; ".join(problems))
+    return machines, constraint
+
+
+def parse_jobs(payload: Dict[str, Any]) -> List[Job]:
+    """
+    Build jobs from a request.
+
+    Raises:
+        RequestError: If any job is invalid
+    """
+    jobs = []
+    for index, data in enumerate(payload.get("jobs") or []):
+        try:
+            jobs.append(Job.from_dict(data))
+        except (KeyError, TypeError, ValueError) as e:
+            raise RequestError(f"invalid job #{index}: {e}") from e
+    if not jobs:
+        raise RequestError("no jobs given")
+    return jobs
+
+
+def parse_schedule(data: Dict[str, Any], jobs: List[Job], keep_unknown: bool = False) -> Schedule:
+    """
+    Rebuild a Schedule from Schedule.to_dict() output (including the
+    dates of multi-day assignments).
+
+    Args:
+        data: Schedule.to_dict() output
+        jobs: Jobs the assignments refer to
+        keep_unknown: Rebuild jobs missing from `jobs` from the assignment
+            row instead of failing (e.g. orders cancelled since the plan)
+
+    Raises:
+        RequestError: If an assignment references an unknown job
+    """
+    jobs_by_id = {job.job_id: job for job in jobs}
+    schedule = Schedule(created_by=data.get("created_by", "Multi-Agent Optimizer"))
+    try:
+        for machine_id, rows in (data.get("assignments") or {}).items():
+            for row in rows:
+                job = jobs_by_id.get(row["job_id"])
+                if job is None:
+                    if not keep_unknown:
+                        raise KeyError(row["job_id"])
+                    job = Job(row["job_id"], row.get("product_type", ""), max(int(row.get("processing_time") or 1), 1),
+                              parse_time(row["end_time"]), machine_options=[machine_id],
+                              due_date=date.fromisoformat(row["end_date"]) if row.get("end_date") else None)
+                schedule.add_assignment(JobAssignment(
+                    job=job,
+                    machine_id=machine_id,
+                    start_time=parse_time(row["start_time"]),
+                    end_time=parse_time(row["end_time"]),
+                    setup_time_before=int(row.get("setup_time_before", 0)),
+                    processing_minutes=row.get("processing_time"),
+                    start_date=date.fromisoformat(row["start_date"]) if row.get("start_date") else None,
+                    end_date=date.fromisoformat(row["end_date"]) if row.get("end_date") else None,
+                    operator_id=row.get("operator_id")
+                ))
+    except KeyError as e:
+        raise RequestError(f"schedule references unknown job or misses field {e}") from e
+    except (TypeError, ValueError) as e:
+        raise RequestError(f"invalid schedule: {e}") from e
+    return schedule
+
+
+def parse_seed(payload: Dict[str, Any], jobs: List[Job]) -> Optional[Schedule]:
+    """
+    Previous schedule to warm-start from, if the request has one. Jobs
+    that are no longer in the job list are allowed (they are dropped).
+
+    Raises:
+        RequestError: If the seed is not a valid schedule
+    """
+    if not payload.get("seed"):
+        return None
+    return parse_schedule(payload["seed"], jobs, keep_unknown=True)
+
+
+def _better_of_seed(
+    schedule: Schedule,
+    explanation: str,
+    seed: Optional[Schedule],
+    jobs: List[Job],
+    machines: List[Machine],
+    constraint: Constraint
+) -> Tuple[Schedule, str]:
+    """The mapped seed instead of a from-scratch schedule, if it ranks better."""
+    if seed is None:
+        return schedule, explanation
+    from utils.anytime import WarmStartStrategy, _rank
+    seeded = WarmStartStrategy(seed).run(jobs, machines, constraint, None, lambda: False)
+    if _rank(seeded[0], machines, constraint, jobs) < _rank(schedule, machines, constraint, jobs):
+        return seeded
+    return schedule, explanation
+
+
+def _run_strategy(
+    jobs: List[Job],
+    machines: List[Machine],
+    constraint: Constraint,
+    payload: Dict[str, Any],
+    seed: Optional[Schedule] = None
+) -> Tuple[Schedule, str, Dict[str, Any]]:
+    """Run the requested strategy; returns (schedule, explanation, extra info)."""
+    strategy = payload.get("strategy", "anytime")
+    rule = payload.get("rule", "atcs")
+
+    if payload.get("decompose") and strategy != "anytime":
+        # Solve each independent machine group on its own. The server
+        # already runs requests in parallel, so components run in-process.
+        from utils.comparison import build_strategy
+        from utils.decomposition import find_components, solve_decomposed
+        names = {"baseline": f"baseline:{rule}", "batching": "batching",
+                 "bottleneck": f"batching+bottleneck:{payload.get('relief', 'global')}"}
+        if strategy not in names:
+            raise RequestError(f"unknown strategy '{strategy}', expected one of {', '.join(STRATEGIES)}")
+        try:
+            inner = build_strategy(names[strategy])
+        except ValueError as e:
+            raise RequestError(str(e)) from e
+        components = find_components(jobs, machines, constraint)
+        schedule, explanation = solve_decomposed(jobs, machines, constraint, inner, max_workers=1,
+                                                 components=components, seed=seed)
+        return schedule, explanation, {"components": len(components)}
+
+    if strategy == "baseline":
+        from utils.baseline_scheduler import BaselineScheduler
+        try:
+            schedule, explanation = BaselineScheduler(rule).schedule(jobs, machines, constraint)
+        except ValueError as e:
+            raise RequestError(str(e)) from e
+        schedule, explanation = _better_of_seed(schedule, explanation, seed, jobs, machines, constraint)
+        return schedule, explanation, {}
+
+    if strategy in ("batching", "bottleneck"):
+        from agents.batching_agent import BatchingAgent
+        mode = payload.get("relief", "global")
+        if strategy == "bottleneck" and mode not in ("global", "incremental"):
+            raise RequestError(f"unknown relief mode '{mode}', expected 'global' or 'incremental'")
+        if strategy == "bottleneck" and seed is not None:
+            # Rebalance the mapped seed instead of batching from scratch
+            from utils.anytime import WarmStartStrategy
+            schedule, explanation = WarmStartStrategy(seed).run(jobs, machines, constraint, None, lambda: False)
+        else:
+            schedule, explanation = BatchingAgent().create_batched_schedule(jobs, machines, constraint)
+            schedule, explanation = _better_of_seed(schedule, explanation, seed, jobs, machines, constraint)
+        if strategy == "bottleneck":
+            from agents.bottleneck_agent import BottleneckAgent
+            schedule, explanation = BottleneckAgent().rebalance_schedule(schedule, machines, constraint, jobs,
+                                                                         mode=mode)
+        schedule.calculate_kpis(machines, constraint)
+        return schedule, explanation, {}
+
+    if strategy == "anytime":
+        from utils.anytime import optimize, BaselineStrategy
+        strategies = None
+        if payload.get("use_agents") is False:
+            strategies = [BaselineStrategy("atcs"), BaselineStrategy("edd")]
+        result = optimize(
+            jobs, machines, constraint,
+            budget_ms=int(payload.get("budget_ms", 5000)),
+            strategies=strategies,
+            gap_tolerance=float(payload.get("gap_tolerance", 0.0)),
+            seed=seed
+        )
+        return result.schedule, result.explanation, {
+            "strategy_used": result.strategy,
+            "timed_out": result.timed_out,
+            "progress": [
+                {"strategy": p.strategy, "elapsed_ms": p.elapsed_ms,
+                 "improved": p.improved, "message": p.message}
+                for p in result.history
+            ]
+        }
+
+    raise RequestError(f"unknown strategy '{strategy}', expected one of {', '.join(STRATEGIES)}")
+
+
+def _cache_name(payload: Dict[str, Any]) -> str:
+    """Strategy name plus every option that changes its result."""
+    name = ":".join(str(payload.get(option, "")) for option in
+                    ("strategy", "rule", "relief", "budget_ms", "use_agents", "gap_tolerance", "decompose"))
+    if payload.get("seed"):
+        seed = json.dumps(payload["seed"], sort_keys=True, separators=(",", ":"), default=str)
+        name += ":seed=" + hashlib.blake2b(seed.encode(), digest_size=10).hexdigest()
+    return name
+
+
+def run_schedule_request(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Handle POST /schedule.
+
+    Returns:
+        {"schedule": Schedule.to_dict(), "violations": [...], "timings": {...}, ...}
+    """
+    started = clock.perf_counter()
+    jobs = parse_jobs(payload)
+    machines, constraint = parse_plant(payload)
+    seed = parse_seed(payload, jobs)
+    parsed = clock.perf_counter()
+
+    if payload.get("cache", True):
+        extra: Dict[str, Any] = {"cached": True}
+
+        def compute():
+            schedule, explanation, info = _run_strategy(jobs, machines, constraint, payload, seed)
+            extra.update(info, cached=False)
+            return schedule, explanation
+
+        schedule, explanation = RESULT_CACHE.get_or_compute(
+            jobs, machines, constraint, _cache_name(payload), compute
+        )
+    else:
+        schedule, explanation, extra = _run_strategy(jobs, machines, constraint, payload, seed)
+    solved = clock.perf_counter()
+
+    response = {
+        "schedule": schedule.to_dict(),
+        "explanation": explanation,
+        "violations": [v.to_dict() for v in schedule.check(machines, constraint, jobs)],
+        "timings": {
+            "parse_ms": round((parsed - started) * 1000, 2),
+            "solve_ms": round((solved - parsed) * 1000, 2),
+            "total_ms": round((clock.perf_counter() - started) * 1000, 2)
+        }
+    }
+    response.update(extra)
+    return response
+
+
+def run_compare_request(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Handle POST /compare: run several strategies concurrently.
+
+    Extra request fields:
+        strategies: Optional list of names such as "baseline:atcs",
+            "batching", "batching+bottleneck" (see utils.comparison)
+        include_schedules: Return every schedule, not just the KPI table
+            (default: true)
+        timeout_s: Report strategies still running after this as timed out
+        seed: Previous schedule; every strategy starts from it mapped onto
+            the jobs, and "warm-start" can be used in strategy names
+
+    Returns:
+        StrategyComparison.to_dict() plus timings
+    """
+    from utils.comparison import build_strategy, compare_strategies
+
+    started = clock.perf_counter()
+    jobs = parse_jobs(payload)
+    machines, constraint = parse_plant(payload)
+    seed = parse_seed(payload, jobs)
+    try:
+        strategies = ([build_strategy(name, seed) for name in payload["strategies"]]
+                      if payload.get("strategies") else None)
+        timeout_s = float(payload["timeout_s"]) if payload.get("timeout_s") else None
+    except (TypeError, ValueError) as e:
+        raise RequestError(str(e)) from e
+    parsed = clock.perf_counter()
+
+    comparison = compare_strategies(jobs, machines, constraint, strategies=strategies, timeout_s=timeout_s,
+                                    seed=seed)
+    solved = clock.perf_counter()
+
+    response = comparison.to_dict(include_schedules=bool(payload.get("include_schedules", True)))
+    response["timings"] = {
+        "parse_ms": round((parsed - started) * 1000, 2),
+        "solve_ms": round((solved - parsed) * 1000, 2),
+        "total_ms": round((clock.perf_counter() - started) * 1000, 2)
+    }
+    return response
+
+
+def run_reschedule_request(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Handle POST /reschedule: update the plan being executed.
+
+    Modes:
+        repair (default): repair the schedule after a machine breakdown
+        stable: re-plan the current job list against the schedule, trading
+            quality for fewer changes (objective_weights.stability in the
+            constraint; see utils.rescheduler.reschedule_stable)
+
+    Extra request fields:
+        schedule: Schedule.to_dict() output of the plan being executed
+        mode: "repair" or "stable"
+        machine_id: Machine that broke down (optional in stable mode)
+        downtime: {"start_time": "HH:MM", "end_time": "HH:MM", "reason": "..."}
+        now: Optional "HH:MM"; assignments started before it are frozen
+
+    Returns:
+        {"schedule": Schedule.to_dict(), "diff": ScheduleDiff.to_dict(), "timings": {...}, ...}
+    """
+    from utils.rescheduler import repair_after_downtime, reschedule_stable
+
+    started = clock.perf_counter()
+    mode = payload.get("mode", "repair")
+    if mode not in ("repair", "stable"):
+        raise RequestError(f"unknown mode '{mode}', expected 'repair' or 'stable'")
+    jobs = parse_jobs(payload)
+    machines, constraint = parse_plant(payload)
+    schedule = parse_schedule(payload.get("schedule") or {}, jobs, keep_unknown=mode == "stable")
+
+    machine_id = payload.get("machine_id")
+    machine = next((m for m in machines if m.machine_id == machine_id), None)
+    if machine is None and (mode == "repair" or machine_id is not None):
+        raise RequestError(f"unknown machine_id '{machine_id}'")
+    window = None
+    try:
+        if machine is not None:
+            window_data = payload["downtime"]
+            window = machine.add_downtime(
+                parse_time(window_data["start_time"]),
+                parse_time(window_data["end_time"]),
+                window_data.get("reason", "Breakdown")
+            )
+        now = parse_time(payload["now"]) if payload.get("now") else None
+    except (KeyError, TypeError, ValueError) as e:
+        raise RequestError(f"invalid downtime: {e}") from e
+    parsed = clock.perf_counter()
+
+    if mode == "stable":
+        repaired, explanation = reschedule_stable(schedule, jobs, machines, constraint, now)
+    else:
+        repaired, explanation = repair_after_downtime(schedule, machines, constraint, machine_id, window, now)
+        repaired.calculate_kpis(machines, constraint, reference=schedule)
+    solved = clock.perf_counter()
+
+    return {
+        "schedule": repaired.to_dict(),
+        "explanation": explanation,
+        "diff": repaired.diff(schedule).to_dict(),
+        "violations": [v.to_dict() for v in repaired.check(machines, constraint, jobs)],
+        "timings": {
+            "parse_ms": round((parsed - started) * 1000, 2),
+            "solve_ms": round((solved - parsed) * 1000, 2),
+            "total_ms": round((clock.perf_counter() - started) * 1000, 2)
+        }
+    }
+
+
+def run_insert_request(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Handle POST /insert: add newly arrived jobs to the current schedule
+    without re-planning it (see utils.online).
+
+    Extra request fields:
+        schedule: Schedule.to_dict() output of the current plan
+        now: Optional "HH:MM"; nothing is placed or moved before it
+
+    Every job in "jobs" that is not in the schedule yet is inserted, in
+    the order given; the jobs already in the schedule provide due times
+    and priorities for pricing.
+
+    Returns:
+        {"schedule": Schedule.to_dict(), "insertions": [...], "unplaced": [...], "timings": {...}, ...}
+    """
+    from utils.online import OnlineScheduler
+
+    started = clock.perf_counter()
+    jobs = parse_jobs(payload)
+    machines, constraint = parse_plant(payload)
+    schedule = parse_schedule(payload.get("schedule") or {}, jobs)
+    try:
+        now = parse_time(payload["now"]) if payload.get("now") else None
+    except (TypeError, ValueError) as e:
+        raise RequestError(f"invalid now: {e}") from e
+    try:
+        online = OnlineScheduler(schedule, machines, constraint)
+    except ValueError as e:
+        raise RequestError(str(e)) from e
+    parsed = clock.perf_counter()
+
+    insertions, unplaced = [], []
+    for job in jobs:
+        if job.job_id in schedule:
+            continue
+        insertion = online.insert_job(job, now)
+        if insertion is None:
+            unplaced.append(job.job_id)
+        else:
+            insertions.append(insertion.to_dict())
+    solved = clock.perf_counter()
+
+    return {
+        "schedule": online.schedule.to_dict(),
+        "insertions": insertions,
+        "unplaced": unplaced,
+        "violations": [v.to_dict() for v in online.schedule.check(machines, constraint, jobs)],
+        "timings": {
+            "parse_ms": round((parsed - started) * 1000, 2),
+            "solve_ms": round((solved - parsed) * 1000, 2),
+            "total_ms": round((clock.perf_counter() - started) * 1000, 2)
+        }
+    }
@@ -6,6 +6,10 @@ This package contains all data structures used throughout the system:
 - Machine: Represents a production machine with constraints
 - Schedule: Represents a complete production schedule
 - KPI: Key Performance Indicators for schedule evaluation
+- Violation: Structured constraint violation found by Schedule.check()
+- ScheduleDiff: Changes against a reference schedule, from Schedule.diff()
+- PlanningHorizon: Multi-day calendar with several shifts per day
+- Operator: Machine operator with skills (shared resource)
 """
 
-__all__ = ['Job', 'Machine', 'Schedule', 'KPI', 'Constraint']
+__all__ = ['Job', 'Machine', 'Schedule', 'KPI', 'Violation', 'ScheduleDiff', 'Constraint', 'PlanningHorizon', 'Operator']
@@ -5,7 +5,9 @@ Day 1: Core data model created
 
 from dataclasses import dataclass, field
 from datetime import time
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
+
+from models.operator import Operator
 
 
 @dataclass
@@ -33,10 +35,17 @@ class Constraint:
     tardiness_weight: float = 1.0        # How much we care about meeting deadlines
     setup_weight: float = 0.5            # How much we care about minimizing setups
     utilization_weight: float = 0.3      # How much we care about balancing load
+    stability_weight: float = 0.0        # How much we care about not changing a previous plan
     
     # WIP (Work in Progress) limits
     max_wip_per_machine: Optional[int] = None
     
+    # Rest break inserted when a machine hits max_continuous_runtime
+    rest_break_minutes: int = 15
+    
+    # Operator pool shared by all machines (empty = operators not modelled)
+    operators: List[Operator] = field(default_factory=list)
+    
     def get_setup_time(self, from_product: str, to_product: str) -> int:
         """
         Get setup time required when switching from one product to another.
@@ -96,7 +105,10 @@ class Constraint:
             "tardiness_weight": self.tardiness_weight,
             "setup_weight": self.setup_weight,
             "utilization_weight": self.utilization_weight,
-            "max_wip_per_machine": self.max_wip_per_machine
+            "stability_weight": self.stability_weight,
+            "max_wip_per_machine": self.max_wip_per_machine,
+            "rest_break_minutes": self.rest_break_minutes,
+            "operators": [operator.to_dict() for operator in self.operators]
         }
     
     def __str__(self) -> str:
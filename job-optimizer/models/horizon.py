@@ -0,0 +1,316 @@
+"""
+Planning Horizon Model - Multi-day calendars with several shifts per day
+
+Constraint describes a single shift on a single day. PlanningHorizon
+extends this to a calendar of consecutive days so that work can be placed
+across a whole week without spilling past midnight.
+
+Key Features:
+    - Several shifts per day (including shifts that cross midnight)
+    - Non-working weekdays
+    - Downtime specified per calendar date and machine
+    - Absolute "horizon minutes" timeline with bisect-based calendar lookups
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from models.job import Job
+from models.machine import Machine, Constraint, DowntimeWindow
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass
+class ShiftWindow:
+    """
+    A working shift within a day.
+
+    A shift whose end_time is not after its start_time crosses midnight
+    (e.g. 22:00-06:00 is a night shift).
+    """
+    start_time: time
+    end_time: time
+    name: str = "Day"
+
+    def to_offsets(self) -> Tuple[int, int]:
+        """
+        Get shift boundaries as minutes from the start of its day.
+
+        Returns:
+            Tuple of (start_offset, end_offset); end may exceed 1440
+        """
+        start = self.start_time.hour * 60 + self.start_time.minute
+        end = self.end_time.hour * 60 + self.end_time.minute
+        if end <= start:
+            end += MINUTES_PER_DAY
+        return start, end
+
+    def __str__(self) -> str:
+        return f"Shift({self.name}: {self.start_time}-{self.end_time})"
+
+
+@dataclass
+class PlanningHorizon:
+    """
+    Represents a multi-day planning calendar.
+
+    All positions on the calendar are expressed in "horizon minutes":
+    minutes since midnight of start_date.
+
+    Machine.downtime_windows are treated as recurring every day; one-off
+    downtime is recorded per date with add_downtime().
+
+    Example:
+        >>> horizon = PlanningHorizon(
+        ...     start_date=date(2024, 3, 4),
+        ...     num_days=7,
+        ...     shifts=[ShiftWindow(time(6, 0), time(14, 0), "Early"),
+        ...             ShiftWindow(time(14, 0), time(22, 0), "Late")],
+        ...     non_working_weekdays=[6]   # Sunday
+        ... )
+    """
+
+    start_date: date
+    num_days: int = 1
+    shifts: List[ShiftWindow] = field(
+        default_factory=lambda: [ShiftWindow(time(8, 0), time(16, 0))]
+    )
+    non_working_weekdays: List[int] = field(default_factory=list)  # 0=Monday ... 6=Sunday
+
+    # Date -> Machine ID -> one-off downtime windows on that date
+    downtime_by_date: Dict[date, Dict[str, List[DowntimeWindow]]] = field(default_factory=dict)
+
+    # Machine ID -> (interval starts, interval ends), built lazily
+    _calendars: Dict[str, Tuple[List[int], List[int]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_constraint(cls, constraint: Constraint, start_date: date, num_days: int = 1) -> 'PlanningHorizon':
+        """
+        Build a horizon that repeats the constraint's shift every day.
+
+        Overtime is folded into the shift end.
+
+        Args:
+            constraint: Single-shift constraint
+            start_date: First day of the horizon
+            num_days: Number of days to plan
+
+        Returns:
+            PlanningHorizon instance
+        """
+        end = datetime.combine(start_date, constraint.shift_end) + timedelta(
+            minutes=constraint.max_overtime_minutes
+        )
+        return cls(
+            start_date=start_date,
+            num_days=num_days,
+            shifts=[ShiftWindow(constraint.shift_start, end.time())]
+        )
+
+    @property
+    def end_minute(self) -> int:
+        """Horizon minute at which the last shift of the horizon ends."""
+        last_end = max((shift.to_offsets()[1] for shift in self.shifts), default=0)
+        return (self.num_days - 1) * MINUTES_PER_DAY + last_end
+
+    def dates(self) -> List[date]:
+        """Get all calendar dates covered by the horizon."""
+        return [self.start_date + timedelta(days=d) for d in range(self.num_days)]
+
+    def due_date_of(self, job: Job) -> date:
+        """
+        Date a job is due on this horizon.
+
+        Jobs without a due_date are due on the first day of the horizon,
+        like an order without a date in a single-shift plan is due today.
+
+        Args:
+            job: Job to look up
+
+        Returns:
+            The job's due_date, or start_date if it has none
+        """
+        return job.due_date or self.start_date
+
+    def is_working_day(self, day: date) -> bool:
+        """Check if shifts run on the given date."""
+        return day.weekday() not in self.non_working_weekdays
+
+    def minute_of(self, moment: datetime) -> int:
+        """
+        Convert a datetime to horizon minutes.
+
+        Args:
+            moment: Datetime to convert
+
+        Returns:
+            Minutes since midnight of start_date
+        """
+        delta = moment - datetime.combine(self.start_date, time(0, 0))
+        return int(delta.total_seconds() // 60)
+
+    def datetime_at(self, minute: int) -> datetime:
+        """
+        Convert horizon minutes to a datetime.
+
+        Args:
+            minute: Minutes since midnight of start_date
+
+        Returns:
+            datetime object
+        """
+        return datetime.combine(self.start_date, time(0, 0)) + timedelta(minutes=minute)
+
+    def add_downtime(self, day: date, machine_id: str, start: time, end: time,
+                     reason: str = "Unplanned") -> DowntimeWindow:
+        """
+        Record one-off downtime for a machine on a specific date.
+
+        Args:
+            day: Calendar date of the downtime
+            machine_id: Machine identifier
+            start: Downtime start time
+            end: Downtime end time
+            reason: Reason for downtime
+
+        Returns:
+            The new DowntimeWindow
+        """
+        window = DowntimeWindow(start, end, reason)
+        self.downtime_by_date.setdefault(day, {}).setdefault(machine_id, []).append(window)
+        self._calendars.pop(machine_id, None)
+        return window
+
+    def _build_calendar(self, machine: Machine) -> Tuple[List[int], List[int]]:
+        """Compute sorted, disjoint working intervals for one machine."""
+        # Shift intervals over the whole horizon
+        intervals = []
+        for day_index, day in enumerate(self.dates()):
+            if not self.is_working_day(day):
+                continue
+            day_offset = day_index * MINUTES_PER_DAY
+            for shift in self.shifts:
+                start, end = shift.to_offsets()
+                intervals.append((day_offset + start, day_offset + end))
+        intervals.sort()
+
+        merged = []
+        for start, end in intervals:
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        # Blocked intervals: recurring machine downtime plus per-date downtime
+        blocked = []
+        for day_index, day in enumerate(self.dates()):
+            day_offset = day_index * MINUTES_PER_DAY
+            windows = list(machine.downtime_windows)
+            windows.extend(self.downtime_by_date.get(day, {}).get(machine.machine_id, []))
+            for window in windows:
+                start = window.start_time.hour * 60 + window.start_time.minute
+                end = window.end_time.hour * 60 + window.end_time.minute
+                if end <= start:
+                    end += MINUTES_PER_DAY
+                blocked.append((day_offset + start, day_offset + end))
+        blocked.sort()
+
+        # Subtract blocked intervals from working intervals (two-pointer sweep)
+        starts, ends = [], []
+        b = 0
+        for work_start, work_end in merged:
+            cursor = work_start
+            while b < len(blocked) and blocked[b][1] <= cursor:
+                b += 1
+            k = b
+            while k < len(blocked) and blocked[k][0] < work_end:
+                block_start, block_end = blocked[k]
+                if block_start > cursor:
+                    starts.append(cursor)
+                    ends.append(block_start)
+                cursor = max(cursor, block_end)
+                k += 1
+            if cursor < work_end:
+                starts.append(cursor)
+                ends.append(work_end)
+
+        return starts, ends
+
+    def working_intervals(self, machine: Machine) -> List[Tuple[int, int]]:
+        """
+        Get the machine's available working intervals in horizon minutes.
+
+        Args:
+            machine: Machine to look up
+
+        Returns:
+            Sorted list of (start, end) intervals
+        """
+        starts, ends = self._calendar(machine)
+        return list(zip(starts, ends))
+
+    def _calendar(self, machine: Machine) -> Tuple[List[int], List[int]]:
+        calendar = self._calendars.get(machine.machine_id)
+        if calendar is None:
+            calendar = self._build_calendar(machine)
+            self._calendars[machine.machine_id] = calendar
+        return calendar
+
+    def earliest_start(self, machine: Machine, ready_minute: int, duration: int) -> Optional[int]:
+        """
+        Find the earliest start at or after ready_minute where a block of
+        `duration` minutes fits inside a single working interval.
+
+        Uses bisect to jump straight to the interval containing ready_minute.
+
+        Args:
+            machine: Machine the work runs on
+            ready_minute: Earliest allowed start (horizon minutes)
+            duration: Uninterrupted minutes required
+
+        Returns:
+            Start in horizon minutes, or None if it doesn't fit in the horizon
+        """
+        starts, ends = self._calendar(machine)
+        index = bisect_right(ends, ready_minute)
+        while index < len(starts):
+            start = max(starts[index], ready_minute)
+            if start + duration <= ends[index]:
+                return start
+            index += 1
+        return None
+
+    def capacity_minutes(self, machine: Machine) -> int:
+        """Total working minutes available on a machine over the horizon."""
+        starts, ends = self._calendar(machine)
+        return sum(end - start for start, end in zip(starts, ends))
+
+    def __str__(self) -> str:
+        return (f"PlanningHorizon({self.start_date} +{self.num_days} days, "
+                f"{len(self.shifts)} shift(s)/day)")
+
+
+# Example usage
+if __name__ == "__main__":
+    horizon = PlanningHorizon(
+        start_date=date(2024, 3, 4),
+        num_days=7,
+        shifts=[ShiftWindow(time(6, 0), time(14, 0), "Early"),
+                ShiftWindow(time(14, 0), time(22, 0), "Late")],
+        non_working_weekdays=[6]
+    )
+    machine = Machine("M1", ["P_A"], downtime_windows=[
+        DowntimeWindow(time(12, 0), time(12, 30), "Lunch cleaning")
+    ])
+    horizon.add_downtime(date(2024, 3, 5), "M1", time(6, 0), time(10, 0), "Calibration")
+
+    print(horizon)
+    print(f"Capacity M1: {horizon.capacity_minutes(machine)} min")
+    start = horizon.earliest_start(machine, 21 * 60, 90)
+    print(f"90 min job ready 21:00 Monday starts {horizon.datetime_at(start)}")
@@ -13,9 +13,9 @@ Key Attributes:
     - machine_options: List of compatible machines
 """
 
-from datetime import datetime, time
+from datetime import date, datetime, time
 from typing import List, Optional, Dict, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, MISSING
 import json
 
 
@@ -46,6 +46,7 @@ class Job:
     setup_requirements: Optional[str] = None    # Special setup needs
     operator_skill_required: Optional[str] = None  # Required operator skill level
     batch_size: int = 1                  # Number of units in this job
+    due_date: Optional[date] = None      # Due date for multi-day planning (None = same day)
     
     def __post_init__(self):
         """Validate job data after initialization."""
@@ -94,7 +95,8 @@ class Job:
             "machine_options": self.machine_options,
             "setup_requirements": self.setup_requirements,
             "operator_skill_required": self.operator_skill_required,
-            "batch_size": self.batch_size
+            "batch_size": self.batch_size,
+            "due_date": self.due_date.isoformat() if self.due_date else None
         }
     
     @classmethod
@@ -108,13 +110,37 @@ class Job:
         Returns:
             Job instance
         """
+        # Work on a copy so the caller's dict is left untouched
+        data = dict(data)
+        
         # Parse due_time string to time object
         if isinstance(data.get('due_time'), str):
             hour, minute = map(int, data['due_time'].split(':'))
             data['due_time'] = time(hour, minute)
         
+        # Parse ISO due_date string to date object
+        if isinstance(data.get('due_date'), str):
+            data['due_date'] = date.fromisoformat(data['due_date'])
+        
         return cls(**data)
     
+    @classmethod
+    def from_validated(cls, **values: Any) -> 'Job':
+        """
+        Create a Job from values that were already validated in bulk.
+        
+        Skips __post_init__, so only use this for rows that went through
+        an equivalent check (see utils.job_loader). Omitted optional fields
+        take their defaults.
+        
+        Returns:
+            Job instance
+        """
+        job = cls.__new__(cls)
+        job.__dict__.update(_JOB_DEFAULTS)
+        job.__dict__.update(values)
+        return job
+    
     def __str__(self) -> str:
         """String representation for logging and debugging."""
         rush_flag = " [RUSH]" if self.is_rush else ""
@@ -128,6 +154,10 @@ class Job:
                 f"priority='{self.priority}', machine_options={self.machine_options})")
 
 
+# Plain defaults used by Job.from_validated (machine_options is always supplied)
+_JOB_DEFAULTS = {f.name: f.default for f in fields(Job) if f.default is not MISSING}
+
+
 # Example usage and testing
 if __name__ == "__main__":
     # Create a rush order
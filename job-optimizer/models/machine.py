@@ -16,6 +16,8 @@ from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass, field
 import json
 
+from models.operator import Operator
+
 
 @dataclass
 class DowntimeWindow:
@@ -48,6 +50,27 @@ class DowntimeWindow:
         # Check for overlap
         return not (check_end <= dt_start or check_start >= dt_end)
     
+    @property
+    def crosses_midnight(self) -> bool:
+        """True if the window ends on the next day (e.g. 23:00-01:00)."""
+        return self.end_time < self.start_time
+    
+    def split_at_midnight(self) -> List['DowntimeWindow']:
+        """
+        Split a window that crosses midnight into two same-day windows.
+        
+        Machine downtime repeats every day, so 23:00-01:00 becomes
+        23:00-23:59 and 00:00-01:00 (23:59 is the latest minute a
+        single-day timeline can use).
+        
+        Returns:
+            [self] if the window does not cross midnight, else two windows
+        """
+        if not self.crosses_midnight:
+            return [self]
+        return [DowntimeWindow(self.start_time, time(23, 59), self.reason),
+                DowntimeWindow(time(0, 0), self.end_time, self.reason)]
+    
     def __str__(self) -> str:
         return f"Downtime({self.start_time}-{self.end_time}: {self.reason})"
 
@@ -89,6 +112,24 @@ class Machine:
         """
         return product_type in self.capabilities
     
+    def get_processing_minutes(self, nominal_minutes: int) -> int:
+        """
+        Minutes this machine needs for work of a given nominal duration.
+        
+        Nominal durations (Job.processing_time) are quoted for a machine
+        delivering 60 minutes of work per hour; faster machines
+        (capacity_per_hour > 60) finish proportionally sooner.
+        
+        Args:
+            nominal_minutes: Duration at the reference rate
+            
+        Returns:
+            Effective minutes on this machine (rounded up)
+        """
+        if self.capacity_per_hour == 60:
+            return nominal_minutes
+        return -(-nominal_minutes * 60 // self.capacity_per_hour)
+    
     def is_available_at(self, time_slot: time) -> bool:
         """
         Check if machine is available (not in downtime) at specific time.
@@ -111,7 +152,7 @@ class Machine:
         
         return True
     
-    def add_downtime(self, start: time, end: time, reason: str = "Unplanned"):
+    def add_downtime(self, start: time, end: time, reason: str = "Unplanned") -> DowntimeWindow:
         """
         Add a downtime window to this machine.
         
@@ -119,8 +160,14 @@ class Machine:
             start: Downtime start time
             end: Downtime end time
             reason: Reason for downtime
+            
+        Returns:
+            The new DowntimeWindow (pass it to utils.rescheduler.repair_after_downtime
+            to repair a running schedule)
         """
-        self.downtime_windows.append(DowntimeWindow(start, end, reason))
+        window = DowntimeWindow(start, end, reason)
+        self.downtime_windows.append(window)
+        return window
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert machine to dictionary."""
@@ -136,6 +183,7 @@ class Machine:
                 }
                 for dt in self.downtime_windows
             ],
+            "max_continuous_runtime": self.max_continuous_runtime,
             "operator_id": self.operator_id
         }
     
@@ -170,10 +218,17 @@ class Constraint:
     tardiness_weight: float = 1.0        # How much we care about meeting deadlines
     setup_weight: float = 0.5            # How much we care about minimizing setups
     utilization_weight: float = 0.3      # How much we care about balancing load
+    stability_weight: float = 0.0        # How much we care about not changing a previous plan
     
     # WIP (Work in Progress) limits
     max_wip_per_machine: Optional[int] = None
     
+    # Rest break inserted when a machine hits max_continuous_runtime
+    rest_break_minutes: int = 15
+    
+    # Operator pool shared by all machines (empty = operators not modelled)
+    operators: List[Operator] = field(default_factory=list)
+    
     def get_setup_time(self, from_product: str, to_product: str) -> int:
         """
         Get setup time required when switching from one product to another.
@@ -233,7 +288,10 @@ class Constraint:
             "tardiness_weight": self.tardiness_weight,
             "setup_weight": self.setup_weight,
             "utilization_weight": self.utilization_weight,
-            "max_wip_per_machine": self.max_wip_per_machine
+            "stability_weight": self.stability_weight,
+            "max_wip_per_machine": self.max_wip_per_machine,
+            "rest_break_minutes": self.rest_break_minutes,
+            "operators": [operator.to_dict() for operator in self.operators]
         }
     
     def __str__(self) -> str:
@@ -0,0 +1,54 @@
+"""
+Operator Model - Represents machine operators and their skills
+
+Operators are a shared, renewable resource: one operator can run any
+number of jobs over a shift, but only one at a time. A job with
+operator_skill_required can only run while an operator holding that skill
+is free.
+
+Key Features:
+    - Operator identity and skill set
+    - Skill matching for jobs
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Operator:
+    """
+    Represents a machine operator.
+
+    Example:
+        >>> operator = Operator("OP1", skills=["basic", "advanced"], name="Dana")
+        >>> operator.has_skill("advanced")
+        True
+    """
+
+    operator_id: str
+    skills: List[str] = field(default_factory=list)  # Skill levels held
+    name: str = ""
+
+    def has_skill(self, skill: Optional[str]) -> bool:
+        """
+        Check if this operator may run a job requiring the given skill.
+
+        Args:
+            skill: Required skill (None = no skill required)
+
+        Returns:
+            True if qualified, False otherwise
+        """
+        return skill is None or skill in self.skills
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert operator to dictionary."""
+        return {
+            "operator_id": self.operator_id,
+            "skills": self.skills,
+            "name": self.name
+        }
+
+    def __str__(self) -> str:
+        return f"Operator({self.operator_id}: {', '.join(self.skills) or 'no skills'})"
@@ -5,17 +5,27 @@ This module defines the Schedule class for representing complete production
 schedules and the KPI class for evaluating schedule quality.
 
 Key Features:
-    - Machine-wise job assignments
+    - Machine-wise job assignments with an O(1) job_id index
     - Timeline calculations
     - KPI computation (tardiness, utilization, setup time)
-    - Schedule validation and scoring
+    - O(n log n) sweep-line validation with structured violations
+    - O(n) diff against a reference schedule (stability penalty)
+    - Scoring
 """
 
-from datetime import time, datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Any
-from dataclasses import dataclass, field
+from datetime import date, time, datetime, timedelta
+from typing import List, Dict, Optional, Tuple, Any, Iterator, Mapping, Sequence, TYPE_CHECKING
+from dataclasses import dataclass, field, replace
+from collections import defaultdict
+from bisect import bisect_left, bisect_right
+from types import MappingProxyType
+import os
 from models.job import Job
 from models.machine import Machine, Constraint
+from models.horizon import PlanningHorizon, MINUTES_PER_DAY
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 @dataclass
@@ -29,18 +39,50 @@ class JobAssignment:
     end_time: time
     setup_time_before: int = 0  # Setup minutes before this job
     
+    # Processing minutes on the assigned machine (None = job.processing_time)
+    processing_minutes: Optional[int] = None
+    
+    # Calendar dates for multi-day horizons (None = single-shift schedule)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    
+    # Operator running the job (None = no operator booked)
+    operator_id: Optional[str] = None
+    
+    def get_processing_minutes(self) -> int:
+        """Processing minutes on the assigned machine (honours machine speed)."""
+        if self.processing_minutes is None:
+            return self.job.processing_time
+        return self.processing_minutes
+    
     def get_duration_minutes(self) -> int:
         """Calculate total duration including setup."""
-        return self.job.processing_time + self.setup_time_before
+        return self.get_processing_minutes() + self.setup_time_before
+    
+    def get_processing_window(self) -> Tuple[int, int]:
+        """Processing (start, end) in minutes since midnight."""
+        return (self.start_time.hour * 60 + self.start_time.minute,
+                self.end_time.hour * 60 + self.end_time.minute)
     
     def is_late(self) -> bool:
         """Check if job finishes after its due time."""
-        return self.end_time > self.job.due_time
+        return self.get_tardiness_minutes() > 0
     
     def get_tardiness_minutes(self) -> int:
-        """Calculate how many minutes late this job is."""
-        if not self.is_late():
-            return 0
+        """
+        Calculate how many minutes late this job is.
+        
+        On multi-day schedules the end date is compared against the job's
+        due_date. Planners record that date on the job (HorizonScheduler
+        uses PlanningHorizon.due_date_of: undated jobs are due on the first
+        day of the horizon); a dated assignment whose job has no due_date
+        is treated as due on the day it finishes.
+        """
+        if self.end_date is not None:
+            due_date = self.job.due_date or self.end_date
+            finish = datetime.combine(self.end_date, self.end_time)
+            due = datetime.combine(due_date, self.job.due_time)
+            return max(0, int((finish - due).total_seconds() // 60))
         
         end_minutes = self.end_time.hour * 60 + self.end_time.minute
         due_minutes = self.job.due_time.hour * 60 + self.job.due_time.minute
@@ -48,17 +90,23 @@ class JobAssignment:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return {
+        data = {
             "job_id": self.job.job_id,
             "product_type": self.job.product_type,
             "machine_id": self.machine_id,
             "start_time": self.start_time.strftime("%H:%M"),
             "end_time": self.end_time.strftime("%H:%M"),
             "setup_time_before": self.setup_time_before,
-            "processing_time": self.job.processing_time,
+            "processing_time": self.get_processing_minutes(),
             "is_late": self.is_late(),
             "tardiness_minutes": self.get_tardiness_minutes()
         }
+        if self.start_date is not None:
+            data["start_date"] = self.start_date.isoformat()
+            data["end_date"] = self.end_date.isoformat() if self.end_date else None
+        if self.operator_id is not None:
+            data["operator_id"] = self.operator_id
+        return data
 
 
 @dataclass
@@ -76,6 +124,17 @@ class KPI:
     min_machine_utilization: float = 0.0  # % utilization of least busy machine
     utilization_imbalance: float = 0.0    # Difference between max and min
     num_violations: int = 0               # Constraint violations
+    makespan: int = 0                     # Minutes from shift start to last completion
+    
+    # Lower bounds and relative gap to them (see utils.bounds.report_gap)
+    makespan_lower_bound: Optional[int] = None
+    setup_lower_bound: Optional[int] = None
+    tardiness_lower_bound: Optional[int] = None
+    optimality_gap: Optional[float] = None
+    
+    # Changes against a reference schedule (see Schedule.diff)
+    jobs_changed: Optional[int] = None
+    stability_penalty: Optional[float] = None
     
     def get_weighted_score(self, constraint: Constraint) -> float:
         """
@@ -93,27 +152,330 @@ class KPI:
             self.total_tardiness * constraint.tardiness_weight +
             self.total_setup_time * constraint.setup_weight +
             self.utilization_imbalance * constraint.utilization_weight +
+            (self.stability_penalty or 0.0) * constraint.stability_weight +
             self.num_violations * 1000  # Heavy penalty for violations
         )
         return score
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return {
+        data = {
             "total_tardiness": self.total_tardiness,
             "total_setup_time": self.total_setup_time,
             "num_setup_switches": self.num_setup_switches,
             "max_machine_utilization": round(self.max_machine_utilization, 2),
             "min_machine_utilization": round(self.min_machine_utilization, 2),
             "utilization_imbalance": round(self.utilization_imbalance, 2),
-            "num_violations": self.num_violations
+            "num_violations": self.num_violations,
+            "makespan": self.makespan
         }
+        if self.optimality_gap is not None:
+            data.update({
+                "makespan_lower_bound": self.makespan_lower_bound,
+                "setup_lower_bound": self.setup_lower_bound,
+                "tardiness_lower_bound": self.tardiness_lower_bound,
+                "optimality_gap": round(self.optimality_gap, 4)
+            })
+        if self.stability_penalty is not None:
+            data.update({
+                "jobs_changed": self.jobs_changed,
+                "stability_penalty": round(self.stability_penalty, 1)
+            })
+        return data
     
     def __str__(self) -> str:
+        gap = f", Gap: {self.optimality_gap:.1%}" if self.optimality_gap is not None else ""
         return (f"KPI(Tardiness: {self.total_tardiness}min, "
                 f"Setup: {self.total_setup_time}min, "
                 f"Switches: {self.num_setup_switches}, "
-                f"Violations: {self.num_violations})")
+                f"Violations: {self.num_violations}{gap})")
+
+
+# Schedules with at least this many assignments are checked in parallel
+# (below it, starting worker processes costs more than the sweep itself)
+PARALLEL_CHECK_THRESHOLD = 200000
+
+
+@dataclass
+class Violation:
+    """One constraint violation found by Schedule.check()."""
+    kind: str                         # overlap, downtime, shift, runtime, compatibility,
+                                      # duplicate, missing, unexpected, skill, operator
+    message: str
+    job_id: Optional[str] = None
+    machine_id: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {"kind": self.kind, "message": self.message,
+                "job_id": self.job_id, "machine_id": self.machine_id}
+    
+    def __str__(self) -> str:
+        return self.message
+
+
+# Stability penalty, in minutes of start shift, per job that changes
+# machine or sequence against a reference schedule
+MACHINE_CHANGE_PENALTY = 60
+REORDER_PENALTY = 15
+
+
+@dataclass
+class ScheduleDiff:
+    """Changes of a schedule against a reference, from Schedule.diff()."""
+    moved: List[str] = field(default_factory=list)       # Different machine
+    reordered: List[str] = field(default_factory=list)   # Same machine, different predecessor
+    shifted: List[str] = field(default_factory=list)     # Same machine and order, new start time
+    added: List[str] = field(default_factory=list)       # Not in the reference
+    removed: List[str] = field(default_factory=list)     # Only in the reference
+    unchanged: int = 0
+    total_shift_minutes: int = 0  # Sum of |start change| over jobs in both schedules
+    
+    @property
+    def num_changed(self) -> int:
+        """Jobs in both schedules that moved, were reordered or shifted."""
+        return len(self.moved) + len(self.reordered) + len(self.shifted)
+    
+    @property
+    def penalty(self) -> float:
+        """Stability penalty in minutes (weighted by Constraint.stability_weight)."""
+        return (self.total_shift_minutes +
+                MACHINE_CHANGE_PENALTY * len(self.moved) +
+                REORDER_PENALTY * len(self.reordered))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "moved": self.moved,
+            "reordered": self.reordered,
+            "shifted": self.shifted,
+            "added": self.added,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+            "total_shift_minutes": self.total_shift_minutes,
+            "penalty": self.penalty
+        }
+    
+    def __str__(self) -> str:
+        return (f"ScheduleDiff({len(self.moved)} moved, {len(self.reordered)} reordered, "
+                f"{len(self.shifted)} shifted, {len(self.added)} added, {len(self.removed)} removed, "
+                f"{self.unchanged} unchanged)")
+
+
+def _absolute_start(assignment: JobAssignment) -> int:
+    """Setup-inclusive start in minutes, counting days for dated assignments."""
+    start = (assignment.start_time.hour * 60 + assignment.start_time.minute
+             - assignment.setup_time_before)
+    if assignment.start_date is not None:
+        start += assignment.start_date.toordinal() * 24 * 60
+    return start
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+
+def _machine_rows(machine_id: str, assignments: List[JobAssignment]) -> List[Tuple]:
+    """
+    Flatten a machine's assignments into plain tuples (cheap to send to a
+    worker process): (block start, end, time-of-day block start,
+    time-of-day end, job_id, product_type, allowed on machine, dated).
+    
+    Absolute times add 1440 minutes per day for dated assignments, so
+    multi-day schedules sort correctly.
+    """
+    rows = []
+    for a in assignments:
+        start, end = a.get_processing_window()
+        block_start = start - a.setup_time_before
+        day = a.start_date.toordinal() if a.start_date else 0
+        end_day = a.end_date.toordinal() if a.end_date else day
+        rows.append((
+            day * 1440 + block_start, end_day * 1440 + end, block_start, end,
+            a.job.job_id, a.job.product_type, a.job.can_run_on(machine_id), day > 0
+        ))
+    return rows
+
+
+def _machine_info(machine: Optional[Machine]) -> Optional[Tuple]:
+    """(capabilities, sorted downtime windows, max continuous runtime) or None."""
+    if machine is None:
+        return None
+    downtime = sorted(
+        (dt.start_time.hour * 60 + dt.start_time.minute,
+         dt.end_time.hour * 60 + dt.end_time.minute, str(dt))
+        for dt in machine.downtime_windows
+    )
+    return frozenset(machine.capabilities), downtime, machine.max_continuous_runtime
+
+
+def _machine_calendar(machine: Optional[Machine], horizon: Optional[PlanningHorizon]) -> Optional[Tuple]:
+    """
+    Working intervals and downtime of one machine over a horizon, for
+    dated assignments.
+    
+    Positions are in absolute minutes (date ordinal x 1440 + minute of
+    day), the same scale as the first two fields of _machine_rows().
+    
+    Returns:
+        (interval starts, interval ends, [(start, end, label)] of downtime),
+        or None for an unknown machine or no horizon
+    """
+    if machine is None or horizon is None:
+        return None
+    origin = horizon.start_date.toordinal() * MINUTES_PER_DAY
+    intervals = horizon.working_intervals(machine)
+    blocked = []
+    for day_index, day in enumerate(horizon.dates()):
+        day_offset = origin + day_index * MINUTES_PER_DAY
+        windows = list(machine.downtime_windows)
+        windows.extend(horizon.downtime_by_date.get(day, {}).get(machine.machine_id, []))
+        for window in windows:
+            start = window.start_time.hour * 60 + window.start_time.minute
+            end = window.end_time.hour * 60 + window.end_time.minute
+            if end <= start:
+                end += MINUTES_PER_DAY
+            blocked.append((day_offset + start, day_offset + end, f"{window} on {day.isoformat()}"))
+    blocked.sort()
+    return [origin + start for start, _ in intervals], [origin + end for _, end in intervals], blocked
+
+
+def _check_machine(machine_id: str, rows: List[Tuple], info: Optional[Tuple],
+                   shift: Tuple[int, int, int], calendar: Optional[Tuple] = None) -> List['Violation']:
+    """
+    Sweep one machine's assignments in start order.
+    
+    Undated assignments are checked against the single shift and the
+    machine's daily downtime by time of day. Dated assignments must lie
+    inside one working interval of the calendar instead, which covers
+    overnight shifts, non-working days and per-date downtime.
+    
+    Args:
+        machine_id: Machine being checked
+        rows: Output of _machine_rows()
+        info: Output of _machine_info() (None = unknown machine)
+        shift: (shift start, shift end incl. overtime, rest break minutes)
+        calendar: Output of _machine_calendar() for dated assignments
+    
+    Returns:
+        Violations found on this machine
+    """
+    violations = []
+    shift_start, shift_end, rest_break = shift
+    if info is None:
+        violations.append(Violation(
+            "compatibility", f"{len(rows)} job(s) assigned to unknown machine {machine_id}",
+            machine_id=machine_id
+        ))
+        capabilities, downtime, max_runtime = None, [], None
+    else:
+        capabilities, downtime, max_runtime = info
+    downtime_ends = []
+    for dt_start, dt_end, _ in downtime:
+        downtime_ends.append(max(dt_end, downtime_ends[-1]) if downtime_ends else dt_end)
+    downtime_starts = [dt[0] for dt in downtime]
+    
+    rows = sorted(rows)
+    latest_end, latest_job = None, None
+    run_start = run_end = None
+    run_first, run_jobs = None, 0
+    
+    for block_start, end, tod_start, tod_end, job_id, product_type, allowed, dated in rows:
+        # Overlap with the job that reaches furthest so far
+        if latest_end is not None and block_start < latest_end:
+            violations.append(Violation(
+                "overlap", f"Jobs {latest_job} and {job_id} overlap on {machine_id}",
+                job_id=job_id, machine_id=machine_id
+            ))
+        if latest_end is None or end > latest_end:
+            latest_end, latest_job = end, job_id
+        
+        # Dated: inside one working interval of the horizon calendar
+        if dated:
+            if calendar is not None:
+                violations.extend(_calendar_violations(machine_id, job_id, block_start, end, calendar))
+        
+        # Shift bounds (time of day)
+        elif not shift_start <= tod_end <= shift_end:
+            violations.append(Violation(
+                "shift", f"Job {job_id} on {machine_id} ends at {_hhmm(tod_end)} (beyond shift)",
+                job_id=job_id, machine_id=machine_id
+            ))
+        elif tod_start < shift_start:
+            violations.append(Violation(
+                "shift", f"Job {job_id} on {machine_id} starts at {_hhmm(tod_start)} (before shift)",
+                job_id=job_id, machine_id=machine_id
+            ))
+        
+        # Downtime: the windows starting before this block ends; with their
+        # running maximum end, one bisect tells if any of them reaches in
+        k = bisect_left(downtime_starts, tod_end) - 1
+        if not dated and k >= 0 and downtime_ends[k] > tod_start:
+            for dt_start, dt_end, label in downtime[:k + 1]:
+                if dt_end > tod_start:
+                    violations.append(Violation(
+                        "downtime", f"Job {job_id} on {machine_id} overlaps with downtime {label}",
+                        job_id=job_id, machine_id=machine_id
+                    ))
+        
+        # Compatibility
+        if not allowed:
+            violations.append(Violation(
+                "compatibility", f"Job {job_id} is not allowed on {machine_id}",
+                job_id=job_id, machine_id=machine_id
+            ))
+        elif capabilities is not None and product_type not in capabilities:
+            violations.append(Violation(
+                "compatibility", f"{machine_id} cannot process product {product_type} (job {job_id})",
+                job_id=job_id, machine_id=machine_id
+            ))
+        
+        # Continuous runtime: jobs closer together than a rest break form
+        # one run, which may not exceed the machine's limit
+        if max_runtime is not None:
+            if run_end is not None and block_start - run_end < rest_break:
+                run_end = max(run_end, end)
+                run_jobs += 1
+            else:
+                violations.extend(_runtime_violation(machine_id, run_start, run_end, run_first, run_jobs, max_runtime))
+                run_start, run_end, run_first, run_jobs = block_start, end, job_id, 1
+    
+    if max_runtime is not None:
+        violations.extend(_runtime_violation(machine_id, run_start, run_end, run_first, run_jobs, max_runtime))
+    return violations
+
+
+def _calendar_violations(machine_id: str, job_id: str, block_start: int, end: int,
+                         calendar: Tuple) -> List['Violation']:
+    """Downtime or shift violations of a dated block (absolute minutes)."""
+    starts, ends, blocked = calendar
+    k = bisect_right(ends, block_start)
+    if k < len(starts) and starts[k] <= block_start and end <= ends[k]:
+        return []
+    violations = [
+        Violation("downtime", f"Job {job_id} on {machine_id} overlaps with downtime {label}",
+                  job_id=job_id, machine_id=machine_id)
+        for dt_start, dt_end, label in blocked if dt_start < end and dt_end > block_start
+    ]
+    if not violations:
+        day = date.fromordinal(block_start // MINUTES_PER_DAY)
+        violations.append(Violation(
+            "shift", f"Job {job_id} on {machine_id} runs {day.isoformat()} {_hhmm(block_start)}-"
+            f"{_hhmm(end)} outside the working shifts",
+            job_id=job_id, machine_id=machine_id
+        ))
+    return violations
+
+
+def _runtime_violation(machine_id, run_start, run_end, first_job, num_jobs, max_runtime) -> List['Violation']:
+    # A single job longer than the limit can't be split
+    if num_jobs > 1 and run_end - run_start > max_runtime:
+        return [Violation(
+            "runtime", f"{machine_id} runs {run_end - run_start} min without a rest break "
+            f"from job {first_job} (limit {max_runtime})",
+            job_id=first_job, machine_id=machine_id
+        )]
+    return []
 
 
 @dataclass
@@ -122,10 +484,13 @@ class Schedule:
     Represents a complete production schedule.
     
     Contains machine-wise job assignments and calculated KPIs.
-    """
     
-    # Machine ID -> List of job assignments
-    assignments: Dict[str, List[JobAssignment]] = field(default_factory=dict)
+    Assignments are stored as one ordered list per machine plus an index
+    job_id -> (machine_id, position), so lookups are O(1) and edits only
+    touch the affected machine. `assignments` is a read-only view; edit
+    through add_assignment/insert_at/remove/move/set_machine_jobs so the
+    index stays in sync.
+    """
     
     # Calculated KPIs
     kpis: Optional[KPI] = None
@@ -134,6 +499,46 @@ class Schedule:
     created_by: str = "Multi-Agent Optimizer"
     explanation: str = ""  # LLM-generated explanation
     
+    # Machine ID -> List of job assignments
+    _assignments: Dict[str, List[JobAssignment]] = field(default_factory=dict, init=False)
+    
+    # Job ID -> (machine ID, position in that machine's list)
+    _index: Dict[str, Tuple[str, int]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
+    # Cached read-only view of _assignments (None = rebuild on next access)
+    _view: Optional[Mapping[str, Tuple[JobAssignment, ...]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    @property
+    def assignments(self) -> Mapping[str, Tuple[JobAssignment, ...]]:
+        """
+        Machine ID -> ordered assignments, read-only.
+        
+        The view is cached until the next edit, so repeated reads are cheap.
+        """
+        if self._view is None:
+            self._view = MappingProxyType({
+                machine_id: tuple(jobs) for machine_id, jobs in self._assignments.items()
+            })
+        return self._view
+    
+    def reindex(self):
+        """Rebuild the job_id index from scratch."""
+        self._index = {
+            assignment.job.job_id: (machine_id, position)
+            for machine_id, jobs in self._assignments.items()
+            for position, assignment in enumerate(jobs)
+        }
+    
+    def _reindex_from(self, machine_id: str, start: int):
+        """Refresh index positions on one machine from `start` onwards."""
+        jobs = self._assignments[machine_id]
+        for position in range(start, len(jobs)):
+            self._index[jobs[position].job.job_id] = (machine_id, position)
+    
     def add_assignment(self, assignment: JobAssignment):
         """
         Add a job assignment to the schedule.
@@ -142,12 +547,132 @@ class Schedule:
             assignment: JobAssignment to add
         """
         machine_id = assignment.machine_id
-        if machine_id not in self.assignments:
-            self.assignments[machine_id] = []
+        self._view = None
+        if machine_id not in self._assignments:
+            self._assignments[machine_id] = []
+        
+        self._assignments[machine_id].append(assignment)
+        self._index[assignment.job.job_id] = (machine_id, len(self._assignments[machine_id]) - 1)
+    
+    def insert_at(self, assignment: JobAssignment, position: int):
+        """
+        Insert an assignment at a given position in its machine's sequence.
         
-        self.assignments[machine_id].append(assignment)
+        Timing of neighbouring assignments is not recomputed.
+        
+        Args:
+            assignment: JobAssignment to insert (its machine_id decides the machine)
+            position: Index in the machine's list (clamped to the list length)
+        """
+        self._view = None
+        jobs = self._assignments.setdefault(assignment.machine_id, [])
+        position = max(0, min(position, len(jobs)))
+        jobs.insert(position, assignment)
+        self._reindex_from(assignment.machine_id, position)
+    
+    def remove(self, job_id: str) -> JobAssignment:
+        """
+        Remove a job's assignment.
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            The removed JobAssignment
+            
+        Raises:
+            KeyError: If the job is not scheduled
+        """
+        machine_id, position = self._index.pop(job_id)
+        self._view = None
+        assignment = self._assignments[machine_id].pop(position)
+        self._reindex_from(machine_id, position)
+        return assignment
     
-    def get_machine_jobs(self, machine_id: str) -> List[JobAssignment]:
+    def move(self, job_id: str, machine_id: str, position: Optional[int] = None) -> JobAssignment:
+        """
+        Move a job to another machine and/or position.
+        
+        Only the sequence changes; start/end times and setup are left for
+        the caller to recompute.
+        
+        Args:
+            job_id: Job identifier
+            machine_id: Target machine
+            position: Target index in the machine's list (default: append)
+            
+        Returns:
+            The moved JobAssignment (a new object if the machine changed)
+        """
+        assignment = self.remove(job_id)
+        if assignment.machine_id != machine_id:
+            assignment = replace(assignment, machine_id=machine_id)
+        if position is None:
+            self.add_assignment(assignment)
+        else:
+            self.insert_at(assignment, position)
+        return assignment
+    
+    def set_machine_jobs(self, machine_id: str, jobs: Sequence[JobAssignment]):
+        """
+        Replace the whole sequence of one machine.
+        
+        Args:
+            machine_id: Machine identifier
+            jobs: New ordered assignments for that machine (copied)
+        """
+        for old in self._assignments.get(machine_id, []):
+            if self._index.get(old.job.job_id, (None,))[0] == machine_id:
+                del self._index[old.job.job_id]
+        self._view = None
+        self._assignments[machine_id] = list(jobs)
+        self._reindex_from(machine_id, 0)
+    
+    def locate(self, job_id: str) -> Optional[Tuple[str, int]]:
+        """
+        Find where a job is scheduled.
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            Tuple of (machine_id, position), or None if not scheduled
+        """
+        return self._index.get(job_id)
+    
+    def get_assignment(self, job_id: str) -> Optional[JobAssignment]:
+        """Get a job's assignment in O(1), or None if not scheduled."""
+        location = self._index.get(job_id)
+        if location is None:
+            return None
+        machine_id, position = location
+        return self._assignments[machine_id][position]
+    
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._index
+    
+    @property
+    def num_assignments(self) -> int:
+        """Number of scheduled jobs."""
+        return sum(len(jobs) for jobs in self._assignments.values())
+    
+    def copy(self) -> 'Schedule':
+        """
+        Shallow copy: new per-machine lists and index, shared JobAssignments.
+        
+        Returns:
+            Schedule that can be edited without affecting this one
+        """
+        clone = Schedule(
+            kpis=replace(self.kpis) if self.kpis else None,
+            created_by=self.created_by,
+            explanation=self.explanation
+        )
+        clone._assignments = {m_id: list(jobs) for m_id, jobs in self._assignments.items()}
+        clone._index = dict(self._index)
+        return clone
+    
+    def get_machine_jobs(self, machine_id: str) -> Tuple[JobAssignment, ...]:
         """
         Get all jobs assigned to a specific machine.
         
@@ -155,39 +680,115 @@ class Schedule:
             machine_id: Machine identifier
             
         Returns:
-            List of job assignments for that machine
+            Ordered job assignments for that machine (read-only)
         """
-        return self.assignments.get(machine_id, [])
+        return self.assignments.get(machine_id, ())
+    
+    def iter_assignments(self) -> Iterator[JobAssignment]:
+        """Iterate over all assignments without building a flat list."""
+        for machine_jobs in self._assignments.values():
+            yield from machine_jobs
     
     def get_all_jobs(self) -> List[JobAssignment]:
         """Get all job assignments across all machines."""
-        all_jobs = []
-        for machine_jobs in self.assignments.values():
-            all_jobs.extend(machine_jobs)
-        return all_jobs
+        return list(self.iter_assignments())
+    
+    def _predecessors_on_same_machine(self, other: 'Schedule') -> Dict[str, Optional[str]]:
+        """Each job's predecessor among the jobs that are on the same machine in `other`."""
+        predecessors: Dict[str, Optional[str]] = {}
+        for machine_id, jobs in self._assignments.items():
+            last = None
+            for assignment in jobs:
+                job_id = assignment.job.job_id
+                location = other._index.get(job_id)
+                if location is not None and location[0] == machine_id:
+                    predecessors[job_id] = last
+                    last = job_id
+        return predecessors
+    
+    def diff(self, reference: 'Schedule') -> ScheduleDiff:
+        """
+        Compare this schedule with a reference (e.g. the published plan).
+        
+        Each job in both schedules is classified once, most disruptive
+        first: moved to another machine, reordered (its predecessor among
+        the jobs that stayed on the machine changed), or shifted in time.
+        Uses the job_id indexes, so the cost is O(n).
+        
+        Args:
+            reference: Schedule to compare against
+            
+        Returns:
+            ScheduleDiff
+        """
+        result = ScheduleDiff()
+        ours = self._predecessors_on_same_machine(reference)
+        theirs = reference._predecessors_on_same_machine(self)
+        
+        for assignment in self.iter_assignments():
+            job_id = assignment.job.job_id
+            old = reference.get_assignment(job_id)
+            if old is None:
+                result.added.append(job_id)
+                continue
+            shift = abs(_absolute_start(assignment) - _absolute_start(old))
+            result.total_shift_minutes += shift
+            if old.machine_id != assignment.machine_id:
+                result.moved.append(job_id)
+            elif ours[job_id] != theirs[job_id]:
+                result.reordered.append(job_id)
+            elif shift:
+                result.shifted.append(job_id)
+            else:
+                result.unchanged += 1
+        
+        result.removed = [job_id for job_id in reference._index if job_id not in self._index]
+        return result
     
-    def calculate_kpis(self, machines: List[Machine], constraint: Constraint) -> KPI:
+    def calculate_kpis(
+        self,
+        machines: List[Machine],
+        constraint: Constraint,
+        capacity_minutes: Optional[Dict[str, int]] = None,
+        reference: Optional['Schedule'] = None
+    ) -> KPI:
         """
         Calculate KPIs for this schedule.
         
         Args:
             machines: List of all machines
             constraint: Scheduling constraints
+            capacity_minutes: Optional available minutes per machine (e.g. from a
+                multi-day PlanningHorizon); defaults to one shift
+            reference: Previous schedule; if given, the stability penalty
+                against it is filled in (see diff())
             
         Returns:
             KPI object with calculated metrics
         """
         kpi = KPI()
         
-        # Calculate tardiness
-        all_jobs = self.get_all_jobs()
-        kpi.total_tardiness = sum(job.get_tardiness_minutes() for job in all_jobs)
+        if reference is not None:
+            changes = self.diff(reference)
+            kpi.jobs_changed = changes.num_changed
+            kpi.stability_penalty = changes.penalty
         
-        # Calculate setup times and switches
-        kpi.total_setup_time = sum(job.setup_time_before for job in all_jobs)
+        # Calculate tardiness, setup times and makespan in a single pass
+        shift_start = constraint.shift_start.hour * 60 + constraint.shift_start.minute
+        first_date = min(
+            (a.start_date for a in self.iter_assignments() if a.start_date is not None),
+            default=None
+        )
+        for assignment in self.iter_assignments():
+            kpi.total_tardiness += assignment.get_tardiness_minutes()
+            kpi.total_setup_time += assignment.setup_time_before
+            finish = assignment.get_processing_window()[1] - shift_start
+            if first_date is not None and assignment.end_date is not None:
+                finish += (assignment.end_date - first_date).days * 24 * 60
+            kpi.makespan = max(kpi.makespan, finish)
         
         # Count product type switches per machine
-        for machine_id, jobs in self.assignments.items():
+        for machine_id, jobs in self._assignments.items():
             if len(jobs) > 1:
                 for i in range(1, len(jobs)):
                     if jobs[i].job.product_type != jobs[i-1].job.product_type:
@@ -201,7 +802,10 @@ class Schedule:
             machine_jobs = self.get_machine_jobs(machine.machine_id)
             if machine_jobs:
                 total_time = sum(job.get_duration_minutes() for job in machine_jobs)
-                utilization = (total_time / shift_duration) * 100
+                available = shift_duration
+                if capacity_minutes is not None:
+                    available = capacity_minutes.get(machine.machine_id, shift_duration)
+                utilization = (total_time / available) * 100 if available else 0.0
                 utilizations.append(utilization)
         
         if utilizations:
@@ -212,51 +816,222 @@ class Schedule:
         self.kpis = kpi
         return kpi
     
-    def validate(self, machines: List[Machine], constraint: Constraint) -> Tuple[bool, List[str]]:
+    def validate(
+        self,
+        machines: List[Machine],
+        constraint: Constraint,
+        jobs: Optional[List[Job]] = None,
+        horizon: Optional[PlanningHorizon] = None
+    ) -> Tuple[bool, List[str]]:
         """
         Validate schedule against constraints.
         
         Args:
             machines: List of all machines
             constraint: Scheduling constraints
+            jobs: Jobs that should be scheduled (enables the missing-job check)
+            horizon: Calendar of a multi-day schedule (see check())
             
         Returns:
             Tuple of (is_valid, list_of_violations)
         """
-        violations = []
+        violations = self.check(machines, constraint, jobs, horizon=horizon)
+        return len(violations) == 0, [v.message for v in violations]
+    
+    def check(
+        self,
+        machines: List[Machine],
+        constraint: Constraint,
+        jobs: Optional[List[Job]] = None,
+        workers: Optional[int] = None,
+        parallel_threshold: int = PARALLEL_CHECK_THRESHOLD,
+        horizon: Optional[PlanningHorizon] = None
+    ) -> List['Violation']:
+        """
+        Find every constraint violation, as structured Violation records.
+        
+        Each machine's assignments are sorted once and swept in order, so
+        the whole check is O(n log n). Machines are independent, so large
+        schedules are checked one machine per worker process.
+        
+        Checks:
+            - overlap: two jobs (setup + processing) overlap on a machine
+            - downtime: a job overlaps a downtime window
+            - shift: a job ends outside the shift plus overtime, or starts
+              before the shift (single-day schedules); a dated job does not
+              fit in one working interval of the horizon calendar
+            - runtime: a machine runs longer than max_continuous_runtime
+              without a rest break
+            - compatibility: unknown machine, or machine/product mismatch
+            - duplicate / missing / unexpected jobs
+            - skill / operator: operator lacks the skill or is double-booked
+        
+        Args:
+            machines: List of all machines
+            constraint: Scheduling constraints
+            jobs: Jobs that should be scheduled (enables missing/unexpected
+                checks; without it only duplicates are reported)
+            workers: Worker processes for the per-machine checks
+                (default: CPU count)
+            parallel_threshold: Use worker processes from this many
+                assignments on
+            horizon: Calendar that dated (multi-day) assignments are checked
+                against: its shifts, non-working days and per-date downtime.
+                Defaults to the constraint's shift repeated every day.
+            
+        Returns:
+            List of Violation (empty if the schedule is valid)
+        """
+        machines_by_id = {m.machine_id: m for m in machines}
+        shift = (
+            constraint.shift_start.hour * 60 + constraint.shift_start.minute,
+            constraint.shift_end.hour * 60 + constraint.shift_end.minute + constraint.max_overtime_minutes,
+            constraint.rest_break_minutes
+        )
+        dates = [a.start_date for a in self.iter_assignments() if a.start_date is not None]
+        if dates and horizon is None:
+            # Start a day early for an overnight shift that began the day before
+            first = min(dates) - timedelta(days=1)
+            horizon = PlanningHorizon.from_constraint(constraint, first, (max(dates) - first).days + 2)
+        tasks = [
+            (machine_id, _machine_rows(machine_id, assignments),
+             _machine_info(machines_by_id.get(machine_id)), shift,
+             _machine_calendar(machines_by_id.get(machine_id), horizon if dates else None))
+            for machine_id, assignments in self._assignments.items() if assignments
+        ]
+        
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(tasks) > 1 and self.num_assignments >= parallel_threshold:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                per_machine = list(executor.map(_check_machine, *zip(*tasks)))
+        else:
+            per_machine = [_check_machine(*task) for task in tasks]
+        violations = [v for found in per_machine for v in found]
         
-        # Check each assignment
-        for machine_id, jobs in self.assignments.items():
-            for job_assignment in jobs:
-                # Check shift boundaries
-                if not constraint.is_within_shift(job_assignment.end_time):
-                    violations.append(
-                        f"Job {job_assignment.job.job_id} on {machine_id} "
-                        f"ends at {job_assignment.end_time} (beyond shift)"
-                    )
-                
-                # Check machine downtime
-                machine = next((m for m in machines if m.machine_id == machine_id), None)
-                if machine:
-                    for downtime in machine.downtime_windows:
-                        if downtime.overlaps_with(job_assignment.start_time, job_assignment.end_time):
-                            violations.append(
-                                f"Job {job_assignment.job.job_id} on {machine_id} "
-                                f"overlaps with downtime {downtime}"
-                            )
+        violations.extend(self._check_jobs(jobs))
+        violations.extend(self._check_operators(constraint))
         
         # Update KPI with violation count
         if self.kpis:
             self.kpis.num_violations = len(violations)
         
-        return len(violations) == 0, violations
+        return violations
+    
+    def _check_jobs(self, jobs: Optional[List[Job]]) -> List['Violation']:
+        """Duplicate, missing and unexpected jobs."""
+        violations = []
+        placements = defaultdict(list)
+        for machine_id, assignments in self._assignments.items():
+            for assignment in assignments:
+                placements[assignment.job.job_id].append(machine_id)
+        
+        for job_id, machine_ids in placements.items():
+            if len(machine_ids) > 1:
+                violations.append(Violation(
+                    "duplicate", f"Job {job_id} is scheduled {len(machine_ids)} times "
+                    f"(on {', '.join(machine_ids)})", job_id=job_id
+                ))
+        
+        if jobs is not None:
+            expected = {job.job_id for job in jobs}
+            for job_id in sorted(expected - placements.keys()):
+                violations.append(Violation("missing", f"Job {job_id} is not scheduled", job_id=job_id))
+            for job_id in sorted(placements.keys() - expected):
+                violations.append(Violation(
+                    "unexpected", f"Job {job_id} is scheduled but not in the job list",
+                    job_id=job_id, machine_id=placements[job_id][0]
+                ))
+        return violations
+    
+    def _check_operators(self, constraint: Constraint) -> List['Violation']:
+        """Operator skills, and no operator booked for two jobs at once."""
+        violations = []
+        operators_by_id = {op.operator_id: op for op in constraint.operators}
+        operator_bookings = defaultdict(list)
+        
+        for assignment in self.iter_assignments():
+            if assignment.operator_id is None:
+                continue
+            operator_bookings[assignment.operator_id].append(assignment)
+            operator = operators_by_id.get(assignment.operator_id)
+            if operator and not operator.has_skill(assignment.job.operator_skill_required):
+                violations.append(Violation(
+                    "skill", f"Job {assignment.job.job_id} needs skill "
+                    f"'{assignment.job.operator_skill_required}' which "
+                    f"{operator.operator_id} doesn't have",
+                    job_id=assignment.job.job_id, machine_id=assignment.machine_id
+                ))
+        
+        for operator_id, bookings in operator_bookings.items():
+            windows = sorted((a.get_processing_window(), a.job.job_id, a.machine_id) for a in bookings)
+            for (earlier, earlier_id, _), (later, later_id, machine_id) in zip(windows, windows[1:]):
+                if later[0] < earlier[1]:
+                    violations.append(Violation(
+                        "operator", f"Operator {operator_id} is double-booked: "
+                        f"{earlier_id} and {later_id} overlap",
+                        job_id=later_id, machine_id=machine_id
+                    ))
+        return violations
+    
+    def to_columns(self) -> Dict[str, List[Any]]:
+        """
+        Convert assignments to column lists (one entry per assignment).
+        
+        Much cheaper than to_dict() for large schedules: no per-row dicts
+        and no strftime. Times are minutes since midnight; dates are
+        proleptic ordinals (0 when the assignment has no date).
+        
+        Returns:
+            Dictionary of column name -> list of values
+        """
+        columns = {
+            "machine_id": [], "job_id": [], "product_type": [],
+            "start_minute": [], "end_minute": [], "setup_time_before": [],
+            "processing_time": [], "tardiness_minutes": [], "is_rush": [],
+            "start_date": [], "end_date": [], "operator_id": []
+        }
+        for machine_id, jobs in self._assignments.items():
+            for assignment in jobs:
+                job = assignment.job
+                columns["machine_id"].append(machine_id)
+                columns["job_id"].append(job.job_id)
+                columns["product_type"].append(job.product_type)
+                columns["start_minute"].append(assignment.start_time.hour * 60 + assignment.start_time.minute)
+                columns["end_minute"].append(assignment.end_time.hour * 60 + assignment.end_time.minute)
+                columns["setup_time_before"].append(assignment.setup_time_before)
+                columns["processing_time"].append(assignment.get_processing_minutes())
+                columns["tardiness_minutes"].append(assignment.get_tardiness_minutes())
+                columns["is_rush"].append(job.is_rush)
+                columns["start_date"].append(assignment.start_date.toordinal() if assignment.start_date else 0)
+                columns["end_date"].append(assignment.end_date.toordinal() if assignment.end_date else 0)
+                columns["operator_id"].append(assignment.operator_id or "")
+        return columns
+    
+    def to_dataframe(self) -> "pd.DataFrame":
+        """
+        Convert assignments to a pandas DataFrame (one row per assignment).
+        
+        Built straight from to_columns(), so no per-row dicts are created.
+        machine_id, product_type and operator_id are categorical; times
+        stay in minutes since midnight (see to_columns).
+        
+        Returns:
+            DataFrame with the to_columns() columns
+        """
+        import pandas as pd  # Optional dependency, only needed here
+        
+        frame = pd.DataFrame(self.to_columns())
+        for column in ("machine_id", "product_type", "operator_id"):
+            frame[column] = frame[column].astype("category")
+        return frame
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert schedule to dictionary."""
         return {
             "assignments": {
                 machine_id: [job.to_dict() for job in jobs]
-                for machine_id, jobs in self.assignments.items()
+                for machine_id, jobs in self._assignments.items()
             },
             "kpis": self.kpis.to_dict() if self.kpis else None,
             "created_by": self.created_by,
@@ -264,9 +1039,8 @@ class Schedule:
         }
     
     def __str__(self) -> str:
-        total_jobs = sum(len(jobs) for jobs in self.assignments.values())
-        return (f"Schedule({len(self.assignments)} machines, "
-                f"{total_jobs} jobs, KPI: {self.kpis})")
+        return (f"Schedule({len(self._assignments)} machines, "
+                f"{self.num_assignments} jobs, KPI: {self.kpis})")
 
 
 # Example usage
@@ -7,6 +7,8 @@ import pandas as pd
 from datetime import datetime, time
 import os
 import sys
+import time as clock
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -19,11 +21,113 @@ from models.job import Job
 from models.machine import Machine
 from models.constraint import Constraint
 from utils.baseline_scheduler import BaselineScheduler
+from utils.bounds import compute_lower_bounds, report_gap
 from agents.batching_agent import BatchingAgent
 from agents.bottleneck_agent import BottleneckAgent
+from utils.result_cache import ScheduleCache, schedule_fingerprint
+from utils.anytime import BaselineStrategy, BatchingStrategy, BottleneckStrategy, PipelineStrategy
+from utils.comparison import compare_strategies
+from ui.background import start_run
+from ui.gantt import (
+    ScheduleColumns, MAX_GANTT_BARS, format_minutes, pick_bucket,
+    window_page, page_count, table_page, heatmap_chart, bar_chart
+)
 
 st.set_page_config(page_title="Multi-Agent Job Optimizer", layout="wide")
 
+
+# Shared resources: created once per server process and reused across
+# reruns and sessions instead of on every button click
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=int(os.getenv("UI_WORKERS", 4)), thread_name_prefix="optimizer")
+
+
+@st.cache_resource
+def get_result_cache() -> ScheduleCache:
+    return ScheduleCache(max_entries=int(os.getenv("UI_CACHE_SIZE", 64)))
+
+
+@st.cache_resource
+def get_batching_agent() -> BatchingAgent:
+    return BatchingAgent()
+
+
+@st.cache_resource
+def get_bottleneck_agent() -> BottleneckAgent:
+    return BottleneckAgent()
+
+
+# Optimization work, run on the executor (no st.* calls in here).
+# Each returns (schedule, explanation, cache key).
+def _cached_run(cache, key, compute, report):
+    cached = cache.get(key)
+    if cached is not None:
+        report("Loaded from cache")
+        return cached + (key,)
+    schedule, explanation = compute()
+    cache.put(key, schedule, explanation)
+    return schedule, explanation, key
+
+
+def annotate_gap(schedule, jobs, machines, constraint):
+    """Store the lower-bound gap on the KPIs (none for a schedule with violations)."""
+    report_gap(schedule, compute_lower_bounds(jobs, machines, constraint), constraint, jobs)
+    is_valid, _ = schedule.validate(machines, constraint, jobs=jobs)
+    if not is_valid:
+        schedule.kpis.optimality_gap = None
+
+
+def format_gap(kpi) -> str:
+    """Gap in percent for display, or 'n/a' if it isn't comparable."""
+    return f"{kpi.optimality_gap * 100:.1f}" if kpi.optimality_gap is not None else "n/a"
+
+
+def run_baseline(jobs, machines, constraint, cache, report):
+    def compute():
+        report("Dispatching jobs in FIFO order...")
+        schedule, explanation = BaselineScheduler().schedule(jobs, machines, constraint)
+        annotate_gap(schedule, jobs, machines, constraint)
+        return schedule, explanation
+
+    key = schedule_fingerprint(jobs, machines, constraint, "ui:baseline:fifo")
+    return _cached_run(cache, key, compute, report)
+
+
+def run_batching(agent, jobs, machines, constraint, cache, report):
+    def compute():
+        report("AI grouping jobs by product...")
+        schedule, explanation = agent.create_batched_schedule(jobs, machines, constraint)
+        report("Calculating KPIs...")
+        schedule.calculate_kpis(machines, constraint)
+        annotate_gap(schedule, jobs, machines, constraint)
+        return schedule, explanation
+
+    key = schedule_fingerprint(jobs, machines, constraint, "ui:batching")
+    return _cached_run(cache, key, compute, report)
+
+
+def run_bottleneck(agent, batched, batched_key, jobs, machines, constraint, cache, report):
+    def compute():
+        report("AI balancing machine workloads...")
+        schedule, explanation = agent.rebalance_schedule(batched, machines, constraint, jobs)
+        report("Calculating KPIs...")
+        schedule.calculate_kpis(machines, constraint)
+        annotate_gap(schedule, jobs, machines, constraint)
+        return schedule, explanation
+
+    # The input schedule is part of the instance: key on the batching result
+    key = schedule_fingerprint(jobs, machines, constraint, f"ui:bottleneck:{batched_key}")
+    return _cached_run(cache, key, compute, report)
+
+
+def run_comparison(strategies, jobs, machines, constraint, report):
+    report(f"Running {len(strategies)} strategies...")
+    return compare_strategies(
+        jobs, machines, constraint, strategies=strategies,
+        on_result=lambda o: report(f"{o.strategy} finished in {o.runtime_ms / 1000:.1f}s")
+    )
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -53,6 +157,7 @@ with st.expander("ℹ️ System Capabilities", expanded=False):
     - **Baseline Scheduler:** Standard FIFO approach for comparison
     - **Batching Optimization:** Groups similar jobs to minimize setup times
     - **Load Balancing:** Distributes work evenly across available machines
+    - **Run All Strategies:** Runs every strategy in parallel and compares quality and runtime
     """)
 
 # Initialize session state
@@ -62,11 +167,80 @@ if 'machines' not in st.session_state:
     st.session_state.machines = []
 if 'constraint' not in st.session_state:
     st.session_state.constraint = None
+if 'runs' not in st.session_state:
+    st.session_state.runs = {}       # run name -> BackgroundRun in progress
+if 'run_notes' not in st.session_state:
+    st.session_state.run_notes = {}  # run name -> (level, message) of last finished run
+
+# Run name -> session_state key of its result, and the message shown when it lands
+RESULT_KEYS = {"baseline": "result_baseline", "batching": "result_batching", "bottleneck": "result_final",
+               "compare": "result_comparison"}
+RUN_NOTES = {
+    "baseline": ("✅ Baseline schedule complete!",
+                 "**Explanation:** Simple FIFO logic. Notice high Tardiness because Rush jobs waited in line."),
+    "batching": ("✅ AI Batching complete!",
+                 "**Explanation:** AI grouped jobs by Product Type. Setup Time dropped, but load might be unbalanced."),
+    "bottleneck": ("✅ Workload balancing complete!",
+                   "**Explanation:** Jobs moved from busy machines to free ones. Optimization Achieved!"),
+}
+
+
+def reset_results():
+    """Drop results and forget in-flight runs (their results are ignored)."""
+    for key in RESULT_KEYS.values():
+        st.session_state.pop(key, None)
+        st.session_state.pop(f"{key}_key", None)
+        st.session_state.pop(f"{key}_columns", None)
+    st.session_state.runs = {}
+    st.session_state.run_notes = {}
+
+
+def collect_runs():
+    """Move results of finished background runs into session state."""
+    for name, run in list(st.session_state.runs.items()):
+        if not run.done:
+            continue
+        del st.session_state.runs[name]
+        try:
+            result = run.result()
+        except Exception as e:
+            st.session_state.run_notes[name] = ("error", f"❌ {run.name} failed: {e}")
+            continue
+        if name == "compare":
+            best = result.best()
+            st.session_state.result_comparison = result
+            st.session_state.run_notes[name] = ("success", (
+                f"✅ Compared {len(result.outcomes)} strategies in {result.wall_ms / 1000:.1f}s",
+                f"**Best:** {best.strategy if best else 'none succeeded'}"
+            ))
+            continue
+        schedule, explanation, key = result
+        st.session_state[RESULT_KEYS[name]] = schedule
+        st.session_state[f"{RESULT_KEYS[name]}_key"] = key
+        st.session_state.run_notes[name] = ("success", RUN_NOTES[name])
+
+
+def show_run_status(name: str):
+    """Progress of a running optimization, or the note of the last one."""
+    run = st.session_state.runs.get(name)
+    if run is not None:
+        st.info(f"⏳ {run.message} ({run.elapsed_s:.0f}s)")
+        return
+    note = st.session_state.run_notes.get(name)
+    if note is None:
+        return
+    level, message = note
+    if level == "error":
+        st.error(message)
+    else:
+        st.success(message[0])
+        st.markdown(message[1])
 
 # Sidebar for input
 st.sidebar.header("📥 Configuration")
 
 from utils.data_generator import generate_random_jobs, get_demo_machines, get_demo_constraint
+from utils.job_loader import load_job_store
 
 # ... imports remain same ...
 
@@ -88,13 +262,33 @@ if st.sidebar.button("🎲 Generate Random Data"):
     st.session_state.constraint = sample_constraint
     
     # Reset results on new data
-    if 'result_baseline' in st.session_state: del st.session_state.result_baseline
-    if 'result_batching' in st.session_state: del st.session_state.result_batching
-    if 'result_final' in st.session_state: del st.session_state.result_final
+    reset_results()
     
     st.sidebar.success(f"✅ Generated {len(sample_jobs)} Random Jobs!")
     
     st.sidebar.success(f"✅ Generated {len(sample_jobs)} Random Jobs!")
+
+# Job feed upload (CSV or JSONL, streamed and validated in bulk)
+uploaded_feed = st.sidebar.file_uploader("📤 Upload Job Feed", type=["csv", "jsonl"])
+if uploaded_feed is not None and st.sidebar.button("📥 Load Uploaded Jobs"):
+    try:
+        store = load_job_store(uploaded_feed)
+    except ValueError as e:
+        st.sidebar.error(f"❌ {e}")
+    else:
+        st.session_state.jobs = store.to_jobs()
+        if not st.session_state.machines:
+            st.session_state.machines = get_demo_machines()
+            st.session_state.constraint = get_demo_constraint()
+        
+        # Reset results on new data
+        reset_results()
+        
+        st.sidebar.success(f"✅ Loaded {len(store)} Jobs!")
+        if store.errors:
+            st.sidebar.warning(f"⚠️ Skipped {len(store.errors)} invalid row(s)")
+            with st.sidebar.expander("Rejected rows"):
+                st.text("\n".join(str(e) for e in store.errors[:200]))
     
 # Persistent Data Preview
 if st.session_state.jobs:
@@ -114,42 +308,43 @@ if st.session_state.jobs:
 # Main content area
 st.header("🎯 Optimization Controls")
 
+collect_runs()
+
 col1, col2, col3 = st.columns(3)
 
 with col1:
     if st.button("📊 Run Baseline Scheduler (FIFO)", use_container_width=True):
         if not st.session_state.jobs:
             st.error("❌ Please generate or upload data first!")
-        else:
-            with st.spinner("Running baseline scheduler..."):
-                baseline = BaselineScheduler()
-                schedule, explanation = baseline.schedule(
-                    st.session_state.jobs,
-                    st.session_state.machines,
-                    st.session_state.constraint
-                )
-                st.session_state.result_baseline = schedule
-                st.success("✅ Baseline schedule complete!")
-                st.markdown("**Explanation:** Simple FIFO logic. Notice high Tardiness because Rush jobs waited in line.")
+        elif 'baseline' not in st.session_state.runs:
+            st.session_state.runs['baseline'] = start_run(
+                get_executor(), "Baseline scheduler", run_baseline,
+                st.session_state.jobs,
+                st.session_state.machines,
+                st.session_state.constraint,
+                get_result_cache()
+            )
+    show_run_status('baseline')
 
 with col2:
     if st.button("🔄 Run Batching Optimization (AI)", use_container_width=True):
         if not st.session_state.jobs:
             st.error("❌ Please generate data first!")
-        else:
-            with st.spinner("Optimization Phase 1: AI Grouping Logic..."):
-                batching_agent = BatchingAgent()
-                schedule, explanation = batching_agent.create_batched_schedule(
+        elif 'batching' not in st.session_state.runs:
+            try:
+                batching_agent = get_batching_agent()
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                st.session_state.runs['batching'] = start_run(
+                    get_executor(), "AI Batching", run_batching,
+                    batching_agent,
                     st.session_state.jobs,
                     st.session_state.machines,
-                    st.session_state.constraint
+                    st.session_state.constraint,
+                    get_result_cache()
                 )
-                # CRITICAL: Calculate KPIs so the Comparison Table doesn't crash
-                schedule.calculate_kpis(st.session_state.machines, st.session_state.constraint)
-                
-                st.session_state.result_batching = schedule
-                st.success("✅ AI Batching complete!")
-                st.markdown("**Explanation:** AI grouped jobs by Product Type. Setup Time dropped, but load might be unbalanced.")
+    show_run_status('batching')
 
 with col3:
     if st.button("⚖️ Run Load Balancing (AI)", use_container_width=True):
@@ -157,25 +352,118 @@ with col3:
             st.error("❌ Please generate data first!")
         elif 'result_batching' not in st.session_state:
             st.error("❌ Run Batching Optimization first!")
-        else:
-            with st.spinner("Optimization Phase 2: Balancing Machine Workloads..."):
-                bottleneck_agent = BottleneckAgent()
-                schedule, explanation = bottleneck_agent.rebalance_schedule(
-                    st.session_state.result_batching,
+        elif 'bottleneck' not in st.session_state.runs:
+            try:
+                bottleneck_agent = get_bottleneck_agent()
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                st.session_state.runs['bottleneck'] = start_run(
+                    get_executor(), "Workload balancing", run_bottleneck,
+                    bottleneck_agent,
+                    st.session_state.result_batching.copy(),
+                    st.session_state.result_batching_key,
+                    st.session_state.jobs,
                     st.session_state.machines,
                     st.session_state.constraint,
-                    st.session_state.jobs
+                    get_result_cache()
                 )
-                # CRITICAL: Calculate KPIs
-                schedule.calculate_kpis(st.session_state.machines, st.session_state.constraint)
-                
-                st.session_state.result_final = schedule
-                st.success("✅ Workload balancing complete!")
-                st.markdown("**Explanation:** Jobs moved from busy machines to free ones. Optimization Achieved!")
+    show_run_status('bottleneck')
+
+# One click: every strategy concurrently, KPIs and runtime side by side
+if st.button("🏁 Run All Strategies (Parallel Comparison)", use_container_width=True):
+    if not st.session_state.jobs:
+        st.error("❌ Please generate or upload data first!")
+    elif 'compare' not in st.session_state.runs:
+        strategies = [BaselineStrategy("fifo"), BaselineStrategy("atcs")]
+        try:
+            batching = BatchingStrategy(get_batching_agent())
+            strategies += [batching, PipelineStrategy([batching, BottleneckStrategy(get_bottleneck_agent())])]
+        except ValueError as e:
+            st.warning(f"⚠️ AI strategies skipped: {e}")
+        st.session_state.runs['compare'] = start_run(
+            get_executor(), "Strategy comparison", run_comparison,
+            strategies,
+            st.session_state.jobs,
+            st.session_state.machines,
+            st.session_state.constraint
+        )
+show_run_status('compare')
+
+TABLE_PAGE_SIZE = 200
+
+
+def schedule_columns(result_key: str) -> ScheduleColumns:
+    """Columnar view of a result, built once per schedule."""
+    schedule = st.session_state[result_key]
+    cached = st.session_state.get(f"{result_key}_columns")
+    if cached is None or cached[0] is not schedule:
+        cached = (schedule, ScheduleColumns(schedule))
+        st.session_state[f"{result_key}_columns"] = cached
+    return cached[1]
+
+
+def render_schedule(result_key: str):
+    """
+    Gantt chart and schedule table for a result.
+
+    Only the selected time window is rendered: machine load per time
+    bucket when it holds too many jobs to draw, individual bars otherwise,
+    and the table one page at a time.
+    """
+    columns = schedule_columns(result_key)
+    if not columns.size:
+        return
+    first, last = columns.span
+    steps = list(range(first - first % 5, last + 5, 5))
+    start, end = st.select_slider(
+        "🔍 Time window", options=steps, value=(steps[0], steps[-1]),
+        format_func=lambda m: str(format_minutes([m])[0]), key=f"{result_key}_window"
+    )
+    if end <= start:
+        end = start + 5
+    visible = columns.count_in_window(start, end)
+
+    st.markdown("**📅 Gantt Chart**")
+    if visible > MAX_GANTT_BARS:
+        bucket = pick_bucket(end - start)
+        st.caption(f"{visible} jobs in view: showing machine load per {bucket} min. Narrow the window to see jobs.")
+        st.altair_chart(heatmap_chart(columns, start, end, bucket), use_container_width=True)
+    else:
+        st.altair_chart(bar_chart(columns, window_page(columns, start, end, 0, MAX_GANTT_BARS)),
+                        use_container_width=True)
+
+    pages = page_count(visible, TABLE_PAGE_SIZE)
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1,
+                               key=f"{result_key}_page")
+    rows = window_page(columns, start, end, page - 1, TABLE_PAGE_SIZE)
+    st.dataframe(pd.DataFrame(table_page(columns, rows)), use_container_width=True, hide_index=True)
+    if pages > 1:
+        first_row = (page - 1) * TABLE_PAGE_SIZE + 1
+        st.caption(f"Rows {first_row}-{first_row + len(rows) - 1} of {visible}")
+
 
 # Results display
 st.header("📈 Results Dashboard")
 
+# ALL STRATEGIES (parallel comparison run)
+if 'result_comparison' in st.session_state:
+    st.subheader("🏁 All Strategies")
+    comparison = st.session_state.result_comparison
+    st.dataframe(pd.DataFrame(comparison.to_rows()).rename(columns={
+        "strategy": "Strategy",
+        "runtime_ms": "Runtime (ms)",
+        "total_tardiness": "Total Tardiness (min)",
+        "total_setup_time": "Setup Time (min)",
+        "utilization_imbalance": "Load Imbalance (%)",
+        "optimality_gap": "Gap to Lower Bound",
+        "score": "Weighted Score",
+        "violations": "Violations",
+        "error": "Error"
+    }), use_container_width=True)
+
 # COMPARISON MATRIX (New Section)
 if 'result_baseline' in st.session_state and 'result_final' in st.session_state:
     st.subheader("⚖️ Strategy Comparison")
@@ -185,10 +473,10 @@ if 'result_baseline' in st.session_state and 'result_final' in st.session_state:
     final_kpi = st.session_state.result_final.kpis
     
     comp_data = {
-        "Metric": ["Total Tardiness (min)", "Setup Time (min)", "Load Imbalance (%)"],
-        "Baseline (FIFO)": [base_kpi.total_tardiness, base_kpi.total_setup_time, f"{base_kpi.utilization_imbalance:.1f}"],
-        "Batching (AI)": [batch_kpi.total_tardiness, batch_kpi.total_setup_time, f"{batch_kpi.utilization_imbalance:.1f}"],
-        "Bottleneck (AI)": [final_kpi.total_tardiness, final_kpi.total_setup_time, f"{final_kpi.utilization_imbalance:.1f}"],
+        "Metric": ["Total Tardiness (min)", "Setup Time (min)", "Load Imbalance (%)", "Gap to Lower Bound (%)"],
+        "Baseline (FIFO)": [base_kpi.total_tardiness, base_kpi.total_setup_time, f"{base_kpi.utilization_imbalance:.1f}", format_gap(base_kpi)],
+        "Batching (AI)": [batch_kpi.total_tardiness, batch_kpi.total_setup_time, f"{batch_kpi.utilization_imbalance:.1f}", format_gap(batch_kpi)],
+        "Bottleneck (AI)": [final_kpi.total_tardiness, final_kpi.total_setup_time, f"{final_kpi.utilization_imbalance:.1f}", format_gap(final_kpi)],
     }
     st.table(pd.DataFrame(comp_data))
 
@@ -211,22 +499,8 @@ if 'result_final' in st.session_state:
         with col4:
             st.metric("Load Imbalance", f"{schedule.kpis.utilization_imbalance:.1f}%", delta_color="inverse")
     
-    # Show schedule table
-    schedule_data = []
-    for machine_id, assignments in schedule.assignments.items():
-        for assignment in assignments:
-            schedule_data.append({
-                "Machine": machine_id,
-                "Job": assignment.job.job_id,
-                "Product": assignment.job.product_type,
-                "Start": assignment.start_time.strftime("%H:%M"),
-                "End": assignment.end_time.strftime("%H:%M"),
-                "Rush": "⚡ Yes" if assignment.job.is_rush else "No"
-            })
-    
-    if schedule_data:
-        df = pd.DataFrame(schedule_data)
-        st.dataframe(df, use_container_width=True)
+    # Show Gantt chart and schedule table
+    render_schedule('result_final')
 
 elif 'result_batching' in st.session_state:
     st.subheader("🔄 Optimization Phase 1 Results")
@@ -242,6 +516,8 @@ elif 'result_batching' in st.session_state:
             st.metric("Setup Switches", schedule.kpis.num_setup_switches)
         with col3:
             st.metric("Setup Time", f"{schedule.kpis.total_setup_time} min")
+    
+    render_schedule('result_batching')
 
 elif 'result_baseline' in st.session_state:
     st.subheader("📊 Baseline (FIFO) Results")
@@ -255,6 +531,8 @@ elif 'result_baseline' in st.session_state:
             st.metric("Total Tardiness", f"{schedule.kpis.total_tardiness} min")
         with col2:
             st.metric("Setup Time", f"{schedule.kpis.total_setup_time} min")
+    
+    render_schedule('result_baseline')
 
 else:
     st.info("  run the optimizer.")
@@ -262,3 +540,8 @@ else:
 # Footer
 st.markdown("---")
 st.markdown("**Multi-Agent Job Optimizer** • Powered by Groq AI & LangChain")
+
+# Poll in-flight runs: rerun shortly so their results show up when ready
+if st.session_state.runs:
+    clock.sleep(0.5)
+    st.rerun()
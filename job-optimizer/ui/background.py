@@ -0,0 +1,78 @@
+"""
+Background Runs - Optimizations that don't block the Streamlit script
+
+Streamlit re-executes the whole script on every interaction, so a slow
+optimizer call inside a button handler freezes the page until it
+returns. Instead the handler submits the work to a shared thread pool
+and stores a BackgroundRun in st.session_state; every rerun polls it and
+picks up the result once it is done.
+
+Work functions run outside the Streamlit script thread: they must not
+touch st.* or st.session_state. They receive a `report` callback for
+progress messages instead.
+
+Key Features:
+    - BackgroundRun: future + progress messages + timing
+    - start_run(): submit work to an executor
+"""
+
+import threading
+import time as clock
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, List, Optional
+
+
+class BackgroundRun:
+    """One optimization running (or finished) on a worker thread."""
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Label shown while the run is in progress
+        """
+        self.name = name
+        self.future: Optional[Future] = None
+        self.started = clock.monotonic()
+        self._messages: List[str] = []
+        self._lock = threading.Lock()
+
+    def report(self, message: str):
+        """Record a progress message (safe to call from the worker)."""
+        with self._lock:
+            self._messages.append(message)
+
+    @property
+    def message(self) -> str:
+        """Latest progress message."""
+        with self._lock:
+            return self._messages[-1] if self._messages else "Starting..."
+
+    @property
+    def elapsed_s(self) -> float:
+        return clock.monotonic() - self.started
+
+    @property
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def result(self) -> Any:
+        """Result of the work function (re-raises its exception)."""
+        return self.future.result()
+
+
+def start_run(executor: Executor, name: str, work: Callable[..., Any], *args: Any) -> BackgroundRun:
+    """
+    Submit work to the executor.
+
+    Args:
+        executor: Shared executor (e.g. from st.cache_resource)
+        name: Label for progress display
+        work: Function called as work(*args, report)
+        *args: Arguments for work
+
+    Returns:
+        BackgroundRun to keep in st.session_state and poll on rerun
+    """
+    run = BackgroundRun(name)
+    run.future = executor.submit(work, *args, run.report)
+    return run
@@ -0,0 +1,209 @@
+"""
+Gantt & Table Views - Render large schedules without freezing the page
+
+A full-plant schedule can have tens of thousands of assignments. Drawing
+one bar per assignment (or building one dict per table row) makes the
+browser and the script crawl, so the results view works on NumPy columns
+and only ever sends a bounded amount of data to the page:
+
+    - Zoomed out: per-machine load aggregated into time buckets (heatmap)
+    - Zoomed in: individual assignments in the visible window, paged
+    - Table: one page of rows at a time, sliced from a columnar frame
+
+Key Features:
+    - ScheduleColumns: NumPy columns with absolute (multi-day) minutes
+    - bucket_load(): exact busy minutes per machine and bucket in O(n + M*B)
+    - window_page(): assignments overlapping a time window, one page at a time
+    - Altair charts for both zoom levels (altair ships with Streamlit)
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from models.schedule import Schedule
+
+
+MINUTES_PER_DAY = 24 * 60
+
+# Above this many bars in the visible window, the Gantt aggregates instead
+MAX_GANTT_BARS = 1500
+
+# Bucket sizes tried in order when aggregating (minutes)
+BUCKET_SIZES = (5, 10, 15, 30, 60, 120, 240, 480, 720, 1440)
+
+
+class ScheduleColumns:
+    """
+    Columnar view of a schedule for rendering.
+
+    Times are absolute minutes from midnight of the first scheduled day,
+    so multi-day schedules line up on one axis.
+    """
+
+    def __init__(self, schedule: Schedule):
+        raw = schedule.to_columns()
+        self.size = len(raw["job_id"])
+        self.machine_ids: List[str] = sorted(schedule.assignments)
+        machine_index = {m: i for i, m in enumerate(self.machine_ids)}
+
+        self.machine = np.fromiter((machine_index[m] for m in raw["machine_id"]), dtype=np.int32, count=self.size)
+        self.job_id = np.array(raw["job_id"], dtype=object)
+        self.product_type = np.array(raw["product_type"], dtype=object)
+        self.is_rush = np.array(raw["is_rush"], dtype=bool)
+        self.setup = np.array(raw["setup_time_before"], dtype=np.int64)
+
+        start_date = np.array(raw["start_date"], dtype=np.int64)
+        end_date = np.array(raw["end_date"], dtype=np.int64)
+        dated = start_date[start_date > 0]
+        self.first_day = int(dated.min()) if dated.size else 0
+        start_day = np.where(start_date > 0, start_date - self.first_day, 0)
+        end_day = np.where(end_date > 0, end_date - self.first_day, start_day)
+
+        self.start = start_day * MINUTES_PER_DAY + np.array(raw["start_minute"], dtype=np.int64)
+        self.end = np.maximum(end_day * MINUTES_PER_DAY + np.array(raw["end_minute"], dtype=np.int64), self.start)
+
+    @property
+    def span(self) -> Tuple[int, int]:
+        """(first start, last end) in absolute minutes."""
+        if not self.size:
+            return 0, 0
+        return int(self.start.min()), int(self.end.max())
+
+    def count_in_window(self, start: int, end: int) -> int:
+        """Number of assignments overlapping [start, end)."""
+        return int(np.count_nonzero((self.start < end) & (self.end > start)))
+
+
+def format_minutes(minutes: np.ndarray) -> np.ndarray:
+    """Absolute minutes -> "HH:MM" (with "+Nd" for later days), vectorised."""
+    minutes = np.asarray(minutes, dtype=np.int64)
+    day, rest = np.divmod(minutes, MINUTES_PER_DAY)
+    text = np.char.add(np.char.add(np.char.zfill((rest // 60).astype(str), 2), ":"),
+                       np.char.zfill((rest % 60).astype(str), 2))
+    return np.where(day > 0, np.char.add(text, np.char.add(" +", np.char.add(day.astype(str), "d"))), text)
+
+
+def pick_bucket(window_minutes: int, max_buckets: int = 200) -> int:
+    """Smallest standard bucket that keeps the window under max_buckets."""
+    for size in BUCKET_SIZES:
+        if window_minutes / size <= max_buckets:
+            return size
+    return BUCKET_SIZES[-1]
+
+
+def bucket_load(columns: ScheduleColumns, start: int, end: int, bucket: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Busy minutes (setup + processing) per machine and time bucket.
+
+    Uses a per-machine difference array over the window, so the cost is
+    O(assignments + machines x window minutes) regardless of overlap.
+
+    Args:
+        columns: Schedule columns
+        start: Window start (absolute minutes)
+        end: Window end (absolute minutes)
+        bucket: Bucket size in minutes
+
+    Returns:
+        (bucket start minutes, utilization matrix machines x buckets in [0, 1])
+    """
+    num_buckets = max(int(np.ceil((end - start) / bucket)), 1)
+    width = num_buckets * bucket
+    machines = len(columns.machine_ids)
+
+    s = np.clip(columns.start - start, 0, width)
+    e = np.clip(columns.end - start, 0, width)
+    visible = e > s
+    diff = np.zeros((machines, width + 1), dtype=np.int32)
+    np.add.at(diff, (columns.machine[visible], s[visible]), 1)
+    np.add.at(diff, (columns.machine[visible], e[visible]), -1)
+    busy = np.minimum(np.cumsum(diff[:, :width], axis=1), 1)
+
+    load = busy.reshape(machines, num_buckets, bucket).sum(axis=2) / bucket
+    return start + np.arange(num_buckets) * bucket, load
+
+
+def window_page(columns: ScheduleColumns, start: int, end: int, page: int, page_size: int) -> np.ndarray:
+    """
+    Row indices of one page of assignments overlapping [start, end),
+    ordered by start time.
+
+    Args:
+        columns: Schedule columns
+        start: Window start (absolute minutes)
+        end: Window end (absolute minutes)
+        page: Zero-based page number
+        page_size: Rows per page
+
+    Returns:
+        Row indices into the columns
+    """
+    rows = np.flatnonzero((columns.start < end) & (columns.end > start))
+    rows = rows[np.argsort(columns.start[rows], kind="stable")]
+    return rows[page * page_size:(page + 1) * page_size]
+
+
+def page_count(total: int, page_size: int) -> int:
+    return max((total + page_size - 1) // page_size, 1)
+
+
+def table_page(columns: ScheduleColumns, rows: np.ndarray) -> Dict[str, Any]:
+    """
+    Table columns for the given rows (pass to pd.DataFrame / st.dataframe).
+    """
+    return {
+        "Machine": np.array(columns.machine_ids, dtype=object)[columns.machine[rows]],
+        "Job": columns.job_id[rows],
+        "Product": columns.product_type[rows],
+        "Start": format_minutes(columns.start[rows]),
+        "End": format_minutes(columns.end[rows]),
+        "Setup (min)": columns.setup[rows],
+        "Rush": np.where(columns.is_rush[rows], "⚡ Yes", "No"),
+    }
+
+
+def _time_axis():
+    import altair as alt
+    # Axis values are minutes; show them as clock times
+    return alt.Axis(labelExpr="utcFormat(datum.value * 60000, '%H:%M')")
+
+
+def heatmap_chart(columns: ScheduleColumns, start: int, end: int, bucket: int):
+    """Aggregated Gantt: machine x time bucket, colored by utilization."""
+    import altair as alt
+    import pandas as pd
+
+    bucket_starts, load = bucket_load(columns, start, end, bucket)
+    machines = len(columns.machine_ids)
+    frame = pd.DataFrame({
+        "Machine": np.repeat(columns.machine_ids, len(bucket_starts)),
+        "From": np.tile(bucket_starts, machines),
+        "To": np.tile(bucket_starts + bucket, machines),
+        "Label": np.tile(format_minutes(bucket_starts), machines),
+        "Utilization": load.ravel(),
+    })
+    return alt.Chart(frame).mark_rect().encode(
+        x=alt.X("From:Q", title=f"Time ({bucket} min buckets)", axis=_time_axis()),
+        x2="To:Q",
+        y=alt.Y("Machine:N"),
+        color=alt.Color("Utilization:Q", scale=alt.Scale(domain=[0, 1], scheme="blues")),
+        tooltip=["Machine", "Label", alt.Tooltip("Utilization:Q", format=".0%")]
+    )
+
+
+def bar_chart(columns: ScheduleColumns, rows: np.ndarray):
+    """Detailed Gantt: one bar per assignment in `rows`."""
+    import altair as alt
+    import pandas as pd
+
+    frame = pd.DataFrame(table_page(columns, rows))
+    frame["From"] = columns.start[rows]
+    frame["To"] = columns.end[rows]
+    return alt.Chart(frame).mark_bar().encode(
+        x=alt.X("From:Q", title="Time", axis=_time_axis()),
+        x2="To:Q",
+        y=alt.Y("Machine:N"),
+        color=alt.Color("Product:N"),
+        tooltip=["Job", "Product", "Machine", "Start", "End", "Rush"]
+    )
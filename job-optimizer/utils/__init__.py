@@ -1,5 +1,16 @@
 """Utils package"""
 from .baseline_scheduler import BaselineScheduler
-from .config_loader import load_config
+from .config_loader import load_config, load_plant_model
+from .rescheduler import repair_after_downtime
+from .horizon_scheduler import HorizonScheduler
+from .anytime import optimize, CancelToken
+from .batch import optimize_batch, Scenario
+from .result_cache import ScheduleCache, schedule_fingerprint
+from .comparison import compare_strategies
+from .decomposition import solve_decomposed, find_components
+from .load_flow import assign_load, sequence_assignment
 
-__all__ = ['BaselineScheduler', 'load_config']
+__all__ = ['BaselineScheduler', 'load_config', 'load_plant_model', 'repair_after_downtime', 'HorizonScheduler',
+           'optimize', 'CancelToken', 'optimize_batch', 'Scenario',
+           'ScheduleCache', 'schedule_fingerprint', 'compare_strategies',
+           'solve_decomposed', 'find_components', 'assign_load', 'sequence_assignment']
@@ -0,0 +1,428 @@
+"""
+Anytime Optimization - One entry point with a wall-clock budget
+
+optimize() runs a chain of scheduling strategies under a hard deadline
+and always returns the best schedule found so far. A fast dispatch-rule
+baseline runs first so there is an answer almost immediately; slower
+strategies (the LLM agents, improvers) then try to beat it with whatever
+budget is left. A strategy that overruns the deadline is abandoned and
+its result ignored.
+
+The budget is hard for every strategy except the first, which always
+runs to completion so there is an answer at all (keep it fast; the
+dispatch baseline takes milliseconds). Cooperative strategies check
+should_stop() as they go; strategies after the deadline are skipped.
+Blocking LLM strategies can't be interrupted: they only start when their
+expected runtime fits in the remaining budget, and an abandoned one
+finishes its in-flight request without starting another.
+
+Key Features:
+    - Hard budget in milliseconds plus cooperative cancellation
+    - Best-so-far result: fewest violations first, then weighted score
+    - Progress callbacks after every strategy
+    - Early stop when the best schedule is within tolerance of the lower
+      bound (see utils.bounds)
+    - Warm start from a previous schedule (see utils.warm_start)
+"""
+
+import threading
+import time as clock
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from models.job import Job
+from models.machine import Machine, Constraint
+from models.schedule import Schedule
+from utils.baseline_scheduler import BaselineScheduler
+from utils.bounds import compute_lower_bounds, report_gap
+
+
+class CancelToken:
+    """
+    Thread-safe flag to cancel a running optimize() call.
+
+    Example:
+        >>> token = CancelToken()
+        >>> # from another thread / request handler:
+        >>> token.cancel()
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Request cancellation."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+@dataclass
+class Progress:
+    """Snapshot passed to progress callbacks."""
+    strategy: str              # Strategy that just finished (or was abandoned)
+    elapsed_ms: int
+    best_score: float          # Weighted score of the best schedule so far
+    best_strategy: str
+    improved: bool             # Did this strategy produce the new best?
+    message: str = ""
+
+
+@dataclass
+class OptimizationResult:
+    """Best schedule found by optimize() and how the run went."""
+    schedule: Schedule
+    explanation: str
+    strategy: str              # Strategy that produced `schedule`
+    score: float
+    elapsed_ms: int
+    timed_out: bool = False
+    cancelled: bool = False
+    history: List[Progress] = field(default_factory=list)
+
+
+class Strategy(ABC):
+    """
+    Base class for strategies run by optimize().
+
+    Subclasses implement run(). Long-running strategies should call
+    should_stop() regularly and return their best result when it is True;
+    strategies that can't (e.g. a blocking LLM call) are run in a worker
+    thread and abandoned at the deadline.
+    """
+
+    name = "strategy"
+    blocking = False   # True = may block without checking should_stop
+    expected_ms = 0    # Typical runtime; blocking strategies aren't started with less budget left
+
+    @abstractmethod
+    def run(
+        self,
+        jobs: List[Job],
+        machines: List[Machine],
+        constraint: Constraint,
+        incumbent: Optional[Schedule],
+        should_stop: Callable[[], bool]
+    ) -> Optional[Tuple[Schedule, str]]:
+        """
+        Produce a schedule.
+
+        Args:
+            jobs: Jobs to schedule
+            machines: Available machines
+            constraint: Scheduling constraints
+            incumbent: Copy of the best schedule so far (may be None)
+            should_stop: Returns True once the budget is spent or the run
+                was cancelled
+
+        Returns:
+            Tuple of (Schedule, explanation), or None if nothing was found
+        """
+
+
+class BaselineStrategy(Strategy):
+    """BaselineScheduler with a dispatch rule (fast, never blocks)."""
+
+    def __init__(self, rule: str = "atcs"):
+        self.rule = rule
+        self.name = f"baseline:{rule}"
+
+    def run(self, jobs, machines, constraint, incumbent, should_stop):
+        if should_stop():
+            return None
+        return BaselineScheduler(self.rule).schedule(jobs, machines, constraint, should_stop=should_stop)
+
+
+class BatchingStrategy(Strategy):
+    """BatchingAgent (LLM call, blocking)."""
+
+    name = "batching"
+    blocking = True
+    expected_ms = 3000  # One LLM round trip
+
+    def __init__(self, agent=None):
+        self.agent = agent  # Reuse an existing BatchingAgent (created on demand otherwise)
+
+    def run(self, jobs, machines, constraint, incumbent, should_stop):
+        if should_stop():
+            return None
+        agent = self.agent
+        if agent is None:
+            from agents.batching_agent import BatchingAgent
+            agent = BatchingAgent()
+        return agent.create_batched_schedule(jobs, machines, constraint)
+
+
+class BottleneckStrategy(Strategy):
+    """BottleneckAgent rebalancing the incumbent (LLM call, blocking)."""
+
+    blocking = True
+    expected_ms = 3000  # One LLM round trip
+
+    def __init__(self, agent=None, mode: str = "global"):
+        self.agent = agent  # Reuse an existing BottleneckAgent (created on demand otherwise)
+        self.mode = mode    # "global" or "incremental" (see BottleneckAgent.rebalance_schedule)
+        self.name = "bottleneck" if mode == "global" else f"bottleneck:{mode}"
+
+    def run(self, jobs, machines, constraint, incumbent, should_stop):
+        if incumbent is None or should_stop():
+            return None
+        agent = self.agent
+        if agent is None:
+            from agents.bottleneck_agent import BottleneckAgent
+            agent = BottleneckAgent()
+        return agent.rebalance_schedule(incumbent, machines, constraint, jobs, mode=self.mode)
+
+
+class WarmStartStrategy(Strategy):
+    """
+    Previous schedule mapped onto the current jobs (fast, never blocks).
+
+    See utils.warm_start. Strategies after it get the mapped seed as
+    their incumbent.
+    """
+
+    name = "warm-start"
+
+    def __init__(self, seed: Schedule):
+        self.seed = seed
+
+    def run(self, jobs, machines, constraint, incumbent, should_stop):
+        if should_stop():
+            return None
+        from utils.warm_start import warm_start
+        schedule, report = warm_start(self.seed, jobs, machines, constraint)
+        lines = [
+            "WARM START from the previous schedule:",
+            f"- Kept on their machine, in order: {report.kept} job(s)",
+            f"- Dropped (no longer ordered): {len(report.dropped)}",
+            f"- Inserted (new): {len(report.inserted)}",
+        ]
+        if report.relocated:
+            lines.append(f"- Moved to another machine (no longer fit): {', '.join(report.relocated)}")
+        if report.unplaced:
+            lines.append(f"- Could not be placed: {', '.join(report.unplaced)}")
+        return schedule, "\n".join(lines) + "\n"
+
+
+class PipelineStrategy(Strategy):
+    """
+    Run strategies one after another, each improving the previous result
+    (e.g. batching followed by bottleneck relief).
+
+    No stage starts once should_stop() is True, so an abandoned pipeline
+    never makes another LLM call after the deadline.
+    """
+
+    def __init__(self, stages: List[Strategy]):
+        self.stages = stages
+        self.name = "+".join(stage.name for stage in stages)
+        self.blocking = any(stage.blocking for stage in stages)
+        self.expected_ms = sum(stage.expected_ms for stage in stages)
+
+    def run(self, jobs, machines, constraint, incumbent, should_stop):
+        outcome = None
+        for stage in self.stages:
+            if should_stop():
+                break
+            result = stage.run(jobs, machines, constraint, outcome[0].copy() if outcome else incumbent, should_stop)
+            if result is not None:
+                outcome = result
+        return outcome
+
+
+def default_strategies() -> List[Strategy]:
+    """Baseline dispatch first, then the agent pipeline."""
+    return [BaselineStrategy("atcs"), BaselineStrategy("edd"), BatchingStrategy(), BottleneckStrategy()]
+
+
+def warm_strategies() -> List[Strategy]:
+    """
+    Strategies after a warm start: a cheap ATCS dispatch in case the seed
+    no longer fits, then incremental relief of the best schedule so far.
+    """
+    return [BaselineStrategy("atcs"), BottleneckStrategy(mode="incremental")]
+
+
+def _rank(
+    schedule: Schedule,
+    machines: List[Machine],
+    constraint: Constraint,
+    jobs: Optional[List[Job]] = None
+) -> Tuple[int, float]:
+    """
+    Sort key for candidate schedules: violations first, then score.
+
+    Pass the job list so that a schedule which leaves jobs out counts
+    every missing job as a violation instead of ranking as clean.
+    """
+    schedule.calculate_kpis(machines, constraint)
+    _, violations = schedule.validate(machines, constraint, jobs=jobs)
+    return len(violations), schedule.kpis.get_weighted_score(constraint)
+
+
+def optimize(
+    jobs: List[Job],
+    machines: List[Machine],
+    constraint: Constraint,
+    budget_ms: int,
+    cancel_token: Optional[CancelToken] = None,
+    strategies: Optional[List[Strategy]] = None,
+    on_progress: Optional[Callable[[Progress], None]] = None,
+    gap_tolerance: float = 0.0,
+    seed: Optional[Schedule] = None
+) -> OptimizationResult:
+    """
+    Run strategies within a wall-clock budget and return the best schedule.
+
+    The first strategy is always run to completion so that a schedule is
+    returned even with a tiny budget, so the first answer may overrun the
+    budget by its own runtime; keep it fast (the default is a
+    dispatch-rule baseline). With a seed, the warm start plays that role
+    and every strategy after it starts from the best schedule so far.
+
+    Every later strategy is held to the deadline: cooperative ones stop via
+    should_stop(), none starts after the deadline, and a blocking one only
+    starts if its expected_ms fits in the remaining budget. A blocking
+    strategy still running at the deadline is abandoned; its in-flight LLM
+    request completes in the background (Python threads can't be killed)
+    and its result is discarded.
+
+    Args:
+        jobs: Jobs to schedule
+        machines: Available machines
+        constraint: Scheduling constraints
+        budget_ms: Wall-clock budget in milliseconds
+        cancel_token: Optional token to stop early
+        strategies: Strategies to run in order (defaults to
+            default_strategies(), or warm_strategies() with a seed)
+        on_progress: Called with a Progress after each strategy
+        gap_tolerance: Stop once the best schedule is within this relative
+            gap of the lower bound
+        seed: Previous schedule to warm-start from (see utils.warm_start)
+
+    Returns:
+        OptimizationResult with the best schedule found
+    """
+    started = clock.monotonic()
+    deadline = started + budget_ms / 1000.0
+    if strategies is None:
+        strategies = warm_strategies() if seed is not None else default_strategies()
+    if seed is not None:
+        strategies = [WarmStartStrategy(seed)] + list(strategies)
+    cancel_token = cancel_token or CancelToken()
+    bounds = compute_lower_bounds(jobs, machines, constraint)
+
+    def elapsed_ms() -> int:
+        return int((clock.monotonic() - started) * 1000)
+
+    def should_stop() -> bool:
+        return cancel_token.cancelled or clock.monotonic() >= deadline
+
+    best: Optional[Tuple[Tuple[int, float], Schedule, str, str]] = None
+    history: List[Progress] = []
+    timed_out = False
+
+    for position, strategy in enumerate(strategies):
+        if position > 0 and should_stop():
+            timed_out = not cancel_token.cancelled
+            break
+
+        incumbent = best[1].copy() if best else None
+        outcome, message = None, ""
+        if position > 0 and strategy.blocking and (deadline - clock.monotonic()) * 1000 < strategy.expected_ms:
+            message = f"skipped: needs ~{strategy.expected_ms} ms, budget left too small"
+        elif position > 0 and strategy.blocking:
+            # Run in a worker thread; give up on it at the deadline
+            box = {}
+
+            def work(strategy=strategy, incumbent=incumbent, box=box):
+                try:
+                    box["result"] = strategy.run(jobs, machines, constraint, incumbent, should_stop)
+                except Exception as e:
+                    box["error"] = e
+
+            worker = threading.Thread(target=work, name=f"optimize-{strategy.name}", daemon=True)
+            worker.start()
+            while worker.is_alive() and not should_stop():
+                worker.join(timeout=min(0.05, max(deadline - clock.monotonic(), 0.001)))
+            if worker.is_alive():
+                timed_out = not cancel_token.cancelled
+                message = "abandoned at deadline" if timed_out else "cancelled"
+            elif "error" in box:
+                message = f"failed: {box['error']}"
+            else:
+                outcome = box.get("result")
+        else:
+            # The first strategy always finishes: it guarantees an answer
+            stop = should_stop if position > 0 else (lambda: False)
+            try:
+                outcome = strategy.run(jobs, machines, constraint, incumbent, stop)
+            except Exception as e:
+                message = f"failed: {e}"
+
+        improved = False
+        if outcome is not None:
+            # A strategy may hand back a schedule the caller still owns (e.g.
+            # the seed or a stored incumbent): KPIs and the gap go on a copy
+            schedule, explanation = outcome[0].copy(), outcome[1]
+            rank = _rank(schedule, machines, constraint, jobs)
+            if best is None or rank < best[0]:
+                best = (rank, schedule, explanation, strategy.name)
+                improved = True
+
+        progress = Progress(
+            strategy=strategy.name,
+            elapsed_ms=elapsed_ms(),
+            best_score=best[0][1] if best else float("inf"),
+            best_strategy=best[3] if best else "",
+            improved=improved,
+            message=message
+        )
+        history.append(progress)
+        if on_progress:
+            on_progress(progress)
+
+        # Only a complete, violation-free schedule can be close to optimal
+        if best is not None and best[0][0] == 0:
+            gap = report_gap(best[1], bounds, constraint, jobs)
+            if gap is not None and gap <= gap_tolerance:
+                break
+
+    if best is None:
+        raise RuntimeError("No strategy produced a schedule")
+
+    rank, schedule, explanation, name = best
+    # KPIs (including num_violations for the full job list) are from _rank
+    report_gap(schedule, bounds, constraint, jobs)
+    if rank[0] > 0:
+        schedule.kpis.optimality_gap = None  # Not comparable to the bound
+    return OptimizationResult(
+        schedule=schedule,
+        explanation=explanation,
+        strategy=name,
+        score=rank[1],
+        elapsed_ms=elapsed_ms(),
+        timed_out=timed_out,
+        cancelled=cancel_token.cancelled,
+        history=history
+    )
+
+
+# Example usage
+if __name__ == "__main__":
+    from utils.data_generator import generate_random_jobs, get_demo_machines, get_demo_constraint
+
+    result = optimize(
+        generate_random_jobs(50),
+        get_demo_machines(),
+        get_demo_constraint(),
+        budget_ms=2000,
+        strategies=[BaselineStrategy("fifo"), BaselineStrategy("edd"), BaselineStrategy("atcs")],
+        on_progress=lambda p: print(f"[{p.elapsed_ms:>5} ms] {p.strategy}: best {p.best_score:.0f} "
+                                    f"({p.best_strategy}) {p.message}")
+    )
+    print(f"\nBest: {result.strategy} {result.schedule.kpis}")
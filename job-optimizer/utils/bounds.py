@@ -0,0 +1,276 @@
+"""
+Lower Bounds - Cheap bounds and optimality gaps for schedules
+
+A KPI on its own doesn't say whether a schedule is close to the best
+possible one. This module computes lower bounds that no schedule can beat,
+in O(n log n) with NumPy, so the distance to the bound (the optimality
+gap) can be reported next to the KPIs and used to stop optimizing early.
+
+Bounds:
+    - Makespan: for every set of machines S, the jobs that can only run
+      on S need at least (their nominal work / combined rate of S) minutes;
+      also no schedule ends before its longest job
+    - Setup: every job except the first one on each machine changes over
+      from some product, costing at least the cheapest setup into its
+      product from any product in the job set
+    - Tardiness: all machines merged into one machine with their combined
+      rate and no setups. The k-th completion is no earlier than the k
+      shortest jobs back to back; pairing these with the due dates in EDD
+      order gives a bound on total tardiness (Chu, 1992)
+
+The bounds cover the whole job list, so a gap is only meaningful for a
+schedule that contains every job. An incomplete schedule (or any score
+below its bound) gets no gap (None) rather than a misleading 0%.
+
+Key Features:
+    - LowerBounds dataclass with weighted objective bound
+    - optimality_gap() and report_gap() to annotate KPIs
+    - within_tolerance() for early termination in optimizers
+"""
+
+from dataclasses import dataclass, field
+from typing import FrozenSet, List, Optional
+
+import numpy as np
+
+from models.job import Job
+from models.machine import Machine, Constraint
+from models.schedule import KPI, Schedule
+from utils.processing_times import ProcessingTimeMatrix
+from utils.time_utils import to_minutes
+
+
+@dataclass
+class LowerBounds:
+    """Lower bounds for one scheduling instance."""
+    makespan: int = 0    # Minutes from shift start to last completion
+    setup: int = 0       # Total setup minutes
+    tardiness: int = 0   # Total tardiness minutes
+    job_ids: FrozenSet[str] = field(default_factory=frozenset, repr=False)  # Jobs the bounds cover
+
+    def weighted_score(self, constraint: Constraint) -> float:
+        """
+        Lower bound on the part of KPI.get_weighted_score() that is bounded
+        (tardiness and setup; utilization imbalance and violations can be 0).
+        """
+        return self.tardiness * constraint.tardiness_weight + self.setup * constraint.setup_weight
+
+    def __str__(self) -> str:
+        return (f"LowerBounds(Makespan: {self.makespan}min, Setup: {self.setup}min, "
+                f"Tardiness: {self.tardiness}min)")
+
+
+def makespan_lower_bound(jobs: List[Job], machines: List[Machine],
+                         durations: Optional[ProcessingTimeMatrix] = None) -> int:
+    """
+    Makespan bound from total work over compatible capacity.
+
+    Args:
+        jobs: Jobs to schedule
+        machines: Available machines
+        durations: Precomputed matrix for jobs x machines (optional)
+
+    Returns:
+        Minutes (0 if no job can be scheduled)
+    """
+    if durations is None:
+        durations = ProcessingTimeMatrix(jobs, machines)
+    compatible = durations.minutes >= 0
+    schedulable = compatible.any(axis=1)
+    if not schedulable.any():
+        return 0
+    compatible = compatible[schedulable]
+
+    nominal = np.array([j.processing_time for j in jobs], dtype=float)[schedulable]
+    rates = np.array([m.capacity_per_hour for m in machines], dtype=float) / 60.0
+
+    # No job finishes faster than on its fastest machine
+    fastest = np.where(durations.minutes[schedulable] >= 0, durations.minutes[schedulable], np.inf)
+    bound = float(fastest.min(axis=1).max())
+
+    # Jobs confined to machine set S share S's capacity
+    for machine_set in np.unique(compatible, axis=0):
+        confined = ~(compatible & ~machine_set).any(axis=1)
+        bound = max(bound, nominal[confined].sum() / rates[machine_set].sum())
+
+    return int(np.ceil(bound))
+
+
+def setup_lower_bound(jobs: List[Job], machines: List[Machine], constraint: Constraint) -> int:
+    """
+    Setup bound from the setup matrix restricted to the products in the job set.
+
+    Args:
+        jobs: Jobs to schedule
+        machines: Available machines
+        constraint: Provides the setup times
+
+    Returns:
+        Minutes
+    """
+    if not jobs:
+        return 0
+    products = list(dict.fromkeys(j.product_type for j in jobs))
+    matrix = np.array(
+        [[constraint.get_setup_time(a, b) for b in products] for a in products],
+        dtype=np.int64
+    ).reshape(len(products), len(products))
+    cheapest_into = matrix.min(axis=0)
+
+    index = {p: i for i, p in enumerate(products)}
+    per_job = np.sort(cheapest_into[[index[j.product_type] for j in jobs]])
+
+    # The first job on each machine needs no setup: drop the most expensive ones
+    free = min(len(machines), len(per_job))
+    return int(per_job[:len(per_job) - free].sum())
+
+
+def tardiness_lower_bound(jobs: List[Job], machines: List[Machine], constraint: Constraint,
+                          durations: Optional[ProcessingTimeMatrix] = None) -> int:
+    """
+    Tardiness bound from a relaxed single-machine EDD problem.
+
+    Only defined for single-shift instances (due_time only, like
+    JobAssignment.get_tardiness_minutes without dates); returns 0 when any
+    job carries a due_date.
+
+    Args:
+        jobs: Jobs to schedule
+        machines: Available machines
+        constraint: Provides the shift start
+        durations: Precomputed matrix for jobs x machines (optional)
+
+    Returns:
+        Minutes
+    """
+    if not jobs or not machines or any(j.due_date is not None for j in jobs):
+        return 0
+    if durations is None:
+        durations = ProcessingTimeMatrix(jobs, machines)
+    schedulable = (durations.minutes >= 0).any(axis=1)
+    if not schedulable.any():
+        return 0
+
+    nominal = np.sort(np.array([j.processing_time for j in jobs], dtype=float)[schedulable])
+    due = np.sort(np.array([to_minutes(j.due_time) for j in jobs], dtype=float)[schedulable])
+    combined_rate = sum(m.capacity_per_hour for m in machines) / 60.0
+
+    fastest = np.where(durations.minutes[schedulable] >= 0, durations.minutes[schedulable], np.inf)
+    earliest = to_minutes(constraint.shift_start) + fastest.min()
+
+    completions = np.maximum(to_minutes(constraint.shift_start) + np.cumsum(nominal) / combined_rate, earliest)
+    return int(np.floor(np.maximum(completions - due, 0).sum()))
+
+
+def compute_lower_bounds(jobs: List[Job], machines: List[Machine], constraint: Constraint) -> LowerBounds:
+    """
+    Compute all lower bounds for an instance.
+
+    Args:
+        jobs: Jobs to schedule
+        machines: Available machines
+        constraint: Scheduling constraints
+
+    Returns:
+        LowerBounds
+    """
+    durations = ProcessingTimeMatrix(jobs, machines)
+    return LowerBounds(
+        makespan=makespan_lower_bound(jobs, machines, durations),
+        setup=setup_lower_bound(jobs, machines, constraint),
+        tardiness=tardiness_lower_bound(jobs, machines, constraint, durations),
+        job_ids=frozenset(job.job_id for job in jobs)
+    )
+
+
+def optimality_gap(kpi: KPI, bounds: LowerBounds, constraint: Constraint) -> Optional[float]:
+    """
+    Relative gap between a schedule's bounded objective and its lower bound.
+
+    Only meaningful for a schedule of every job the bounds cover (see
+    report_gap(), which checks that).
+
+    Args:
+        kpi: Calculated KPIs of the schedule
+        bounds: Lower bounds for the instance
+        constraint: Provides the objective weights
+
+    Returns:
+        Gap in [0, 1]; 0 means provably optimal for tardiness + setup.
+        None if the score is below the bound - it can't be a schedule
+        of the same jobs, so the two are not comparable.
+    """
+    score = kpi.total_tardiness * constraint.tardiness_weight + kpi.total_setup_time * constraint.setup_weight
+    bound = bounds.weighted_score(constraint)
+    if score < bound:
+        return None
+    if score <= 0:
+        return 0.0
+    return (score - bound) / score
+
+
+def report_gap(schedule: Schedule, bounds: LowerBounds, constraint: Constraint,
+               jobs: Optional[List[Job]] = None) -> Optional[float]:
+    """
+    Store the lower bounds and optimality gap on the schedule's KPIs.
+
+    Call after Schedule.calculate_kpis().
+
+    Args:
+        schedule: Schedule with calculated KPIs
+        bounds: Lower bounds for the instance
+        constraint: Provides the objective weights
+        jobs: Jobs the schedule should contain (defaults to the jobs the
+            bounds were computed for)
+
+    Returns:
+        The optimality gap, or None if the schedule misses any job or
+        scores below the bound
+    """
+    kpi = schedule.kpis
+    kpi.makespan_lower_bound = bounds.makespan
+    kpi.setup_lower_bound = bounds.setup
+    kpi.tardiness_lower_bound = bounds.tardiness
+    expected = bounds.job_ids if jobs is None else (job.job_id for job in jobs)
+    if all(job_id in schedule for job_id in expected):
+        kpi.optimality_gap = optimality_gap(kpi, bounds, constraint)
+    else:
+        kpi.optimality_gap = None
+    return kpi.optimality_gap
+
+
+def within_tolerance(kpi: KPI, bounds: LowerBounds, constraint: Constraint,
+                     tolerance: float = 0.01) -> bool:
+    """
+    Check if further optimization can gain at most `tolerance` (relative).
+
+    Args:
+        kpi: Calculated KPIs of the best schedule so far
+        bounds: Lower bounds for the instance
+        constraint: Provides the objective weights
+        tolerance: Acceptable relative gap
+
+    Returns:
+        True if the schedule is good enough to stop searching (never for
+        a score below the bound)
+    """
+    gap = optimality_gap(kpi, bounds, constraint)
+    return gap is not None and gap <= tolerance
+
+
+# Example usage
+if __name__ == "__main__":
+    from utils.baseline_scheduler import BaselineScheduler
+    from utils.data_generator import generate_random_jobs, get_demo_machines, get_demo_constraint
+
+    jobs = generate_random_jobs(30)
+    machines = get_demo_machines()
+    constraint = get_demo_constraint()
+
+    bounds = compute_lower_bounds(jobs, machines, constraint)
+    print(bounds)
+    for rule in ["fifo", "edd", "atcs"]:
+        schedule, _ = BaselineScheduler(rule).schedule(jobs, machines, constraint)
+        gap = report_gap(schedule, bounds, constraint)
+        shown = f"{gap:.1%}" if gap is not None else "n/a (jobs missing)"
+        print(f"{rule.upper():>5}: {schedule.kpis}, makespan {schedule.kpis.makespan} min, gap {shown}")
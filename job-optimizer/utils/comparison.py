@@ -0,0 +1,271 @@
+"""
+Strategy Comparison - Run every strategy at once and compare the results
+
+Planners want to see the speed/quality trade-off of all strategies side
+by side. compare_strategies() runs them concurrently on a thread pool
+(the agents spend most of their time waiting on the LLM, so threads are
+enough) and collects KPIs, optimality gap, violations and runtime of
+each one in a single StrategyComparison.
+
+Key Features:
+    - Any utils.anytime.Strategy can take part (baseline rules, agents,
+      pipelines, custom optimizers)
+    - Per-strategy runtime next to quality
+    - Failures and timeouts are reported per strategy
+    - Optional warm start: every strategy gets the mapped previous
+      schedule as its incumbent
+    - to_rows()/to_dict() for tables and JSON
+"""
+
+import time as clock
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from models.job import Job
+from models.machine import Machine, Constraint
+from models.schedule import Schedule, KPI
+from utils.anytime import (
+    Strategy, BaselineStrategy, BatchingStrategy, BottleneckStrategy, PipelineStrategy,
+    WarmStartStrategy
+)
+from utils.bounds import LowerBounds, compute_lower_bounds, report_gap
+
+
+@dataclass
+class StrategyOutcome:
+    """Result of one strategy in a comparison."""
+    strategy: str
+    schedule: Optional[Schedule] = None
+    explanation: str = ""
+    runtime_ms: float = 0.0
+    score: float = float("inf")     # KPI.get_weighted_score (lower is better)
+    violations: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.schedule is not None
+
+    @property
+    def kpis(self) -> Optional[KPI]:
+        return self.schedule.kpis if self.schedule else None
+
+
+@dataclass
+class StrategyComparison:
+    """All outcomes of one compare_strategies() call, in strategy order."""
+    outcomes: List[StrategyOutcome] = field(default_factory=list)
+    bounds: Optional[LowerBounds] = None
+    wall_ms: float = 0.0            # Total time for the whole comparison
+
+    def get(self, strategy: str) -> Optional[StrategyOutcome]:
+        """Outcome of a strategy by name."""
+        return next((o for o in self.outcomes if o.strategy == strategy), None)
+
+    def best(self) -> Optional[StrategyOutcome]:
+        """Successful outcome with the fewest violations, then lowest score."""
+        ranked = [o for o in self.outcomes if o.ok]
+        return min(ranked, key=lambda o: (o.violations, o.score)) if ranked else None
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """One flat row per strategy (e.g. for pd.DataFrame)."""
+        rows = []
+        for o in self.outcomes:
+            kpi = o.kpis
+            rows.append({
+                "strategy": o.strategy,
+                "runtime_ms": round(o.runtime_ms, 1),
+                "total_tardiness": kpi.total_tardiness if kpi else None,
+                "total_setup_time": kpi.total_setup_time if kpi else None,
+                "utilization_imbalance": round(kpi.utilization_imbalance, 1) if kpi else None,
+                # Blank for a schedule with violations: its score isn't comparable to the bound
+                "optimality_gap": round(kpi.optimality_gap, 4) if kpi and kpi.optimality_gap is not None and not o.violations else None,
+                "score": round(o.score, 1) if o.ok else None,
+                "violations": o.violations if o.ok else None,
+                "error": o.error
+            })
+        return rows
+
+    def to_dict(self, include_schedules: bool = True) -> Dict[str, Any]:
+        """JSON-friendly summary, optionally with every schedule."""
+        best = self.best()
+        result = {
+            "strategies": self.to_rows(),
+            "best": best.strategy if best else None,
+            "wall_ms": round(self.wall_ms, 1),
+            "lower_bounds": self.bounds.__dict__ if self.bounds else None
+        }
+        if include_schedules:
+            result["schedules"] = {o.strategy: o.schedule.to_dict() for o in self.outcomes if o.ok}
+        return result
+
+
+def comparison_strategies(seed: Optional[Schedule] = None) -> List[Strategy]:
+    """
+    Default line-up: FIFO and ATCS dispatch, AI batching, AI batching +
+    balancing; with a seed also the warm start alone and followed by
+    incremental relief.
+    """
+    strategies = [
+        BaselineStrategy("fifo"),
+        BaselineStrategy("atcs"),
+        BatchingStrategy(),
+        PipelineStrategy([BatchingStrategy(), BottleneckStrategy()])
+    ]
+    if seed is not None:
+        strategies += [
+            WarmStartStrategy(seed),
+            PipelineStrategy([WarmStartStrategy(seed), BottleneckStrategy(mode="incremental")])
+        ]
+    return strategies
+
+
+def build_strategy(name: str, seed: Optional[Schedule] = None) -> Strategy:
+    """
+    Build a strategy from its name.
+
+    Names: "baseline:<rule>" (any dispatch rule), "batching", "bottleneck"
+    ("bottleneck:incremental" keeps the incoming schedule and moves only
+    the jobs needed), "warm-start" (needs a seed), and pipelines joined
+    with "+" (e.g. "batching+bottleneck", "warm-start+bottleneck:incremental").
+
+    Raises:
+        ValueError: If the name or rule is unknown
+    """
+    from utils.dispatch_rules import get_dispatch_rule
+
+    stages = []
+    for part in name.split("+"):
+        kind, _, rule = part.strip().partition(":")
+        if kind == "baseline":
+            get_dispatch_rule(rule or "fifo")
+            stages.append(BaselineStrategy(rule or "fifo"))
+        elif kind == "batching" and not rule:
+            stages.append(BatchingStrategy())
+        elif kind == "bottleneck" and rule in ("", "global", "incremental"):
+            stages.append(BottleneckStrategy(mode=rule or "global"))
+        elif kind == "warm-start" and not rule:
+            if seed is None:
+                raise ValueError("Strategy 'warm-start' needs a seed schedule")
+            stages.append(WarmStartStrategy(seed))
+        else:
+            raise ValueError(f"Unknown strategy '{part}'. Use baseline:<rule>, batching, bottleneck[:incremental], warm-start or a '+' pipeline")
+    return stages[0] if len(stages) == 1 else PipelineStrategy(stages)
+
+
+def _run_one(
+    strategy: Strategy,
+    jobs: List[Job],
+    machines: List[Machine],
+    constraint: Constraint,
+    bounds: LowerBounds,
+    incumbent: Optional[Schedule] = None
+) -> StrategyOutcome:
+    started = clock.perf_counter()
+    try:
+        result = strategy.run(jobs, machines, constraint, incumbent, lambda: False)
+        if result is None:
+            raise RuntimeError("produced no schedule")
+        schedule, explanation = result
+        schedule.calculate_kpis(machines, constraint)
+        _, violations = schedule.validate(machines, constraint, jobs=jobs)
+        report_gap(schedule, bounds, constraint, jobs)
+        if violations:
+            schedule.kpis.optimality_gap = None
+    except Exception as e:
+        return StrategyOutcome(strategy=strategy.name, runtime_ms=(clock.perf_counter() - started) * 1000,
+                               error=str(e) or type(e).__name__)
+    return StrategyOutcome(
+        strategy=strategy.name,
+        schedule=schedule,
+        explanation=explanation,
+        runtime_ms=(clock.perf_counter() - started) * 1000,
+        score=schedule.kpis.get_weighted_score(constraint),
+        violations=len(violations)
+    )
+
+
+def compare_strategies(
+    jobs: List[Job],
+    machines: List[Machine],
+    constraint: Constraint,
+    strategies: Optional[List[Strategy]] = None,
+    max_workers: Optional[int] = None,
+    timeout_s: Optional[float] = None,
+    on_result: Optional[Callable[[StrategyOutcome], None]] = None,
+    seed: Optional[Schedule] = None
+) -> StrategyComparison:
+    """
+    Run strategies concurrently and compare their schedules.
+
+    Args:
+        jobs: Jobs to schedule
+        machines: Available machines
+        constraint: Scheduling constraints
+        strategies: Strategies to compare (defaults to comparison_strategies(seed))
+        max_workers: Threads (default: one per strategy)
+        timeout_s: Strategies still running after this are reported as
+            timed out (their threads are left to finish in the background)
+        on_result: Called with each StrategyOutcome as soon as it finishes
+        seed: Previous schedule; mapped once (see utils.warm_start) and
+            handed to every strategy as its incumbent
+
+    Returns:
+        StrategyComparison with one outcome per strategy, in input order
+    """
+    started = clock.perf_counter()
+    strategies = strategies if strategies is not None else comparison_strategies(seed)
+    bounds = compute_lower_bounds(jobs, machines, constraint)
+    incumbent = None
+    if seed is not None:
+        incumbent, _ = WarmStartStrategy(seed).run(jobs, machines, constraint, None, lambda: False)
+    outcomes: Dict[int, StrategyOutcome] = {}
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or max(len(strategies), 1),
+                                  thread_name_prefix="compare")
+    try:
+        futures = {
+            executor.submit(_run_one, strategy, jobs, machines, constraint, bounds,
+                            incumbent.copy() if incumbent is not None else None): i
+            for i, strategy in enumerate(strategies)
+        }
+        pending = set(futures)
+        deadline = started + timeout_s if timeout_s is not None else None
+        while pending:
+            remaining = None if deadline is None else max(deadline - clock.perf_counter(), 0)
+            done, pending = wait(pending, timeout=remaining, return_when="FIRST_COMPLETED")
+            if not done:
+                break  # Timed out
+            for future in done:
+                outcomes[futures[future]] = future.result()
+                if on_result:
+                    on_result(outcomes[futures[future]])
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for i, strategy in enumerate(strategies):
+        if i not in outcomes:
+            outcomes[i] = StrategyOutcome(strategy=strategy.name, runtime_ms=timeout_s * 1000,
+                                          error=f"timed out after {timeout_s:.0f}s")
+
+    return StrategyComparison(
+        outcomes=[outcomes[i] for i in range(len(strategies))],
+        bounds=bounds,
+        wall_ms=(clock.perf_counter() - started) * 1000
+    )
+
+
+# Example usage
+if __name__ == "__main__":
+    from utils.data_generator import generate_random_jobs, get_demo_machines, get_demo_constraint
+
+    comparison = compare_strategies(
+        generate_random_jobs(40),
+        get_demo_machines(),
+        get_demo_constraint(),
+        strategies=[BaselineStrategy(rule) for rule in ["fifo", "edd", "wspt", "atc", "atcs"]]
+    )
+    for row in comparison.to_rows():
+        print(row)
+    print(f"Best: {comparison.best().strategy} ({comparison.wall_ms:.0f} ms total)")
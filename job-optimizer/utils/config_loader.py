@@ -9,14 +9,32 @@ Key Features:
     - Parse machine constraints and setup time matrices
     - Merge user overrides with defaults
     - Validate configuration schemas
+    - Cache parsed files by path and mtime as compiled, read-only PlantModels
 """
 
+import os
+import pickle
+import threading
 import yaml
 import json
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional
-from datetime import time
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+from datetime import date, time
+
+import numpy as np
+
+from models.job import Job
 from models.machine import Constraint, Machine, DowntimeWindow
+from models.operator import Operator
+from models.horizon import PlanningHorizon, ShiftWindow
+
+
+# libyaml's C loader is an order of magnitude faster than the pure-Python one
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'default_policy.yaml'
 
 
 def load_yaml(file_path: str) -> Dict[str, Any]:
@@ -30,7 +48,7 @@ def load_yaml(file_path: str) -> Dict[str, Any]:
         Dictionary with configuration data
     """
     with open(file_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YAML_LOADER)
 
 
 def load_json(file_path: str) -> Dict[str, Any]:
@@ -76,6 +94,7 @@ def load_constraint_from_config(config: Dict[str, Any]) -> Constraint:
     shift_start = parse_time(shift_config.get('start', '08:00'))
     shift_end = parse_time(shift_config.get('end', '16:00'))
     max_overtime = shift_config.get('max_overtime_minutes', 0)
+    rest_break = shift_config.get('rest_break_minutes', 15)
     
     # Parse setup times
     setup_times = config.get('setup_times', {})
@@ -90,6 +109,17 @@ def load_constraint_from_config(config: Dict[str, Any]) -> Constraint:
     tardiness_weight = objective_config.get('tardiness', 1.0)
     setup_weight = objective_config.get('setup', 0.5)
     utilization_weight = objective_config.get('utilization', 0.3)
+    stability_weight = objective_config.get('stability', 0.0)
+    
+    # Parse operator pool
+    operators = [
+        Operator(
+            operator_id=operator_config['operator_id'],
+            skills=list(operator_config.get('skills', [])),
+            name=operator_config.get('name', '')
+        )
+        for operator_config in config.get('operators', [])
+    ]
     
     return Constraint(
         shift_start=shift_start,
@@ -100,7 +130,10 @@ def load_constraint_from_config(config: Dict[str, Any]) -> Constraint:
         normal_job_weight=normal_weight,
         tardiness_weight=tardiness_weight,
         setup_weight=setup_weight,
-        utilization_weight=utilization_weight
+        utilization_weight=utilization_weight,
+        stability_weight=stability_weight,
+        rest_break_minutes=rest_break,
+        operators=operators
     )
 
 
@@ -122,19 +155,20 @@ def load_machines_from_config(config: Dict[str, Any]) -> list[Machine]:
         capabilities = machine_config.get('capabilities', [])
         capacity = machine_config.get('capacity_per_hour', 60)
         
-        # Parse downtime windows
+        # Parse downtime windows (cross-midnight windows are split in two)
         downtime_windows = []
         for dt_config in machine_config.get('downtime_windows', []):
             start = parse_time(dt_config['start_time'])
             end = parse_time(dt_config['end_time'])
             reason = dt_config.get('reason', 'Maintenance')
-            downtime_windows.append(DowntimeWindow(start, end, reason))
+            downtime_windows.extend(DowntimeWindow(start, end, reason).split_at_midnight())
         
         machine = Machine(
             machine_id=machine_id,
             capabilities=capabilities,
             capacity_per_hour=capacity,
             downtime_windows=downtime_windows,
+            max_continuous_runtime=machine_config.get('max_continuous_runtime'),
             operator_id=machine_config.get('operator_id')
         )
         machines.append(machine)
@@ -142,38 +176,366 @@ def load_machines_from_config(config: Dict[str, Any]) -> list[Machine]:
     return machines
 
 
-def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
+def load_horizon_from_config(config: Dict[str, Any], start_date: Optional[date] = None) -> PlanningHorizon:
     """
-    Load complete configuration from file.
+    Create a multi-day PlanningHorizon from configuration dictionary.
     
-    If no path provided, loads default_policy.yaml from config directory.
+    Expected format (all keys optional):
+    
+        horizon:
+          start_date: "2024-03-04"
+          num_days: 7
+          non_working_weekdays: [6]
+          shifts:
+            - {name: Early, start: "06:00", end: "14:00"}
+          downtime:
+            - {date: "2024-03-05", machine_id: M1, start_time: "06:00",
+               end_time: "10:00", reason: Calibration}
+    
+    Without a `shifts` list, the single shift from the `shift` section
+    (including overtime) is repeated every day.
     
     Args:
-        config_path: Optional path to config file
+        config: Configuration dictionary
+        start_date: Overrides horizon.start_date (defaults to today)
         
     Returns:
-        Dictionary containing constraint and machines
+        PlanningHorizon object
     """
-    if config_path is None:
-        # Use default config
-        config_dir = Path(__file__).parent.parent / 'config'
-        config_path = config_dir / 'default_policy.yaml'
+    horizon_config = config.get('horizon', {})
     
-    # Load config file
-    if str(config_path).endswith('.json'):
-        config_data = load_json(str(config_path))
+    if start_date is None:
+        configured = horizon_config.get('start_date')
+        start_date = date.fromisoformat(str(configured)) if configured else date.today()
+    num_days = horizon_config.get('num_days', 1)
+    
+    shift_configs = horizon_config.get('shifts')
+    if shift_configs:
+        horizon = PlanningHorizon(
+            start_date=start_date,
+            num_days=num_days,
+            shifts=[
+                ShiftWindow(
+                    parse_time(shift['start']),
+                    parse_time(shift['end']),
+                    shift.get('name', 'Day')
+                )
+                for shift in shift_configs
+            ]
+        )
     else:
-        config_data = load_yaml(str(config_path))
+        horizon = PlanningHorizon.from_constraint(
+            load_constraint_from_config(config), start_date, num_days
+        )
+    
+    horizon.non_working_weekdays = list(horizon_config.get('non_working_weekdays', []))
+    
+    for dt_config in horizon_config.get('downtime', []):
+        horizon.add_downtime(
+            date.fromisoformat(str(dt_config['date'])),
+            dt_config['machine_id'],
+            parse_time(dt_config['start_time']),
+            parse_time(dt_config['end_time']),
+            dt_config.get('reason', 'Maintenance')
+        )
+    
+    return horizon
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Mutable copy of a _freeze()d value (mappings -> dicts, tuples -> lists)."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class PlantModel:
+    """
+    Compiled, validated and read-only view of a plant configuration.
+    
+    Built once per config file version by load_plant_model() and shared
+    between callers, so it holds only immutable data: the raw config is
+    deep-frozen, and the parsed Machine, Constraint and PlanningHorizon
+    objects are kept as pickled blueprints. fresh_machines(),
+    fresh_constraint() and fresh_horizon() build new objects from them
+    that callers may modify (e.g. with Machine.add_downtime).
+    """
+    
+    machine_ids: Tuple[str, ...]
+    
+    # Product type -> row/column in setup_matrix
+    product_index: Mapping[str, int]
+    
+    # setup_matrix[i, j] = setup minutes from product i to product j (read-only)
+    setup_matrix: np.ndarray
+    
+    # Product type -> IDs of machines that can produce it
+    compatibility: Mapping[str, Tuple[str, ...]]
+    
+    # Machine ID -> sorted (start, end) downtime in minutes since midnight
+    downtime_calendars: Mapping[str, Tuple[Tuple[int, int], ...]]
+    
+    # Deep-frozen configuration dictionary (see load_config for a mutable copy)
+    raw_config: Mapping[str, Any]
+    
+    # pickle of (constraint, machines, horizon or None)
+    blueprint: bytes
+    
+    # Configured horizon.start_date (None = the horizon starts today)
+    horizon_start: Optional[date] = None
+    source: Optional[str] = None
+    
+    def get_machine(self, machine_id: str) -> Optional[Machine]:
+        """Fresh copy of a machine by ID, or None if unknown."""
+        if machine_id not in self.machine_ids:
+            return None
+        return self.fresh_machines()[self.machine_ids.index(machine_id)]
+    
+    def get_setup_time(self, from_product: str, to_product: str) -> int:
+        """
+        Setup minutes between two products via the precompiled matrix.
+        
+        Falls back to Constraint.get_setup_time for unknown products.
+        """
+        i = self.product_index.get(from_product)
+        j = self.product_index.get(to_product)
+        if i is None or j is None:
+            return self.fresh_constraint().get_setup_time(from_product, to_product)
+        return int(self.setup_matrix[i, j])
+    
+    def compatible_machines(self, job: Job) -> List[str]:
+        """IDs of machines that can produce the job and are in its options."""
+        return [m for m in self.compatibility.get(job.product_type, ()) if job.can_run_on(m)]
+    
+    def fresh_machines(self) -> List[Machine]:
+        """New, mutable Machine objects."""
+        return pickle.loads(self.blueprint)[1]
+    
+    def fresh_constraint(self) -> Constraint:
+        """New, mutable Constraint object."""
+        return pickle.loads(self.blueprint)[0]
+    
+    def fresh_horizon(self, start_date: Optional[date] = None) -> Optional[PlanningHorizon]:
+        """
+        New, mutable PlanningHorizon from the config's horizon section.
+        
+        Args:
+            start_date: Overrides the configured start date (defaults to
+                horizon.start_date, or today if the config has none)
+            
+        Returns:
+            PlanningHorizon, or None if the config has no horizon section
+        """
+        horizon = pickle.loads(self.blueprint)[2]
+        if horizon is not None:
+            horizon.start_date = start_date or self.horizon_start or date.today()
+        return horizon
+
+
+def validate_plant(constraint: Constraint, machines: List[Machine]) -> List[str]:
+    """
+    Validate parsed configuration objects.
+    
+    Args:
+        constraint: Parsed constraint
+        machines: Parsed machines
+        
+    Returns:
+        List of problems (empty if valid)
+    """
+    problems = []
+    
+    if constraint.get_shift_duration_minutes() <= 0:
+        problems.append(f"shift end {constraint.shift_end} is not after start {constraint.shift_start}")
+    if constraint.max_overtime_minutes < 0:
+        problems.append("max_overtime_minutes must not be negative")
+    if constraint.rest_break_minutes < 0:
+        problems.append("rest_break_minutes must not be negative")
     
-    # Parse into objects
+    operator_ids = [op.operator_id for op in constraint.operators]
+    for operator_id in set(operator_ids):
+        if operator_ids.count(operator_id) > 1:
+            problems.append(f"duplicate operator_id '{operator_id}'")
+    
+    for key, minutes in constraint.setup_times.items():
+        parts = str(key).split('->')
+        if len(parts) != 2 or not all(p.strip() for p in parts):
+            problems.append(f"setup time key '{key}' must look like 'FROM->TO'")
+        if not isinstance(minutes, int) or minutes < 0:
+            problems.append(f"setup time '{key}' must be a non-negative integer")
+    
+    seen = set()
+    for machine in machines:
+        if machine.machine_id in seen:
+            problems.append(f"duplicate machine_id '{machine.machine_id}'")
+        seen.add(machine.machine_id)
+        if machine.capacity_per_hour <= 0:
+            problems.append(f"{machine.machine_id}: capacity_per_hour must be positive")
+        if machine.max_continuous_runtime is not None and machine.max_continuous_runtime <= 0:
+            problems.append(f"{machine.machine_id}: max_continuous_runtime must be positive")
+        for window in machine.downtime_windows:
+            if window.end_time == window.start_time:
+                problems.append(f"{machine.machine_id}: downtime {window} is empty")
+            elif window.crosses_midnight:
+                # Configs are split on load; machines built in code must be too
+                problems.append(f"{machine.machine_id}: downtime {window} crosses midnight "
+                                f"(split it with DowntimeWindow.split_at_midnight())")
+    
+    return problems
+
+
+def compile_plant_model(config_data: Dict[str, Any], source: Optional[str] = None) -> PlantModel:
+    """
+    Parse, validate and precompile a configuration dictionary.
+    
+    Args:
+        config_data: Configuration dictionary
+        source: Where the configuration came from (for error messages)
+        
+    Returns:
+        PlantModel
+        
+    Raises:
+        ValueError: If the configuration is invalid
+    """
     constraint = load_constraint_from_config(config_data)
     machines = load_machines_from_config(config_data)
     
-    return {
-        'constraint': constraint,
-        'machines': machines,
-        'raw_config': config_data
+    problems = validate_plant(constraint, machines)
+    if problems:
+        raise ValueError(f"Invalid configuration {source or ''}: " + "; ".join(problems))
+    
+    # One-off downtime is keyed by absolute date, so only start_date varies
+    horizon = load_horizon_from_config(config_data) if 'horizon' in config_data else None
+    configured_start = (config_data.get('horizon') or {}).get('start_date')
+    
+    # Product universe: everything a machine can make or a setup rule mentions
+    products = []
+    for machine in machines:
+        products.extend(machine.capabilities)
+    for key in constraint.setup_times:
+        products.extend(p.strip() for p in key.split('->'))
+    products = list(dict.fromkeys(products))
+    product_index = {p: i for i, p in enumerate(products)}
+    
+    setup_matrix = np.array(
+        [[constraint.get_setup_time(a, b) for b in products] for a in products],
+        dtype=np.int32
+    ).reshape(len(products), len(products))
+    setup_matrix.setflags(write=False)
+    
+    compatibility = {
+        product: tuple(m.machine_id for m in machines if m.can_produce(product))
+        for product in products
+    }
+    
+    downtime_calendars = {
+        machine.machine_id: tuple(sorted(
+            (dt.start_time.hour * 60 + dt.start_time.minute,
+             dt.end_time.hour * 60 + dt.end_time.minute)
+            for dt in machine.downtime_windows
+        ))
+        for machine in machines
+    }
+    
+    return PlantModel(
+        machine_ids=tuple(m.machine_id for m in machines),
+        product_index=MappingProxyType(product_index),
+        setup_matrix=setup_matrix,
+        compatibility=MappingProxyType(compatibility),
+        downtime_calendars=MappingProxyType(downtime_calendars),
+        raw_config=_freeze(config_data),
+        blueprint=pickle.dumps((constraint, machines, horizon)),
+        horizon_start=date.fromisoformat(str(configured_start)) if configured_start else None,
+        source=source
+    )
+
+
+# Resolved path -> ((mtime_ns, size), PlantModel)
+_plant_cache: Dict[str, Tuple[Tuple[int, int], PlantModel]] = {}
+_plant_cache_lock = threading.Lock()
+
+
+def load_plant_model(config_path: Optional[str] = None) -> PlantModel:
+    """
+    Load a compiled PlantModel, re-parsing the file only when it changed.
+    
+    The cache is keyed by resolved path and invalidated by the file's
+    modification time and size.
+    
+    Args:
+        config_path: Optional path to config file (defaults to
+            config/default_policy.yaml)
+        
+    Returns:
+        Shared, read-only PlantModel
+    """
+    path = Path(config_path) if config_path is not None else DEFAULT_CONFIG_PATH
+    key = str(path.resolve())
+    stat = os.stat(key)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    
+    with _plant_cache_lock:
+        cached = _plant_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+    
+    if key.endswith('.json'):
+        config_data = load_json(key)
+    else:
+        config_data = load_yaml(key)
+    model = compile_plant_model(config_data or {}, source=key)
+    
+    with _plant_cache_lock:
+        _plant_cache[key] = (signature, model)
+    return model
+
+
+def clear_config_cache():
+    """Drop all cached PlantModels."""
+    with _plant_cache_lock:
+        _plant_cache.clear()
+
+
+def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load complete configuration from file.
+    
+    If no path provided, loads default_policy.yaml from config directory.
+    Parsing is cached (see load_plant_model); the returned objects are
+    fresh copies, so callers may modify them freely.
+    
+    Args:
+        config_path: Optional path to config file
+        
+    Returns:
+        Dictionary containing constraint and machines (plus `horizon` when
+        the file has a horizon section)
+    """
+    model = load_plant_model(config_path)
+    
+    result = {
+        'constraint': model.fresh_constraint(),
+        'machines': model.fresh_machines(),
+        'raw_config': _thaw(model.raw_config)
     }
+    horizon = model.fresh_horizon()
+    if horizon is not None:
+        result['horizon'] = horizon
+    
+    return result
 
 
 def save_config(constraint: Constraint, machines: list[Machine], output_path: str):
@@ -189,7 +551,8 @@ def save_config(constraint: Constraint, machines: list[Machine], output_path: st
         'shift': {
             'start': constraint.shift_start.strftime('%H:%M'),
             'end': constraint.shift_end.strftime('%H:%M'),
-            'max_overtime_minutes': constraint.max_overtime_minutes
+            'max_overtime_minutes': constraint.max_overtime_minutes,
+            'rest_break_minutes': constraint.rest_break_minutes
         },
         'setup_times': constraint.setup_times,
         'priority_weights': {
@@ -199,9 +562,11 @@ def save_config(constraint: Constraint, machines: list[Machine], output_path: st
         'objective_weights': {
             'tardiness': constraint.tardiness_weight,
             'setup': constraint.setup_weight,
-            'utilization': constraint.utilization_weight
+            'utilization': constraint.utilization_weight,
+            'stability': constraint.stability_weight
         },
-        'machines': [machine.to_dict() for machine in machines]
+        'machines': [machine.to_dict() for machine in machines],
+        'operators': [operator.to_dict() for operator in constraint.operators]
     }
     
     with open(output_path, 'w') as f:
@@ -219,3 +584,9 @@ if __name__ == "__main__":
     print(f"\nSetup Times:")
     for key, value in config['constraint'].setup_times.items():
         print(f"  {key}: {value} minutes")
+    
+    # Second load is served from the cache
+    model = load_plant_model()
+    print(f"\nCached plant model: {len(model.machine_ids)} machines, "
+          f"products {list(model.product_index)}")
+    print(f"Compatibility: {dict(model.compatibility)}")
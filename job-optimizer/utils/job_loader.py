@@ -0,0 +1,411 @@
+"""
+Job Loader - Streaming bulk ingestion of job feeds from CSV or JSONL
+
+ERP order exports can have 100k+ rows. Building each Job with
+Job.from_dict() parses and validates one row at a time; this module reads
+the feed in chunks instead, validates each column of a chunk in bulk with
+NumPy and only then builds jobs.
+
+Key Features:
+    - CSV (header row) and JSONL input, from a path or an open file
+    - Chunked reading: memory stays bounded by chunk_size
+    - Vectorized column validation; bad rows are reported, not fatal
+    - Columnar JobStore or lazy Job iteration
+
+Expected columns (same names as Job.to_dict()):
+    job_id, product_type, processing_time, due_time (HH:MM), machine_options
+    optional: priority, setup_requirements, operator_skill_required,
+              batch_size, due_date (YYYY-MM-DD)
+
+In CSV files machine_options are separated by "|" or ";".
+"""
+
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from datetime import date, time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from models.job import Job
+
+
+REQUIRED_COLUMNS = ("job_id", "product_type", "processing_time", "due_time", "machine_options")
+OPTIONAL_COLUMNS = ("priority", "setup_requirements", "operator_skill_required", "batch_size", "due_date")
+
+Source = Union[str, Path, IO]
+
+
+@dataclass
+class RowError:
+    """A row that failed validation."""
+    row: int                       # 1-based data row number (header excluded)
+    job_id: Optional[str]
+    message: str
+
+    def __str__(self) -> str:
+        return f"Row {self.row} ({self.job_id or '?'}): {self.message}"
+
+
+@dataclass
+class JobStore:
+    """
+    Columnar store of validated jobs.
+
+    Columns are plain lists (one entry per job) so chunks can be appended
+    cheaply; numeric columns are exposed as NumPy arrays via arrays().
+    """
+
+    job_id: List[str] = field(default_factory=list)
+    product_type: List[str] = field(default_factory=list)
+    processing_time: List[int] = field(default_factory=list)
+    due_minute: List[int] = field(default_factory=list)
+    priority: List[str] = field(default_factory=list)
+    machine_options: List[List[str]] = field(default_factory=list)
+    setup_requirements: List[Optional[str]] = field(default_factory=list)
+    operator_skill_required: List[Optional[str]] = field(default_factory=list)
+    batch_size: List[int] = field(default_factory=list)
+    due_date: List[Optional[date]] = field(default_factory=list)
+
+    # Rows rejected during loading
+    errors: List[RowError] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.job_id)
+
+    def extend(self, chunk: Dict[str, List[Any]]):
+        """
+        Append a validated chunk.
+
+        Args:
+            chunk: Column name -> values, as yielded by iter_job_chunks()
+        """
+        for name, values in chunk.items():
+            getattr(self, name).extend(values)
+
+    def job(self, index: int) -> Job:
+        """Build the Job stored at `index`."""
+        due_minute = self.due_minute[index]
+        return Job.from_validated(
+            job_id=self.job_id[index],
+            product_type=self.product_type[index],
+            processing_time=self.processing_time[index],
+            due_time=time(due_minute // 60, due_minute % 60),
+            priority=self.priority[index],
+            machine_options=list(self.machine_options[index]),
+            setup_requirements=self.setup_requirements[index],
+            operator_skill_required=self.operator_skill_required[index],
+            batch_size=self.batch_size[index],
+            due_date=self.due_date[index]
+        )
+
+    def iter_jobs(self) -> Iterator[Job]:
+        """Lazily build Job objects in load order."""
+        for index in range(len(self)):
+            yield self.job(index)
+
+    def to_jobs(self) -> List[Job]:
+        """Build every Job."""
+        return list(self.iter_jobs())
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Numeric columns as NumPy arrays for vectorized processing."""
+        return {
+            "processing_time": np.array(self.processing_time, dtype=np.int32),
+            "due_minute": np.array(self.due_minute, dtype=np.int32),
+            "batch_size": np.array(self.batch_size, dtype=np.int32),
+            "is_rush": np.array([p == "rush" for p in self.priority], dtype=np.bool_),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Reading raw rows
+# ---------------------------------------------------------------------------
+
+def _open_text(source: Source) -> Tuple[IO, bool]:
+    """Open a path or wrap a binary stream as text. Returns (handle, should_close)."""
+    if isinstance(source, (str, Path)):
+        return open(source, "r", newline="", encoding="utf-8-sig"), True
+    if isinstance(source, io.TextIOBase):
+        return source, False
+    return io.TextIOWrapper(source, encoding="utf-8-sig", newline=""), False
+
+
+def _detect_format(source: Source, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt.lower()
+    name = str(source) if isinstance(source, (str, Path)) else getattr(source, "name", "")
+    return "jsonl" if str(name).lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def _iter_raw_rows(handle: IO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Yield raw rows as dicts of column -> value."""
+    if fmt == "csv":
+        reader = csv.DictReader(handle)
+        missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Job feed is missing required column(s): {', '.join(missing)}")
+        yield from reader
+        return
+
+    for line in handle:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            row = {"__error__": f"invalid JSON: {e.msg}"}
+        yield row if isinstance(row, dict) else {"__error__": "row is not a JSON object"}
+
+
+# ---------------------------------------------------------------------------
+# Bulk column validation
+# ---------------------------------------------------------------------------
+
+def _text_column(rows: List[Dict[str, Any]], name: str) -> np.ndarray:
+    """Extract a column as a stripped unicode array ('' for missing)."""
+    values = [row.get(name) for row in rows]
+    return np.char.strip(np.array(["" if v is None else str(v) for v in values], dtype=np.str_))
+
+
+def _int_column(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse a unicode column as integers.
+
+    Returns:
+        Tuple of (int64 values, bad-row mask)
+    """
+    try:
+        return values.astype(np.int64), np.zeros(len(values), dtype=np.bool_)
+    except ValueError:
+        pass
+
+    # Slow path only for chunks that contain a bad value
+    parsed = np.zeros(len(values), dtype=np.int64)
+    bad = np.zeros(len(values), dtype=np.bool_)
+    for i, value in enumerate(values):
+        try:
+            parsed[i] = int(value)
+        except ValueError:
+            try:
+                as_float = float(value)
+                parsed[i] = int(as_float)
+                bad[i] = as_float != parsed[i]
+            except (ValueError, OverflowError):
+                bad[i] = True
+    return parsed, bad
+
+
+def _validate_chunk(rows: List[Dict[str, Any]], first_row: int, seen_ids: set
+                    ) -> Tuple[Dict[str, List[Any]], List[RowError]]:
+    """
+    Validate one chunk of raw rows column by column.
+
+    Args:
+        rows: Raw row dicts
+        first_row: Row number of rows[0]
+        seen_ids: Job IDs accepted so far (updated in place)
+
+    Returns:
+        Tuple of (valid columns, errors)
+    """
+    n = len(rows)
+    problems: List[List[str]] = [[] for _ in range(n)]
+
+    def flag(mask: np.ndarray, message: str):
+        for i in np.flatnonzero(mask):
+            problems[i].append(message)
+
+    job_id = _text_column(rows, "job_id")
+    flag(job_id == "", "missing job_id")
+
+    product_type = _text_column(rows, "product_type")
+    flag(product_type == "", "missing product_type")
+
+    processing_time, bad = _int_column(_text_column(rows, "processing_time"))
+    flag(bad, "processing_time is not an integer")
+    flag(~bad & (processing_time <= 0), "processing_time must be positive")
+
+    batch_text = _text_column(rows, "batch_size")
+    batch_size, bad = _int_column(np.where(batch_text == "", "1", batch_text))
+    flag(bad | (batch_size <= 0), "batch_size must be a positive integer")
+
+    # due_time: HH:MM
+    due_parts = np.char.partition(_text_column(rows, "due_time"), ":")
+    hours, bad_h = _int_column(due_parts[:, 0])
+    minutes, bad_m = _int_column(due_parts[:, 2])
+    bad_due = (due_parts[:, 1] != ":") | bad_h | bad_m
+    bad_due |= (hours < 0) | (hours > 23) | (minutes < 0) | (minutes > 59)
+    flag(bad_due, "due_time must be HH:MM")
+    due_minute = hours * 60 + minutes
+
+    priority = _text_column(rows, "priority")
+    priority = np.where(priority == "", "normal", np.char.lower(priority))
+    flag(~np.isin(priority, ["rush", "normal"]), "priority must be 'rush' or 'normal'")
+
+    # due_date: parse each distinct value once
+    due_date_text = _text_column(rows, "due_date")
+    unique_dates, inverse = np.unique(due_date_text, return_inverse=True)
+    parsed_dates: List[Optional[date]] = []
+    bad_dates = []
+    for text in unique_dates:
+        try:
+            parsed_dates.append(date.fromisoformat(str(text)) if text else None)
+            bad_dates.append(False)
+        except ValueError:
+            parsed_dates.append(None)
+            bad_dates.append(True)
+    flag(np.array(bad_dates, dtype=np.bool_)[inverse], "due_date must be YYYY-MM-DD")
+
+    # machine_options: JSON list in JSONL, "|" or ";" separated in CSV
+    machine_options = []
+    for i, row in enumerate(rows):
+        value = row.get("machine_options")
+        if isinstance(value, list):
+            options = [str(v).strip() for v in value if str(v).strip()]
+        else:
+            options = [v.strip() for v in str(value or "").replace(";", "|").split("|") if v.strip()]
+        if not options:
+            problems[i].append("at least one machine option is required")
+        machine_options.append(options)
+
+    setup_requirements = _text_column(rows, "setup_requirements")
+    skill = _text_column(rows, "operator_skill_required")
+
+    valid = {name: [] for name in (
+        "job_id", "product_type", "processing_time", "due_minute", "priority",
+        "machine_options", "setup_requirements", "operator_skill_required",
+        "batch_size", "due_date"
+    )}
+    errors = []
+
+    for i in range(n):
+        if "__error__" in rows[i]:
+            # Unparseable line: the column checks above are just noise
+            problems[i] = [rows[i]["__error__"]]
+        jid = str(job_id[i])
+        if not problems[i] and jid in seen_ids:
+            problems[i].append("duplicate job_id")
+        if problems[i]:
+            errors.append(RowError(first_row + i, jid or None, "; ".join(problems[i])))
+            continue
+
+        seen_ids.add(jid)
+        valid["job_id"].append(jid)
+        valid["product_type"].append(str(product_type[i]))
+        valid["processing_time"].append(int(processing_time[i]))
+        valid["due_minute"].append(int(due_minute[i]))
+        valid["priority"].append(str(priority[i]))
+        valid["machine_options"].append(machine_options[i])
+        valid["setup_requirements"].append(str(setup_requirements[i]) or None)
+        valid["operator_skill_required"].append(str(skill[i]) or None)
+        valid["batch_size"].append(int(batch_size[i]))
+        valid["due_date"].append(parsed_dates[inverse[i]])
+
+    return valid, errors
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def iter_job_chunks(
+    source: Source,
+    fmt: Optional[str] = None,
+    chunk_size: int = 10_000
+) -> Iterator[Tuple[Dict[str, List[Any]], List[RowError]]]:
+    """
+    Stream a job feed as validated column chunks.
+
+    Args:
+        source: File path or open file (text or binary)
+        fmt: "csv" or "jsonl" (inferred from the file name if omitted)
+        chunk_size: Rows per chunk
+
+    Yields:
+        Tuple of (valid columns, row errors) per chunk
+    """
+    fmt = _detect_format(source, fmt)
+    handle, should_close = _open_text(source)
+    try:
+        rows = _iter_raw_rows(handle, fmt)
+        seen_ids: set = set()
+        row_number = 1
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            yield _validate_chunk(chunk, row_number, seen_ids)
+            row_number += len(chunk)
+    finally:
+        if should_close:
+            handle.close()
+
+
+def load_job_store(source: Source, fmt: Optional[str] = None, chunk_size: int = 10_000) -> JobStore:
+    """
+    Load a whole job feed into a columnar JobStore.
+
+    Bad rows are collected in store.errors instead of aborting the load.
+
+    Args:
+        source: File path or open file (text or binary)
+        fmt: "csv" or "jsonl" (inferred from the file name if omitted)
+        chunk_size: Rows per validation chunk
+
+    Returns:
+        JobStore with all valid rows
+    """
+    store = JobStore()
+    for columns, errors in iter_job_chunks(source, fmt, chunk_size):
+        store.extend(columns)
+        store.errors.extend(errors)
+    return store
+
+
+def iter_jobs(
+    source: Source,
+    fmt: Optional[str] = None,
+    chunk_size: int = 10_000,
+    errors: Optional[List[RowError]] = None
+) -> Iterator[Job]:
+    """
+    Lazily yield Jobs from a feed, one validated chunk at a time.
+
+    Args:
+        source: File path or open file (text or binary)
+        fmt: "csv" or "jsonl" (inferred from the file name if omitted)
+        chunk_size: Rows per validation chunk
+        errors: Optional list that receives RowErrors as they are found
+
+    Yields:
+        Job objects
+    """
+    for columns, chunk_errors in iter_job_chunks(source, fmt, chunk_size):
+        if errors is not None:
+            errors.extend(chunk_errors)
+        chunk_store = JobStore()
+        chunk_store.extend(columns)
+        yield from chunk_store.iter_jobs()
+
+
+# Example usage
+if __name__ == "__main__":
+    feed = io.StringIO(
+        "job_id,product_type,processing_time,due_time,priority,machine_options\n"
+        "J001,P_A,45,12:00,rush,M1|M2\n"
+        "J002,P_B,abc,13:00,normal,M1\n"
+        "J003,P_B,60,25:00,normal,M1;M3\n"
+        "J004,P_C,30,14:30,,M2\n"
+    )
+    store = load_job_store(feed, fmt="csv")
+    print(f"Loaded {len(store)} job(s), rejected {len(store.errors)}")
+    for error in store.errors:
+        print(f"  - {error}")
+    for job in store.iter_jobs():
+        print(job)
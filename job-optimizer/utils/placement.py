@@ -0,0 +1,390 @@
+"""
+Placement Engine - Gap-filling job insertion on machine timelines
+
+The original schedulers only append to the end of each machine's
+timeline, so when a job doesn't fit before a downtime window the idle gap
+is wasted forever. MachineTimeline keeps each machine's occupied blocks
+(setup + processing, and downtime) sorted by start time; the free
+intervals are the gaps between them. A job is inserted into the earliest
+gap that fits its setup plus processing time, found with bisect.
+
+Setup is recomputed against both neighbours: the inserted job's setup
+depends on the job before the gap, and the job after the gap gets a new
+setup because its predecessor changed. A gap is only used if that new
+successor setup still fits.
+
+Machines with max_continuous_runtime get rest breaks: jobs separated by
+less than Constraint.rest_break_minutes count as one continuous run, and
+a job that would stretch a run past the limit is pushed back until after
+a full break. When an OperatorPool is given, the job also waits for a
+qualified operator to be free (see utils.resources).
+
+Key Features:
+    - Sorted occupied blocks per machine, bisect to the first useful gap
+    - Earliest-fit insertion into idle windows before downtime
+    - Successor setup re-computation on insert
+    - Mandatory rest breaks after max_continuous_runtime
+    - Operator booking with skill matching
+    - Job removal (for moving jobs between machines)
+    - Incremental machine load tracking
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+from models.job import Job
+from models.machine import Machine, Constraint
+from models.schedule import JobAssignment
+from utils.resources import OperatorPool
+from utils.time_utils import to_minutes, from_minutes
+
+
+# Latest minute an assignment may end on a single-day timeline (23:59)
+DAY_END = 24 * 60 - 1
+
+
+@dataclass
+class Slot:
+    """A feasible insertion point found by MachineTimeline.find_slot()."""
+    position: int                 # Block index the job will be inserted at
+    block_start: int              # Minute the setup begins
+    setup_time: int               # Setup minutes before the job
+    end: int                      # Minute processing ends
+    successor: Optional[int]      # Block index of the job after it (if any)
+    successor_setup: int = 0      # That job's new setup time
+    operator_id: Optional[str] = None  # Operator booked for processing
+
+
+class MachineTimeline:
+    """
+    Occupied blocks of one machine, kept sorted by start minute.
+
+    Each block is either a JobAssignment (occupying its setup and processing
+    time) or a downtime window (item None).
+    """
+
+    def __init__(
+        self,
+        machine: Machine,
+        constraint: Constraint,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        operators: Optional[OperatorPool] = None
+    ):
+        """
+        Create an empty timeline with the machine's downtime pre-blocked.
+
+        Args:
+            machine: Machine this timeline belongs to
+            constraint: Scheduling constraints (setup times, shift start)
+            start: First usable minute (defaults to shift start)
+            end: Latest minute a job may end (defaults to 23:59)
+            operators: Operator pool shared with the other machines'
+                timelines (None = operators are not checked)
+        """
+        self.machine = machine
+        self.constraint = constraint
+        self.operators = operators
+        self.window_start = to_minutes(constraint.shift_start) if start is None else start
+        self.window_end = DAY_END if end is None else end
+
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.items: List[Optional[JobAssignment]] = []
+        self.load = 0  # Setup + processing minutes of all jobs
+
+        # Downtime blocks, merged so that blocks never overlap
+        windows = sorted(
+            (to_minutes(dt.start_time), to_minutes(dt.end_time))
+            for dt in machine.downtime_windows
+        )
+        for dt_start, dt_end in windows:
+            if self.ends and dt_start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], dt_end)
+            else:
+                self._insert_block(dt_start, dt_end, None)
+
+    @property
+    def machine_id(self) -> str:
+        return self.machine.machine_id
+
+    def _insert_block(self, start: int, end: int, item: Optional[JobAssignment]) -> int:
+        position = bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self.items.insert(position, item)
+        return position
+
+    def _setup(self, prev: Optional[JobAssignment], product_type: str) -> int:
+        """Setup before a job of `product_type` that follows `prev`."""
+        if prev is None:
+            return 0  # First job on machine
+        return self.constraint.get_setup_time(prev.job.product_type, product_type)
+
+    def _prev_job(self, position: int) -> Optional[JobAssignment]:
+        """Nearest job block before `position` (skipping downtime)."""
+        for k in range(position - 1, -1, -1):
+            if self.items[k] is not None:
+                return self.items[k]
+        return None
+
+    def _next_job(self, position: int) -> Optional[int]:
+        """Index of the nearest job block at or after `position`."""
+        for k in range(position, len(self.items)):
+            if self.items[k] is not None:
+                return k
+        return None
+
+    def _run_start(self, position: int, start: int) -> int:
+        """Start of the continuous run a block starting at `start` joins."""
+        rest = self.constraint.rest_break_minutes
+        for k in range(position - 1, -1, -1):
+            if self.items[k] is None:
+                continue
+            if start - self.ends[k] >= rest:
+                break
+            start = self.starts[k]
+        return start
+
+    def _run_end(self, position: int, end: int, successor: Optional[int], successor_start: int) -> int:
+        """End of the continuous run a block ending at `end` joins."""
+        rest = self.constraint.rest_break_minutes
+        for k in range(position, len(self.items)):
+            if self.items[k] is None:
+                continue
+            block_start = successor_start if k == successor else self.starts[k]
+            if block_start - end >= rest:
+                break
+            end = self.ends[k]
+        return end
+
+    def add_existing(self, assignment: JobAssignment):
+        """
+        Load an already-timed assignment (e.g. from an existing Schedule).
+
+        Args:
+            assignment: Assignment on this machine
+        """
+        start = to_minutes(assignment.start_time) - assignment.setup_time_before
+        self._insert_block(start, to_minutes(assignment.end_time), assignment)
+        self.load += assignment.get_duration_minutes()
+        if self.operators is not None and assignment.operator_id is not None:
+            self.operators.book(
+                assignment.operator_id, to_minutes(assignment.start_time), to_minutes(assignment.end_time)
+            )
+
+    def find_slot(self, job: Job, ready: Optional[int] = None,
+                  duration: Optional[int] = None) -> Optional[Slot]:
+        """
+        Find the earliest gap that fits the job.
+
+        Args:
+            job: Job to place
+            ready: Earliest allowed start minute (defaults to window start)
+            duration: Processing minutes (defaults to the job's effective
+                processing time on this machine)
+
+        Returns:
+            Slot, or None if the job doesn't fit anywhere in the window
+        """
+        ready = self.window_start if ready is None else max(ready, self.window_start)
+        if duration is None:
+            duration = self.machine.get_processing_minutes(job.processing_time)
+
+        limit = self.machine.max_continuous_runtime
+        candidates = None
+        if self.operators is not None:
+            candidates = self.operators.candidates(self.machine, job)
+            if candidates == []:
+                return None  # No qualified operator for this machine
+
+        # Blocks 0..k-1 end at or before `ready`: gap k is the first candidate
+        k = bisect_right(self.ends, ready)
+        prev = self._prev_job(k)
+        prev_end = to_minutes(prev.end_time) if prev is not None else None
+
+        frontier = max(self.ends[k - 1], self.window_start) if k > 0 else self.window_start
+
+        while k <= len(self.starts):
+            gap_start = max(frontier, ready)
+            gap_end = min(self.starts[k] if k < len(self.starts) else self.window_end, self.window_end)
+            setup_time = self._setup(prev, job.product_type)
+            slot = None
+
+            # Push the start later until rest and operator rules both hold
+            while gap_start + setup_time + duration <= gap_end:
+                end = gap_start + setup_time + duration
+                run_start = gap_start
+                if limit is not None:
+                    run_start = self._run_start(k, gap_start)
+                    if run_start < gap_start and end - run_start > limit:
+                        gap_start = prev_end + self.constraint.rest_break_minutes
+                        continue
+
+                operator_id = None
+                if candidates is not None:
+                    free_at, operator_id = self.operators.earliest(candidates, gap_start + setup_time, duration)
+                    if free_at > gap_start + setup_time:
+                        gap_start = free_at - setup_time
+                        continue
+
+                successor = self._next_job(k)
+                if successor is None:
+                    slot = Slot(k, gap_start, setup_time, end, None, operator_id=operator_id)
+                    break
+
+                # The job after us now changes over from our product
+                succ = self.items[successor]
+                succ_setup = self.constraint.get_setup_time(job.product_type, succ.job.product_type)
+                succ_block_start = to_minutes(succ.start_time) - succ_setup
+                before_succ = end if successor == k else self.ends[successor - 1]
+                if succ_block_start < before_succ:
+                    break
+                if limit is not None:
+                    run_end = self._run_end(k, end, successor, succ_block_start)
+                    if run_end - run_start > limit and (run_start, run_end) != (gap_start, end):
+                        break  # Would merge with the next run past the limit
+                slot = Slot(k, gap_start, setup_time, end, successor, succ_setup, operator_id)
+                break
+
+            if slot is not None:
+                return slot
+
+            if k < len(self.items):
+                frontier = max(frontier, self.ends[k])
+                if self.items[k] is not None:
+                    prev = self.items[k]
+                    prev_end = self.ends[k]
+            k += 1
+
+        return None
+
+    def commit(self, slot: Slot, job: Job) -> JobAssignment:
+        """
+        Insert a job at a slot returned by find_slot().
+
+        Args:
+            slot: Insertion point
+            job: Job to insert
+
+        Returns:
+            The new JobAssignment
+        """
+        assignment = JobAssignment(
+            job=job,
+            machine_id=self.machine_id,
+            start_time=from_minutes(slot.block_start + slot.setup_time),
+            end_time=from_minutes(slot.end),
+            setup_time_before=slot.setup_time,
+            processing_minutes=slot.end - slot.block_start - slot.setup_time,
+            operator_id=slot.operator_id
+        )
+        if slot.operator_id is not None:
+            self.operators.book(slot.operator_id, slot.block_start + slot.setup_time, slot.end)
+
+        self.starts.insert(slot.position, slot.block_start)
+        self.ends.insert(slot.position, slot.end)
+        self.items.insert(slot.position, assignment)
+        self.load += assignment.get_duration_minutes()
+
+        if slot.successor is not None:
+            index = slot.successor + 1  # shifted by the insertion
+            succ = self.items[index]
+            self.load += slot.successor_setup - succ.setup_time_before
+            self.items[index] = replace(succ, setup_time_before=slot.successor_setup)
+            self.starts[index] = to_minutes(succ.start_time) - slot.successor_setup
+
+        return assignment
+
+    def place(self, job: Job, ready: Optional[int] = None,
+              duration: Optional[int] = None) -> Optional[JobAssignment]:
+        """
+        Find the earliest fitting gap and insert the job there.
+
+        Returns:
+            The new JobAssignment, or None if it doesn't fit
+        """
+        slot = self.find_slot(job, ready, duration)
+        if slot is None:
+            return None
+        return self.commit(slot, job)
+
+    def remove(self, job_id: str) -> Optional[JobAssignment]:
+        """
+        Take a job off the timeline; the other jobs keep their times.
+
+        The next job's setup is recomputed against its new predecessor.
+        Nothing changes if that setup no longer fits before it.
+
+        Args:
+            job_id: Job to remove
+
+        Returns:
+            The removed JobAssignment, or None if the job isn't on this
+            timeline or can't be removed
+        """
+        position = next(
+            (k for k, item in enumerate(self.items) if item is not None and item.job.job_id == job_id), None
+        )
+        if position is None:
+            return None
+        removed = self.items[position]
+
+        successor = self._next_job(position + 1)
+        succ_setup = 0
+        if successor is not None:
+            succ = self.items[successor]
+            succ_setup = self._setup(self._prev_job(position), succ.job.product_type)
+            before_succ = self.ends[successor - 1] if successor - 1 != position else (
+                self.ends[position - 1] if position > 0 else self.window_start)
+            new_start = to_minutes(succ.start_time) - succ_setup
+            if new_start < before_succ:
+                return None
+            # A longer setup starts the next job's block earlier; don't let
+            # that join it to the previous run on a runtime-limited machine
+            if (self.machine.max_continuous_runtime is not None and succ_setup > succ.setup_time_before
+                    and new_start - before_succ < self.constraint.rest_break_minutes):
+                return None
+
+        if removed.operator_id is not None and self.operators is not None:
+            self.operators.release(removed.operator_id, to_minutes(removed.start_time), to_minutes(removed.end_time))
+        self.load -= removed.get_duration_minutes()
+        if successor is not None:
+            succ = self.items[successor]
+            self.load += succ_setup - succ.setup_time_before
+            self.items[successor] = replace(succ, setup_time_before=succ_setup)
+            self.starts[successor] = to_minutes(succ.start_time) - succ_setup
+        del self.starts[position]
+        del self.ends[position]
+        del self.items[position]
+        return removed
+
+    def assignments(self) -> List[JobAssignment]:
+        """Job assignments on this machine in time order."""
+        return [item for item in self.items if item is not None]
+
+    def __str__(self) -> str:
+        return (f"MachineTimeline({self.machine_id}: {len(self.assignments())} jobs, "
+                f"load {self.load} min)")
+
+
+# Example usage
+if __name__ == "__main__":
+    from datetime import time
+
+    machine = Machine("M1", ["P_A", "P_B"])
+    machine.add_downtime(time(10, 0), time(11, 0), "Scheduled Maintenance")
+    constraint = Constraint(setup_times={"P_A->P_B": 30, "P_B->P_A": 30})
+    timeline = MachineTimeline(machine, constraint)
+
+    jobs = [
+        Job("J001", "P_A", 90, time(12, 0), machine_options=["M1"]),
+        Job("J002", "P_A", 60, time(13, 0), machine_options=["M1"]),   # doesn't fit before 10:00
+        Job("J003", "P_A", 20, time(14, 0), machine_options=["M1"]),   # fills the 09:30-10:00 gap
+    ]
+    for job in jobs:
+        assignment = timeline.place(job)
+        print(f"{job.job_id}: {assignment.start_time}-{assignment.end_time} "
+              f"(setup {assignment.setup_time_before})")
+    print(timeline)
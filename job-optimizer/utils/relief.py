@@ -0,0 +1,271 @@
+"""
+Incremental Bottleneck Relief - Move as few jobs as possible off overloaded machines
+
+Rebuilding a schedule from scratch to fix a couple of overloaded machines
+throws away the batching work on every other machine and moves jobs the
+floor has already planned around. relieve_bottlenecks() starts from the
+given schedule instead: it only takes jobs off machines whose load is
+above what the plant can achieve, and only puts them into free gaps on
+compatible, less loaded machines. Machines that gave up jobs keep their
+sequence (later jobs move up into the freed time); all other machines
+keep their exact sequence and times.
+
+The achievable max load comes from the transportation relaxation in
+utils.load_flow. A machine counts as overloaded when it is more than
+`tolerance` above it.
+
+Key Features:
+    - Starts from the input schedule; untouched machines stay identical
+    - Fewest moves: each move takes the job whose size best matches the
+      machine's excess load
+    - Prefers targets that already run the job's product (keeps batches)
+    - Gap-filling placement on the targets (downtime, rest breaks, operators)
+    - Machines that gave up jobs close the gaps in their original order
+    - Jobs missing from the input schedule are placed as well
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from models.job import Job
+from models.machine import Machine, Constraint
+from models.schedule import Schedule
+from utils.load_flow import assign_load
+from utils.placement import MachineTimeline
+from utils.processing_times import ProcessingTimeMatrix
+from utils.resources import OperatorPool
+from utils.time_utils import to_minutes
+
+
+@dataclass
+class Move:
+    """One job taken off an overloaded machine."""
+    job_id: str
+    from_machine: str
+    to_machine: str
+    minutes: int        # Load taken off the source machine (setup + processing)
+
+    def __str__(self) -> str:
+        return f"{self.job_id}: {self.from_machine} -> {self.to_machine} ({self.minutes} min)"
+
+
+@dataclass
+class ReliefReport:
+    """What relieve_bottlenecks() changed."""
+    moves: List[Move] = field(default_factory=list)
+    placed: List[str] = field(default_factory=list)       # Jobs that were not in the input schedule
+    overloaded: List[str] = field(default_factory=list)   # Machines above the bar at the start
+    target_load: float = 0.0                               # Achievable max load (min)
+    max_load_before: int = 0
+    max_load_after: int = 0
+
+    def __str__(self) -> str:
+        return (f"ReliefReport({len(self.moves)} moves, {len(self.placed)} placed, "
+                f"max load {self.max_load_before} -> {self.max_load_after} min)")
+
+
+def relieve_bottlenecks(
+    schedule: Schedule,
+    machines: List[Machine],
+    constraint: Constraint,
+    all_jobs: Optional[List[Job]] = None,
+    tolerance: float = 0.05,
+    max_moves: Optional[int] = None
+) -> Tuple[Schedule, ReliefReport]:
+    """
+    Relieve overloaded machines by moving a minimal set of jobs.
+
+    Repeatedly takes the most loaded machine above the bar and moves the
+    job whose load best matches its excess to a compatible machine that
+    stays under the bar, until no machine is above the bar or no move
+    helps any more.
+
+    Args:
+        schedule: Schedule to improve (not modified)
+        machines: Available machines
+        constraint: Scheduling constraints
+        all_jobs: Complete job list; jobs missing from the schedule are
+            placed on the least loaded compatible machine (None = only
+            the scheduled jobs)
+        tolerance: Relative slack above the achievable max load before a
+            machine counts as overloaded
+        max_moves: Stop after this many moves (None = no limit)
+
+    Returns:
+        Tuple of (new Schedule, ReliefReport); KPIs not yet calculated
+    """
+    scheduled = [a.job for a in schedule.iter_assignments()]
+    scheduled_ids = {job.job_id for job in scheduled}
+    missing = [job for job in all_jobs or [] if job.job_id not in scheduled_ids]
+    jobs = scheduled + missing
+
+    durations = ProcessingTimeMatrix(jobs, machines)
+    operators = OperatorPool(constraint.operators, machines)
+    timelines: Dict[str, MachineTimeline] = {
+        m.machine_id: MachineTimeline(m, constraint, operators=operators) for m in machines
+    }
+    for assignment in schedule.iter_assignments():
+        timelines[assignment.machine_id].add_existing(assignment)
+
+    report = ReliefReport(max_load_before=max((t.load for t in timelines.values()), default=0))
+    report.target_load = assign_load(jobs, machines, constraint, reference=schedule, durations=durations).max_load
+    bar = report.target_load * (1 + tolerance)
+    changed: Set[str] = set()
+
+    # Jobs per product on each machine, to keep products together
+    products: Dict[str, Counter] = {
+        machine_id: Counter(a.job.product_type for a in timeline.assignments())
+        for machine_id, timeline in timelines.items()
+    }
+
+    # Jobs the input schedule left out go to the least loaded machine first
+    for job in missing:
+        for machine in sorted(durations.compatible(job),
+                              key=lambda m: timelines[m.machine_id].load + durations.duration(job.job_id, m.machine_id)):
+            if timelines[machine.machine_id].place(
+                    job, duration=durations.duration(job.job_id, machine.machine_id)) is not None:
+                report.placed.append(job.job_id)
+                products[machine.machine_id][job.product_type] += 1
+                changed.add(machine.machine_id)
+                break
+
+    product_of = {job.job_id: job.product_type for job in jobs}
+    report.overloaded = sorted(m for m, t in timelines.items() if t.load > bar)
+    stuck: Set[str] = set()
+    freed_since: Dict[str, int] = {}   # Earliest gap a move opened, per machine
+    while max_moves is None or len(report.moves) < max_moves:
+        candidates = [t for m, t in timelines.items() if t.load > bar and m not in stuck]
+        if not candidates:
+            break
+        source = max(candidates, key=lambda t: t.load)
+        excess = source.load - bar
+        found = _best_move(source, timelines, durations, bar, excess, products)
+        if found is None:
+            stuck.add(source.machine_id)
+            continue
+        move, freed_at = found
+        freed_since[move.from_machine] = min(freed_since.get(move.from_machine, freed_at), freed_at)
+        product = product_of[move.job_id]
+        products[move.from_machine][product] -= 1
+        products[move.to_machine][product] += 1
+        report.moves.append(move)
+        changed.update((move.from_machine, move.to_machine))
+
+    # Machines that gave up jobs close the gaps, keeping their sequence
+    for machine_id, since in freed_since.items():
+        timelines[machine_id] = _close_gaps(timelines[machine_id], since, operators, durations)
+
+    new_schedule = schedule.copy()
+    for machine_id in changed:
+        new_schedule.set_machine_jobs(machine_id, timelines[machine_id].assignments())
+    report.max_load_after = max((t.load for t in timelines.values()), default=0)
+    return new_schedule, report
+
+
+def _best_move(
+    source: MachineTimeline,
+    timelines: Dict[str, MachineTimeline],
+    durations: ProcessingTimeMatrix,
+    bar: float,
+    excess: float,
+    products: Dict[str, Counter]
+) -> Optional[Tuple[Move, int]]:
+    """
+    Try candidate moves off `source`, best first; commit the first that fits.
+
+    Returns:
+        (Move, minute the freed block started), or None if no move fits
+    """
+    options = []
+    for assignment in source.assignments():
+        job = assignment.job
+        freed = assignment.get_duration_minutes()
+        for machine in durations.compatible(job):
+            target = timelines[machine.machine_id]
+            if target is source:
+                continue
+            added = durations.duration(job.job_id, machine.machine_id)
+            # The move must lower the pair's max load and keep the target under the bar
+            if target.load + added >= source.load or target.load + added > bar:
+                continue
+            at_home = products[machine.machine_id][job.product_type] > 0
+            options.append((
+                abs(excess - freed),                    # one move that covers the excess
+                0 if at_home else 1,                    # target already runs this product
+                target.load + added,                    # then the emptier target
+                job.job_id, machine.machine_id, freed, job
+            ))
+    options.sort(key=lambda o: o[:5])
+
+    for _, _, _, job_id, machine_id, freed, job in options:
+        target = timelines[machine_id]
+        slot = target.find_slot(job, duration=durations.duration(job_id, machine_id))
+        if slot is None:
+            continue
+        removed = source.remove(job_id)
+        if removed is None:
+            continue
+        # Removing released the job's operator; the slot may now be better
+        slot = target.find_slot(job, duration=durations.duration(job_id, machine_id)) or slot
+        target.commit(slot, job)
+        return Move(job_id, source.machine_id, machine_id, freed), to_minutes(removed.start_time) - removed.setup_time_before
+    return None
+
+
+def _close_gaps(
+    timeline: MachineTimeline,
+    since: int,
+    operators: OperatorPool,
+    durations: ProcessingTimeMatrix
+) -> MachineTimeline:
+    """
+    Rebuild a timeline, pulling the jobs that start at or after `since`
+    forward into the gaps moves left behind. Their order is kept, so the
+    machine's batches stay as they were.
+    """
+    assignments = timeline.assignments()
+    for a in assignments:
+        if a.operator_id is not None:
+            operators.release(a.operator_id, to_minutes(a.start_time), to_minutes(a.end_time))
+
+    fresh = MachineTimeline(timeline.machine, timeline.constraint, operators=operators)
+    ready = None
+    for a in assignments:
+        if to_minutes(a.start_time) - a.setup_time_before < since:
+            fresh.add_existing(a)
+            continue
+        placed = fresh.place(a.job, ready=ready, duration=durations.duration(a.job.job_id, timeline.machine_id))
+        if placed is None:
+            fresh.add_existing(a)  # Keep its old slot rather than drop it
+            placed = a
+        ready = to_minutes(placed.end_time)
+    return fresh
+
+
+# Example usage
+if __name__ == "__main__":
+    from datetime import time
+    from models.schedule import JobAssignment
+
+    machines = [Machine("M1", ["P_A", "P_B"]), Machine("M2", ["P_A"]), Machine("M3", ["P_A", "P_B"])]
+    constraint = Constraint()
+
+    # Everything piled on M1; M3 already runs a P_B batch
+    overloaded = Schedule()
+    start = 8 * 60
+    for i in range(8):
+        job = Job(f"J{i:03d}", "P_A", 45, time(16, 0), "normal", ["M1", "M2", "M3"])
+        setup = 0 if i == 0 else 5
+        overloaded.add_assignment(JobAssignment(job, "M1", time(*divmod(start + setup, 60)),
+                                                time(*divmod(start + setup + 45, 60)), setup))
+        start += setup + 45
+    batch = Job("J100", "P_B", 60, time(12, 0), "normal", ["M1", "M3"])
+    overloaded.add_assignment(JobAssignment(batch, "M3", time(8, 0), time(9, 0), 0))
+
+    relieved, report = relieve_bottlenecks(overloaded, machines, constraint)
+    print(report)
+    for move in report.moves:
+        print(" ", move)
+    for machine in machines:
+        print(machine.machine_id, [a.job.job_id for a in relieved.get_machine_jobs(machine.machine_id)])
@@ -0,0 +1,407 @@
+"""
+Incremental Rescheduler - Repair a published schedule after a breakdown
+
+When a machine breaks down mid-shift (recorded with Machine.add_downtime),
+rerunning the whole pipeline from all_jobs is too slow to react to.
+This module repairs the existing schedule instead.
+
+For general re-planning (new or cancelled orders, changed due times,
+new downtime anywhere), reschedule_stable() takes the previous schedule as
+a reference and weighs schedule quality against how much of the plan
+changes (Constraint.stability_weight).
+
+Key Features:
+    - Freezes assignments that have already started
+    - Shifts only the affected suffix on the broken machine
+    - Reroutes jobs that no longer fit the shift to compatible machines
+    - Stops as soon as the shifted suffix rejoins the original timeline
+    - Stability-aware re-planning against a reference schedule
+"""
+
+from dataclasses import replace
+from datetime import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from models.job import Job
+from models.machine import Machine, Constraint, DowntimeWindow
+from models.schedule import Schedule, JobAssignment
+from utils.placement import MachineTimeline
+from utils.processing_times import ProcessingTimeMatrix
+from utils.resources import OperatorPool
+from utils.time_utils import to_minutes, from_minutes
+
+
+def _setup_between(constraint: Constraint, prev_product: Optional[str], product: str) -> int:
+    """Setup minutes before a job, given the product that ran before it."""
+    if prev_product is None:
+        return 0  # First job on machine
+    return constraint.get_setup_time(prev_product, product)
+
+
+def _skip_downtime(machine: Machine, start: int, duration: int) -> int:
+    """
+    Push a block of work past any downtime window it overlaps.
+
+    Args:
+        machine: Machine the work runs on
+        start: Proposed start of the block (minutes since midnight)
+        duration: Block length including setup
+
+    Windows that cross midnight (e.g. added in code as 23:00-01:00) are
+    split into their same-day parts first.
+
+    Returns:
+        Earliest start at or after `start` that avoids all downtime
+    """
+    windows = sorted(
+        (to_minutes(part.start_time), to_minutes(part.end_time))
+        for dt in machine.downtime_windows
+        for part in dt.split_at_midnight()
+    )
+    for dt_start, dt_end in windows:
+        if start < dt_end and start + duration > dt_start:
+            start = dt_end
+    return start
+
+
+def repair_after_downtime(
+    schedule: Schedule,
+    machines: List[Machine],
+    constraint: Constraint,
+    machine_id: str,
+    downtime: DowntimeWindow,
+    now: Optional[time] = None
+) -> Tuple[Schedule, str]:
+    """
+    Repair a schedule after a new downtime window on one machine.
+
+    The downtime must already be recorded on the machine, e.g.:
+
+        >>> window = machine.add_downtime(time(10, 0), time(11, 0), "Breakdown")
+        >>> repaired, explanation = repair_after_downtime(
+        ...     schedule, machines, constraint, machine.machine_id, window
+        ... )
+
+    Algorithm:
+    1. Freeze every assignment whose setup started before `now`
+    2. Walk the remaining jobs on the broken machine in order, pushing each
+       one past the downtime and re-computing setup against its predecessor
+    3. A job that would now end beyond the shift (plus overtime) is appended
+       to the compatible machine where it finishes earliest
+    4. Stop as soon as a job after the downtime keeps its original slot -
+       everything after it is unaffected
+
+    The input schedule is not modified.
+
+    Args:
+        schedule: Schedule currently being executed
+        machines: List of all machines
+        constraint: Scheduling constraints
+        machine_id: Machine that broke down
+        downtime: The new downtime window
+        now: Current time (defaults to the downtime start)
+
+    Returns:
+        Tuple of (repaired Schedule, explanation)
+    """
+    if now is None:
+        now = downtime.start_time
+    now_minutes = to_minutes(now)
+    shift_limit = to_minutes(constraint.shift_end) + constraint.max_overtime_minutes
+
+    # Latest end of the window's same-day parts (23:59 if it crosses midnight)
+    downtime_end = max(to_minutes(part.end_time) for part in downtime.split_at_midnight())
+
+    machine_lookup = {m.machine_id: m for m in machines}
+    broken_machine = machine_lookup[machine_id]
+
+    repaired = schedule.copy()
+    timeline = sorted(repaired.get_machine_jobs(machine_id), key=lambda a: a.start_time)
+
+    # Frozen prefix: anything that has already started stays exactly as is
+    split = 0
+    while (split < len(timeline) and
+           to_minutes(timeline[split].start_time) - timeline[split].setup_time_before < now_minutes):
+        split += 1
+
+    kept = timeline[:split]
+    cursor = to_minutes(kept[-1].end_time) if kept else to_minutes(constraint.shift_start)
+    prev_product = kept[-1].job.product_type if kept else None
+
+    shifted = []
+    rerouted = []
+    unplaced = []
+
+    for index in range(split, len(timeline)):
+        assignment = timeline[index]
+        job = assignment.job
+
+        setup_time = _setup_between(constraint, prev_product, job.product_type)
+        processing_minutes = assignment.get_processing_minutes()
+        original_block_start = to_minutes(assignment.start_time) - assignment.setup_time_before
+        block_start = _skip_downtime(
+            broken_machine,
+            max(cursor, original_block_start),
+            setup_time + processing_minutes
+        )
+
+        # Unchanged slot and predecessor past the downtime: the rest of the
+        # machine is unaffected
+        if (block_start == original_block_start and
+                setup_time == assignment.setup_time_before and
+                block_start >= downtime_end):
+            kept.extend(timeline[index:])
+            break
+
+        block_end = block_start + setup_time + processing_minutes
+        if block_end <= shift_limit:
+            kept.append(replace(
+                assignment,
+                start_time=from_minutes(block_start + setup_time),
+                end_time=from_minutes(block_end),
+                setup_time_before=setup_time
+            ))
+            if block_start != original_block_start:
+                shifted.append(job.job_id)
+            cursor = block_end
+            prev_product = job.product_type
+            continue
+
+        # Doesn't fit the shift anymore: append to the compatible machine
+        # where it finishes earliest
+        best = None
+        for target in machines:
+            if target.machine_id == machine_id:
+                continue
+            if not (target.can_produce(job.product_type) and job.can_run_on(target.machine_id)):
+                continue
+
+            target_jobs = repaired.get_machine_jobs(target.machine_id)
+            if target_jobs:
+                last = max(target_jobs, key=lambda a: a.end_time)
+                target_start = max(to_minutes(last.end_time), now_minutes)
+                target_setup = _setup_between(constraint, last.job.product_type, job.product_type)
+            else:
+                target_start = max(to_minutes(constraint.shift_start), now_minutes)
+                target_setup = 0
+
+            target_minutes = target.get_processing_minutes(job.processing_time)
+            target_start = _skip_downtime(target, target_start, target_setup + target_minutes)
+            target_end = target_start + target_setup + target_minutes
+            if target_end <= shift_limit and (best is None or target_end < best[0]):
+                best = (target_end, target, target_start, target_setup, target_minutes)
+
+        if best is None:
+            # Nowhere to go: keep it on the broken machine, running late
+            kept.append(replace(
+                assignment,
+                start_time=from_minutes(block_start + setup_time),
+                end_time=from_minutes(block_end),
+                setup_time_before=setup_time
+            ))
+            unplaced.append(job.job_id)
+            cursor = block_end
+            prev_product = job.product_type
+            continue
+
+        target_end, target, target_start, target_setup, target_minutes = best
+        repaired.add_assignment(JobAssignment(
+            job=job,
+            machine_id=target.machine_id,
+            start_time=from_minutes(target_start + target_setup),
+            end_time=from_minutes(target_end),
+            setup_time_before=target_setup,
+            processing_minutes=target_minutes
+        ))
+        rerouted.append(f"{job.job_id}->{target.machine_id}")
+
+    repaired.set_machine_jobs(machine_id, kept)
+    repaired.calculate_kpis(machines, constraint)
+
+    explanation = f"""INCREMENTAL REPAIR AFTER DOWNTIME:
+- Machine: {machine_id} ({downtime})
+- Frozen (already started): {split} job(s)
+- Shifted on {machine_id}: {len(shifted)} job(s) {', '.join(shifted)}
+- Rerouted: {len(rerouted)} job(s) {', '.join(rerouted)}
+- Could not fit within shift: {len(unplaced)} job(s) {', '.join(unplaced)}
+"""
+    repaired.explanation = explanation
+    return repaired, explanation
+
+
+def _block_start(assignment: JobAssignment) -> int:
+    return to_minutes(assignment.start_time) - assignment.setup_time_before
+
+
+def _frozen_timelines(
+    reference: Schedule,
+    jobs_by_id: Dict[str, Job],
+    machines: List[Machine],
+    constraint: Constraint,
+    now_minutes: Optional[int]
+) -> Tuple[Dict[str, MachineTimeline], Set[str]]:
+    """Timelines holding the reference jobs that have already started."""
+    operators = OperatorPool(constraint.operators, machines)
+    timelines = {m.machine_id: MachineTimeline(m, constraint, operators=operators) for m in machines}
+    frozen: Set[str] = set()
+    if now_minutes is None:
+        return timelines, frozen
+    for assignment in reference.iter_assignments():
+        job = jobs_by_id.get(assignment.job.job_id)
+        if job is None or assignment.machine_id not in timelines or _block_start(assignment) >= now_minutes:
+            continue
+        timelines[assignment.machine_id].add_existing(replace(assignment, job=job))
+        frozen.add(job.job_id)
+    return timelines, frozen
+
+
+def _place_earliest_finish(
+    job: Job,
+    timelines: Dict[str, MachineTimeline],
+    durations: ProcessingTimeMatrix,
+    ready: Optional[int]
+) -> bool:
+    """Place a job on the compatible machine where it finishes first."""
+    best = None
+    for machine in durations.compatible(job):
+        timeline = timelines[machine.machine_id]
+        slot = timeline.find_slot(job, ready, durations.duration(job.job_id, machine.machine_id))
+        if slot is not None and (best is None or slot.end < best[0].end):
+            best = (slot, timeline)
+    if best is None:
+        return False
+    best[1].commit(best[0], job)
+    return True
+
+
+def _to_schedule(timelines: Dict[str, MachineTimeline], created_by: str) -> Schedule:
+    schedule = Schedule(created_by=created_by)
+    for machine_id, timeline in timelines.items():
+        assignments = timeline.assignments()
+        if assignments:
+            schedule.set_machine_jobs(machine_id, assignments)
+    return schedule
+
+
+def reschedule_stable(
+    reference: Schedule,
+    jobs: List[Job],
+    machines: List[Machine],
+    constraint: Constraint,
+    now: Optional[time] = None
+) -> Tuple[Schedule, str]:
+    """
+    Re-plan against a previous schedule, penalising changes to it.
+
+    Two candidates are built on top of the jobs that have already started
+    (frozen as they are):
+
+    1. Kept plan: every other job stays on its reference machine, in
+       reference order, at the earliest slot at or after its old start.
+       Jobs that no longer fit there, and new jobs, go to the compatible
+       machine where they finish first.
+    2. Re-plan: all not-started jobs, rush first then by due time, each on
+       the compatible machine where it finishes first.
+
+    The candidate with the fewest violations, then the lowest weighted
+    score including Constraint.stability_weight x ScheduleDiff.penalty,
+    is returned. With stability_weight 0 this is just the better plan;
+    raising it favours the plan that moves fewer jobs.
+
+    Args:
+        reference: Schedule currently published on the floor
+        jobs: Current job list (may add, drop or change jobs)
+        machines: Machines, with any new downtime already recorded
+        constraint: Scheduling constraints (incl. stability_weight)
+        now: Current time; assignments whose setup started before it are
+            frozen and nothing new starts before it (None = start of shift)
+
+    Returns:
+        Tuple of (Schedule with KPIs against the reference, explanation)
+    """
+    now_minutes = to_minutes(now) if now is not None else None
+    jobs_by_id = {job.job_id: job for job in jobs}
+    durations = ProcessingTimeMatrix(jobs, machines)
+
+    # 1. Kept plan
+    timelines, frozen = _frozen_timelines(reference, jobs_by_id, machines, constraint, now_minutes)
+    kept = sorted(
+        (a for a in reference.iter_assignments() if a.job.job_id in jobs_by_id and a.job.job_id not in frozen),
+        key=_block_start
+    )
+    relocated = []
+    for assignment in kept:
+        job = jobs_by_id[assignment.job.job_id]
+        timeline = timelines.get(assignment.machine_id)
+        ready = _block_start(assignment) if now_minutes is None else max(_block_start(assignment), now_minutes)
+        duration = durations.duration(job.job_id, assignment.machine_id) if timeline else -1
+        if duration >= 0 and timeline.place(job, ready, duration) is not None:
+            continue
+        if _place_earliest_finish(job, timelines, durations, now_minutes):
+            relocated.append(job.job_id)
+    new_jobs = sorted(
+        (job for job in jobs if job.job_id not in reference),
+        key=lambda j: (0 if j.is_rush else 1, j.due_time, j.job_id)
+    )
+    for job in new_jobs:
+        _place_earliest_finish(job, timelines, durations, now_minutes)
+    kept_plan = _to_schedule(timelines, "Stable Rescheduler (kept plan)")
+
+    # 2. Re-plan everything that hasn't started
+    timelines, _ = _frozen_timelines(reference, jobs_by_id, machines, constraint, now_minutes)
+    for job in sorted((j for j in jobs if j.job_id not in frozen),
+                      key=lambda j: (0 if j.is_rush else 1, j.due_time, j.job_id)):
+        _place_earliest_finish(job, timelines, durations, now_minutes)
+    replanned = _to_schedule(timelines, "Stable Rescheduler (re-plan)")
+
+    ranked = []
+    for name, candidate in (("kept plan", kept_plan), ("re-plan", replanned)):
+        candidate.calculate_kpis(machines, constraint, reference=reference)
+        _, violations = candidate.validate(machines, constraint, jobs=jobs)
+        ranked.append((len(violations), candidate.kpis.get_weighted_score(constraint), name, candidate))
+    ranked.sort(key=lambda r: r[:2])
+    _, _, chosen_name, chosen = ranked[0]
+    changes = chosen.diff(reference)
+
+    lines = [
+        f"STABLE RESCHEDULE (stability weight {constraint.stability_weight}):",
+        f"- Frozen (already started): {len(frozen)} job(s)",
+        f"- New jobs: {len(new_jobs)}, dropped jobs: {len(changes.removed)}",
+    ]
+    for violations, score, name, candidate in ranked:
+        lines.append(f"- {name}: score {score:.1f}, {violations} violation(s), "
+                     f"{candidate.kpis.jobs_changed} job(s) changed "
+                     f"(stability penalty {candidate.kpis.stability_penalty:.0f})")
+    if chosen_name == "kept plan" and relocated:
+        lines.append(f"- Relocated (no longer fit their machine): {', '.join(relocated)}")
+    lines.append(f"- Chosen: {chosen_name} - {len(changes.moved)} moved, {len(changes.reordered)} reordered, "
+                 f"{len(changes.shifted)} shifted, {changes.unchanged} unchanged")
+    explanation = "\n".join(lines) + "\n"
+    chosen.explanation = explanation
+    return chosen, explanation
+
+
+# Example usage
+if __name__ == "__main__":
+    from utils.data_generator import generate_random_jobs, get_demo_machines, get_demo_constraint
+    from utils.baseline_scheduler import BaselineScheduler
+
+    jobs = generate_random_jobs(12)
+    machines = get_demo_machines()
+    constraint = get_demo_constraint()
+
+    schedule, _ = BaselineScheduler().schedule(jobs, machines, constraint)
+    print(f"Before: {schedule}")
+
+    window = machines[0].add_downtime(time(9, 0), time(10, 30), "Breakdown")
+    repaired, explanation = repair_after_downtime(
+        schedule, machines, constraint, machines[0].machine_id, window
+    )
+    print(f"After:  {repaired}")
+    print(explanation)
+
+    # Re-plan with two rush orders added, preferring few changes
+    constraint.stability_weight = 1.0
+    rush = [replace(job, job_id=f"R{i}", priority="rush") for i, job in enumerate(jobs[:2])]
+    replanned, explanation = reschedule_stable(repaired, jobs + rush, machines, constraint, now=time(9, 30))
+    print(explanation)
@@ -0,0 +1,181 @@
+"""
+Shared Resources - Interval calendars for operators
+
+Machines are not the only thing a job occupies: it also needs an operator
+(the machine's dedicated operator, or any operator with the required
+skill). Operators are shared between machines, so each one gets its own
+calendar of busy intervals. Calendars are kept sorted so that "is this
+operator free from a to b?" is a single bisect.
+
+Operators are booked for a job's processing window only; changeovers are
+assumed to be done by the setup crew.
+
+Key Features:
+    - ResourceCalendar: sorted busy intervals, O(log n) free checks
+    - OperatorPool: skill matching plus earliest-free lookup per job
+    - Machine.operator_id pins a machine to one operator
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from models.job import Job
+from models.machine import Machine
+from models.operator import Operator
+
+
+class ResourceCalendar:
+    """
+    Busy intervals of a single renewable resource (capacity 1).
+
+    Intervals are half-open [start, end) minutes and never overlap.
+    """
+
+    def __init__(self, resource_id: str):
+        self.resource_id = resource_id
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+
+    def is_free(self, start: int, end: int) -> bool:
+        """
+        Check that no booking overlaps [start, end).
+
+        Args:
+            start: Interval start (minutes)
+            end: Interval end (minutes)
+
+        Returns:
+            True if the resource is free for the whole interval
+        """
+        # First booking that ends after `start` is the only one that can overlap
+        k = bisect_right(self.ends, start)
+        return k == len(self.starts) or self.starts[k] >= end
+
+    def next_free(self, start: int, duration: int) -> int:
+        """
+        Earliest time at or after `start` when the resource is free for
+        `duration` minutes.
+
+        Args:
+            start: Earliest allowed start (minutes)
+            duration: Minutes required
+
+        Returns:
+            Start minute of the first free window
+        """
+        k = bisect_right(self.ends, start)
+        while k < len(self.starts) and self.starts[k] < start + duration:
+            start = max(start, self.ends[k])
+            k += 1
+        return start
+
+    def book(self, start: int, end: int):
+        """
+        Reserve [start, end).
+
+        Raises:
+            ValueError: If the interval overlaps an existing booking
+        """
+        if not self.is_free(start, end):
+            raise ValueError(f"{self.resource_id} is already busy between {start} and {end}")
+        k = bisect_right(self.starts, start)
+        self.starts.insert(k, start)
+        self.ends.insert(k, end)
+
+    def release(self, start: int, end: int):
+        """Remove a booking made with book()."""
+        k = bisect_right(self.starts, start) - 1
+        if k >= 0 and self.starts[k] == start and self.ends[k] == end:
+            del self.starts[k]
+            del self.ends[k]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class OperatorPool:
+    """
+    Operators shared by all machines, each with a ResourceCalendar.
+
+    Which operators may run a job on a machine:
+    - machine.operator_id set: only that operator (if they hold the skill)
+    - otherwise, job.operator_skill_required set: any skilled operator
+    - otherwise: no operator is booked
+
+    A machine operator_id that isn't in the pool is treated as an operator
+    holding every skill. With no operators configured at all, skill
+    requirements are not enforced.
+    """
+
+    def __init__(self, operators: List[Operator], machines: Optional[List[Machine]] = None):
+        """
+        Create the pool.
+
+        Args:
+            operators: Known operators and their skills
+            machines: Machines, to register dedicated operators not in `operators`
+        """
+        self.operators: Dict[str, Optional[Operator]] = {op.operator_id: op for op in operators}
+        for machine in machines or []:
+            if machine.operator_id and machine.operator_id not in self.operators:
+                self.operators[machine.operator_id] = None  # skills unknown
+        self.calendars: Dict[str, ResourceCalendar] = {
+            operator_id: ResourceCalendar(operator_id) for operator_id in self.operators
+        }
+
+        # Skill -> operators holding it
+        self._by_skill: Dict[str, List[str]] = {}
+        for op in operators:
+            for skill in op.skills:
+                self._by_skill.setdefault(skill, []).append(op.operator_id)
+
+    def candidates(self, machine: Machine, job: Job) -> Optional[List[str]]:
+        """
+        Operators allowed to run a job on a machine.
+
+        Returns:
+            List of operator IDs (empty = job can't be staffed there), or
+            None if no operator needs to be booked
+        """
+        skill = job.operator_skill_required
+        if machine.operator_id:
+            operator = self.operators.get(machine.operator_id)
+            if operator is None or operator.has_skill(skill):
+                return [machine.operator_id]
+            return []
+        if skill is None or not any(self.operators.values()):
+            return None
+        return self._by_skill.get(skill, [])
+
+    def earliest(self, candidates: List[str], start: int, duration: int) -> Optional[Tuple[int, str]]:
+        """
+        First time at or after `start` when one of the candidates is free.
+
+        Args:
+            candidates: Operator IDs from candidates()
+            start: Earliest allowed start (minutes)
+            duration: Minutes the operator is needed
+
+        Returns:
+            Tuple of (start, operator_id), or None if there are no candidates
+        """
+        best = None
+        for operator_id in candidates:
+            free_at = self.calendars[operator_id].next_free(start, duration)
+            if best is None or free_at < best[0]:
+                best = (free_at, operator_id)
+                if free_at == start:
+                    break
+        return best
+
+    def book(self, operator_id: str, start: int, end: int):
+        """Reserve an operator for [start, end)."""
+        self.calendars[operator_id].book(start, end)
+
+    def release(self, operator_id: str, start: int, end: int):
+        """Cancel a booking made with book()."""
+        self.calendars[operator_id].release(start, end)
+
+    def __str__(self) -> str:
+        booked = sum(len(c) for c in self.calendars.values())
+        return f"OperatorPool({len(self.operators)} operators, {booked} bookings)"
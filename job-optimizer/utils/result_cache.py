@@ -0,0 +1,250 @@
+"""
+Schedule Result Cache - Reuse schedules for identical inputs
+
+Identical inputs are scheduled over and over: Streamlit reruns, n8n
+retries, what-if comparisons that only touch one weight. ScheduleCache
+keys results by a content hash of the jobs, machines, constraint and
+strategy name, so an identical request returns the stored Schedule
+instead of running the optimizer again.
+
+Hashing large job sets stays cheap: jobs are encoded into NumPy columns
+(the same encoding as the schedule archives in utils.serialization) and
+hashed column by column, not dumped to JSON one dict at a time. Jobs are
+sorted by job_id first, so the key does not depend on their input order
+(every scheduler sorts them itself). Machines are hashed in input order:
+the FIFO and dispatch schedulers break ties by machine position.
+
+Key Features:
+    - schedule_fingerprint(): canonical BLAKE2b key for an instance
+    - In-memory LRU tier with a fixed number of entries
+    - Optional on-disk tier (.npz schedule archives) shared between
+      processes and restarts
+    - Thread-safe; hit/miss statistics
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from models.job import Job
+from models.machine import Machine, Constraint
+from models.schedule import Schedule
+from utils.serialization import _job_columns, save_schedule, load_schedule
+
+
+def _update_json(digest: Any, value: Any):
+    """Feed a small JSON-able value into the hash in canonical form."""
+    digest.update(json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode())
+
+
+def schedule_fingerprint(
+    jobs: List[Job],
+    machines: List[Machine],
+    constraint: Constraint,
+    strategy: str
+) -> str:
+    """
+    Canonical hash of a scheduling request.
+
+    Every field that can change the result is included: all job fields,
+    the machines (capabilities, rates, downtime, runtime limits, operators)
+    and every Constraint field (shift, setup matrix, weights, operators).
+
+    Args:
+        jobs: Jobs to schedule (order does not matter)
+        machines: Available machines (order matters)
+        constraint: Scheduling constraints
+        strategy: Strategy name including its parameters
+            (e.g. "baseline:atcs", "anytime:5000")
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    _update_json(digest, strategy)
+
+    columns, vocabs = _job_columns(sorted(jobs, key=lambda j: j.job_id))
+    for name in sorted(columns):
+        column = columns[name]
+        digest.update(f"{name}:{column.dtype.str}:".encode())
+        digest.update(column.tobytes())
+    _update_json(digest, vocabs)
+
+    _update_json(digest, [m.to_dict() for m in machines])
+    _update_json(digest, constraint.to_dict())
+    return digest.hexdigest()
+
+
+class ScheduleCache:
+    """
+    Two-tier result cache: LRU in memory, optional archive files on disk.
+
+    Cached schedules are copied on the way in and out, so callers can edit
+    what they get back without corrupting the cache.
+
+    Example:
+        >>> cache = ScheduleCache(max_entries=64, directory=".schedule_cache")
+        >>> schedule, explanation = cache.get_or_compute(
+        ...     jobs, machines, constraint, "baseline:atcs",
+        ...     lambda: BaselineScheduler("atcs").schedule(jobs, machines, constraint))
+    """
+
+    def __init__(self, max_entries: int = 128, directory: Optional[Union[str, Path]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Schedules kept in memory (least recently used evicted)
+            directory: Folder for the on-disk tier (None = memory only)
+        """
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries: "OrderedDict[str, Tuple[Schedule, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[Tuple[Schedule, str]]:
+        """
+        Look up a result.
+
+        Args:
+            key: Key from schedule_fingerprint()
+
+        Returns:
+            (Schedule, explanation) copy, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0].copy(), entry[1]
+
+        if self.directory and self._path(key).exists():
+            try:
+                schedule = load_schedule(self._path(key), mmap=False).to_schedule()
+            except (OSError, ValueError, KeyError):
+                schedule = None  # Unreadable/partial file: treat as a miss
+            if schedule is not None:
+                self._remember(key, schedule, schedule.explanation)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return schedule.copy(), schedule.explanation
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, schedule: Schedule, explanation: str = ""):
+        """
+        Store a result in memory (and on disk if enabled).
+
+        Args:
+            key: Key from schedule_fingerprint()
+            schedule: Schedule to store (a copy is kept)
+            explanation: Explanation returned with the schedule
+        """
+        stored = schedule.copy()
+        stored.explanation = explanation
+        self._remember(key, stored, explanation)
+
+        if self.directory:
+            # Write to a temp file first so readers never see a partial archive
+            tmp = self.directory / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+            save_schedule(stored, tmp)
+            os.replace(tmp, self._path(key))
+
+    def _remember(self, key: str, schedule: Schedule, explanation: str):
+        with self._lock:
+            self._entries[key] = (schedule, explanation)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(
+        self,
+        jobs: List[Job],
+        machines: List[Machine],
+        constraint: Constraint,
+        strategy: str,
+        compute: Callable[[], Tuple[Schedule, str]]
+    ) -> Tuple[Schedule, str]:
+        """
+        Return the cached result for this instance, computing it on a miss.
+
+        Args:
+            jobs: Jobs to schedule
+            machines: Available machines
+            constraint: Scheduling constraints
+            strategy: Strategy name including its parameters
+            compute: Produces (Schedule, explanation) on a miss
+
+        Returns:
+            Tuple of (Schedule, explanation)
+        """
+        key = schedule_fingerprint(jobs, machines, constraint, strategy)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        schedule, explanation = compute()
+        self.put(key, schedule, explanation)
+        return schedule, explanation
+
+    def clear(self, disk: bool = False):
+        """
+        Drop all in-memory entries (and the on-disk tier if disk=True).
+        """
+        with self._lock:
+            self._entries.clear()
+        if disk and self.directory:
+            for path in self.directory.glob("*.npz"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Example usage
+if __name__ == "__main__":
+    import time as clock
+    from utils.baseline_scheduler import BaselineScheduler
+    from utils.data_generator import generate_random_jobs, get_demo_machines, get_demo_constraint
+
+    jobs = generate_random_jobs(2000)
+    machines = get_demo_machines()
+    constraint = get_demo_constraint()
+    cache = ScheduleCache(max_entries=8)
+
+    for attempt in range(2):
+        started = clock.perf_counter()
+        schedule, _ = cache.get_or_compute(
+            jobs, machines, constraint, "baseline:atcs",
+            lambda: BaselineScheduler("atcs").schedule(jobs, machines, constraint)
+        )
+        print(f"Run {attempt + 1}: {(clock.perf_counter() - started) * 1000:.1f} ms, {schedule.num_assignments} jobs")
+    print(cache.stats())
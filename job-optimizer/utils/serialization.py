@@ -0,0 +1,424 @@
+"""
+Schedule Serialization - Compact columnar archives for schedules and jobs
+
+Schedule.to_dict() builds nested dicts with strftime strings for every
+assignment, which is slow and bulky for archived schedules. This module
+stores schedules and job sets as columnar binary archives instead:
+
+    - NumPy .npz (always available). Written uncompressed so every column
+      can be memory-mapped straight out of the zip file.
+    - Arrow IPC .arrow (if pyarrow is installed), memory-mapped via pyarrow.
+
+Loaded archives materialise Job and JobAssignment objects lazily, one row
+at a time. JSON stays available at the edge via ScheduleArchive.to_dict().
+
+Key Features:
+    - Categorical encoding for machine IDs and product types
+    - Machine option lists stored as a vocabulary of lists (any machine
+      ID round-trips, including ones containing "|")
+    - Times stored as minutes since midnight, dates as ordinals
+    - Memory-mapped loading, lazy row materialisation
+"""
+
+import io
+import json
+import struct
+import zipfile
+from datetime import date, time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from models.job import Job
+from models.schedule import Schedule, JobAssignment, KPI
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # Arrow support is optional
+    pa = None
+
+
+# 2: machine_options vocabulary holds lists (version 1 joined them with "|")
+FORMAT_VERSION = 2
+META_KEY = "__meta__"
+
+PathLike = Union[str, Path]
+
+
+# ---------------------------------------------------------------------------
+# Column encoding
+# ---------------------------------------------------------------------------
+
+def _encode_categorical(values: List[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """Encode hashable values (strings, tuples) as int32 codes plus a vocabulary list."""
+    vocab: Dict[str, int] = {}
+    codes = np.fromiter(
+        (vocab.setdefault(v, len(vocab)) for v in values),
+        dtype=np.int32,
+        count=len(values)
+    )
+    return codes, list(vocab)
+
+
+def _string_column(values: List[Optional[str]]) -> np.ndarray:
+    """Fixed-width unicode column; None is stored as an empty string."""
+    return np.array(["" if v is None else v for v in values], dtype=np.str_)
+
+
+def _job_columns(jobs: List[Job]) -> Tuple[Dict[str, np.ndarray], Dict[str, List[str]]]:
+    """Build columns (and categorical vocabularies) for a list of jobs."""
+    product_codes, product_vocab = _encode_categorical([j.product_type for j in jobs])
+    option_codes, option_vocab = _encode_categorical([tuple(j.machine_options) for j in jobs])
+    setup_codes, setup_vocab = _encode_categorical([j.setup_requirements or "" for j in jobs])
+    skill_codes, skill_vocab = _encode_categorical([j.operator_skill_required or "" for j in jobs])
+    columns = {
+        "job_id": _string_column([j.job_id for j in jobs]),
+        "product_code": product_codes,
+        "processing_time": np.array([j.processing_time for j in jobs], dtype=np.int32),
+        "due_minute": np.array([j.due_time.hour * 60 + j.due_time.minute for j in jobs], dtype=np.int32),
+        "is_rush": np.array([j.is_rush for j in jobs], dtype=np.bool_),
+        "machine_options_code": option_codes,
+        "setup_requirements_code": setup_codes,
+        "operator_skill_code": skill_codes,
+        "batch_size": np.array([j.batch_size for j in jobs], dtype=np.int32),
+        "due_date": np.array([j.due_date.toordinal() if j.due_date else 0 for j in jobs], dtype=np.int32),
+    }
+    vocabs = {
+        "product_code": product_vocab,
+        "machine_options_code": [list(options) for options in option_vocab],
+        "setup_requirements_code": setup_vocab,
+        "operator_skill_code": skill_vocab,
+    }
+    return columns, vocabs
+
+
+def _schedule_columns(schedule: Schedule) -> Tuple[Dict[str, np.ndarray], Dict[str, List[str]]]:
+    """Build columns for a schedule: one row per assignment, job fields inline."""
+    columns, vocabs = _job_columns([a.job for a in schedule.iter_assignments()])
+
+    raw = schedule.to_columns()
+    machine_codes, machine_vocab = _encode_categorical(raw["machine_id"])
+    operator_codes, operator_vocab = _encode_categorical(raw["operator_id"])
+    columns.update({
+        "machine_code": machine_codes,
+        "start_minute": np.array(raw["start_minute"], dtype=np.int32),
+        "end_minute": np.array(raw["end_minute"], dtype=np.int32),
+        "setup_time_before": np.array(raw["setup_time_before"], dtype=np.int32),
+        "processing_minutes": np.array(raw["processing_time"], dtype=np.int32),
+        "start_date": np.array(raw["start_date"], dtype=np.int32),
+        "end_date": np.array(raw["end_date"], dtype=np.int32),
+        "operator_code": operator_codes,
+    })
+    vocabs["machine_code"] = machine_vocab
+    vocabs["operator_code"] = operator_vocab
+    return columns, vocabs
+
+
+# ---------------------------------------------------------------------------
+# Storage backends
+# ---------------------------------------------------------------------------
+
+def _is_arrow_path(path: PathLike) -> bool:
+    return str(path).endswith((".arrow", ".feather"))
+
+
+def _write_table(columns: Dict[str, np.ndarray], meta: Dict[str, Any], path: PathLike):
+    """Write equal-length columns plus a JSON metadata blob."""
+    if _is_arrow_path(path):
+        if pa is None:
+            raise ImportError("pyarrow is required to write Arrow IPC files")
+        table = pa.table(columns).replace_schema_metadata({META_KEY: json.dumps(meta)})
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa_ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        return
+
+    # np.savez stores members uncompressed, which is what makes mmap possible
+    np.savez(str(path), **columns, **{META_KEY: np.array(json.dumps(meta))})
+
+
+def _mmap_npz(path: PathLike) -> Dict[str, np.ndarray]:
+    """
+    Memory-map every array stored in an uncompressed .npz file.
+
+    Each member of an np.savez archive is a plain .npy file stored without
+    compression, so its data is a contiguous byte range of the zip file.
+    Compressed members, object arrays and scalars are read normally.
+    """
+    arrays = {}
+    with zipfile.ZipFile(str(path)) as archive, open(str(path), "rb") as fh:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+
+            if info.compress_type == zipfile.ZIP_STORED:
+                # Skip the local file header to reach the .npy payload
+                fh.seek(info.header_offset)
+                header = fh.read(30)
+                name_len, extra_len = struct.unpack("<HH", header[26:30])
+                fh.seek(info.header_offset + 30 + name_len + extra_len)
+
+                version = np.lib.format.read_magic(fh)
+                if version == (1, 0):
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fh)
+                else:
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fh)
+
+                if shape and not dtype.hasobject and np.prod(shape) > 0:
+                    arrays[name] = np.memmap(
+                        str(path), dtype=dtype, mode="r", offset=fh.tell(),
+                        shape=shape, order="F" if fortran_order else "C"
+                    )
+                    continue
+
+            arrays[name] = np.load(io.BytesIO(archive.read(info)), allow_pickle=False)
+    return arrays
+
+
+def _read_table(path: PathLike, mmap: bool) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Read columns and metadata written by _write_table()."""
+    if _is_arrow_path(path):
+        if pa is None:
+            raise ImportError("pyarrow is required to read Arrow IPC files")
+        source = pa.memory_map(str(path), "r") if mmap else pa.OSFile(str(path), "rb")
+        table = pa_ipc.open_file(source).read_all()
+        meta = json.loads(table.schema.metadata[META_KEY.encode()])
+        columns = {
+            name: table.column(name).to_numpy(zero_copy_only=False)
+            for name in table.column_names
+        }
+        return columns, meta
+
+    if mmap:
+        columns = _mmap_npz(path)
+    else:
+        with np.load(str(path), allow_pickle=False) as npz:
+            columns = {name: npz[name] for name in npz.files}
+    meta = json.loads(str(columns.pop(META_KEY)))
+    return columns, meta
+
+
+# ---------------------------------------------------------------------------
+# Lazy archives
+# ---------------------------------------------------------------------------
+
+def _option_list(options: Union[List[str], str]) -> List[str]:
+    """Machine options from a vocabulary entry (a "|"-joined string in version 1)."""
+    if isinstance(options, str):
+        return options.split("|") if options else []
+    return list(options)
+
+
+class JobArchive:
+    """
+    Read-only columnar job set that builds Job objects on access.
+
+    Supports len(), indexing and iteration; columns are exposed as NumPy
+    arrays in `columns` for vectorized use.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], vocabs: Dict[str, List[str]]):
+        self.columns = columns
+        self.vocabs = vocabs
+        self._product_vocab = vocabs["product_code"]
+        self._option_vocab = [_option_list(options) for options in vocabs["machine_options_code"]]
+        self._setup_vocab = vocabs["setup_requirements_code"]
+        self._skill_vocab = vocabs["operator_skill_code"]
+
+    def __len__(self) -> int:
+        return len(self.columns["job_id"])
+
+    def __getitem__(self, index: int) -> Job:
+        """Materialise the job stored at row `index`."""
+        c = self.columns
+        due_minute = int(c["due_minute"][index])
+        due_date = int(c["due_date"][index])
+        return Job(
+            job_id=str(c["job_id"][index]),
+            product_type=self._product_vocab[int(c["product_code"][index])],
+            processing_time=int(c["processing_time"][index]),
+            due_time=time(due_minute // 60, due_minute % 60),
+            priority="rush" if c["is_rush"][index] else "normal",
+            machine_options=list(self._option_vocab[int(c["machine_options_code"][index])]),
+            setup_requirements=self._setup_vocab[int(c["setup_requirements_code"][index])] or None,
+            operator_skill_required=self._skill_vocab[int(c["operator_skill_code"][index])] or None,
+            batch_size=int(c["batch_size"][index]),
+            due_date=date.fromordinal(due_date) if due_date else None
+        )
+
+    def __iter__(self) -> Iterator[Job]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_jobs(self) -> List[Job]:
+        """Materialise every job."""
+        return list(self)
+
+
+class ScheduleArchive:
+    """
+    Read-only columnar schedule that builds JobAssignments on access.
+
+    Example:
+        >>> archive = load_schedule("2024-03-04.npz")
+        >>> len(archive), archive.kpis
+        >>> first = archive[0]                 # single JobAssignment
+        >>> m1 = archive.get_machine_jobs("M1")
+        >>> payload = archive.to_dict()        # JSON at the edge
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        self.columns = columns
+        self.meta = meta
+        self.jobs = JobArchive(columns, meta["vocabs"])
+        self.machine_ids: List[str] = meta["vocabs"]["machine_code"]
+        self._operator_vocab: List[str] = meta["vocabs"]["operator_code"]
+        self.kpis: Optional[KPI] = KPI(**meta["kpis"]) if meta.get("kpis") else None
+        self.created_by: str = meta.get("created_by", "")
+        self.explanation: str = meta.get("explanation", "")
+
+    def __len__(self) -> int:
+        return len(self.columns["machine_code"])
+
+    def __getitem__(self, index: int) -> JobAssignment:
+        """Materialise the assignment stored at row `index`."""
+        c = self.columns
+        start = int(c["start_minute"][index])
+        end = int(c["end_minute"][index])
+        start_date = int(c["start_date"][index])
+        end_date = int(c["end_date"][index])
+        return JobAssignment(
+            job=self.jobs[index],
+            machine_id=self.machine_ids[int(c["machine_code"][index])],
+            start_time=time(start // 60, start % 60),
+            end_time=time(end // 60, end % 60),
+            setup_time_before=int(c["setup_time_before"][index]),
+            processing_minutes=int(c["processing_minutes"][index]),
+            start_date=date.fromordinal(start_date) if start_date else None,
+            end_date=date.fromordinal(end_date) if end_date else None,
+            operator_id=self._operator_vocab[int(c["operator_code"][index])] or None
+        )
+
+    def __iter__(self) -> Iterator[JobAssignment]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def get_machine_jobs(self, machine_id: str) -> List[JobAssignment]:
+        """Materialise only the assignments of one machine."""
+        if machine_id not in self.machine_ids:
+            return []
+        code = self.machine_ids.index(machine_id)
+        rows = np.flatnonzero(np.asarray(self.columns["machine_code"]) == code)
+        return [self[int(i)] for i in rows]
+
+    def to_schedule(self) -> Schedule:
+        """Materialise the full Schedule object."""
+        schedule = Schedule(kpis=self.kpis, created_by=self.created_by, explanation=self.explanation)
+        for assignment in self:
+            schedule.add_assignment(assignment)
+        return schedule
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly dictionary, identical to Schedule.to_dict()."""
+        return self.to_schedule().to_dict()
+
+    def __str__(self) -> str:
+        return (f"ScheduleArchive({len(self.machine_ids)} machines, "
+                f"{len(self)} jobs, KPI: {self.kpis})")
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def save_schedule(schedule: Schedule, path: PathLike):
+    """
+    Save a schedule as a columnar archive.
+
+    Args:
+        schedule: Schedule to save
+        path: Output path (.npz, or .arrow when pyarrow is installed)
+    """
+    columns, vocabs = _schedule_columns(schedule)
+    meta = {
+        "kind": "schedule",
+        "version": FORMAT_VERSION,
+        "vocabs": vocabs,
+        "kpis": schedule.kpis.__dict__ if schedule.kpis else None,
+        "created_by": schedule.created_by,
+        "explanation": schedule.explanation,
+    }
+    _write_table(columns, meta, path)
+
+
+def load_schedule(path: PathLike, mmap: bool = True) -> ScheduleArchive:
+    """
+    Load a schedule archive written by save_schedule().
+
+    Args:
+        path: Archive path
+        mmap: Memory-map the columns instead of reading them into memory
+
+    Returns:
+        ScheduleArchive with lazily materialised assignments
+    """
+    columns, meta = _read_table(path, mmap)
+    if meta.get("kind") != "schedule":
+        raise ValueError(f"{path} is not a schedule archive")
+    return ScheduleArchive(columns, meta)
+
+
+def save_jobs(jobs: List[Job], path: PathLike):
+    """
+    Save a job set as a columnar archive.
+
+    Args:
+        jobs: Jobs to save
+        path: Output path (.npz, or .arrow when pyarrow is installed)
+    """
+    columns, vocabs = _job_columns(jobs)
+    _write_table(columns, {"kind": "jobs", "version": FORMAT_VERSION, "vocabs": vocabs}, path)
+
+
+def load_jobs(path: PathLike, mmap: bool = True) -> JobArchive:
+    """
+    Load a job archive written by save_jobs().
+
+    Args:
+        path: Archive path
+        mmap: Memory-map the columns instead of reading them into memory
+
+    Returns:
+        JobArchive with lazily materialised jobs
+    """
+    columns, meta = _read_table(path, mmap)
+    if meta.get("kind") != "jobs":
+        raise ValueError(f"{path} is not a job archive")
+    return JobArchive(columns, meta["vocabs"])
+
+
+# Example usage
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from utils.data_generator import generate_random_jobs, get_demo_machines, get_demo_constraint
+    from utils.baseline_scheduler import BaselineScheduler
+
+    jobs = generate_random_jobs(200)
+    schedule, _ = BaselineScheduler().schedule(jobs, get_demo_machines(), get_demo_constraint())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        npz_path = os.path.join(tmp, "schedule.npz")
+        json_path = os.path.join(tmp, "schedule.json")
+        save_schedule(schedule, npz_path)
+        with open(json_path, "w") as f:
+            json.dump(schedule.to_dict(), f)
+
+        print(f"npz:  {os.path.getsize(npz_path):>8} bytes")
+        print(f"json: {os.path.getsize(json_path):>8} bytes")
+
+        archive = load_schedule(npz_path)
+        print(archive)
+        print(f"First assignment: {archive[0].to_dict()}")
+        assert archive.to_dict() == schedule.to_dict()
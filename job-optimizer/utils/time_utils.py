@@ -0,0 +1,38 @@
+"""
+Time Utilities - Conversions between clock times and shift minutes
+
+The schedulers reason in "minutes since midnight" internally and only
+convert back to datetime.time objects when creating JobAssignments.
+These helpers keep that arithmetic in one place.
+"""
+
+from datetime import time
+
+
+def to_minutes(t: time) -> int:
+    """
+    Convert a time of day to minutes since midnight.
+    
+    Args:
+        t: Time to convert
+        
+    Returns:
+        Minutes since midnight
+    """
+    return t.hour * 60 + t.minute
+
+
+def from_minutes(minutes: int) -> time:
+    """
+    Convert minutes since midnight back to a time of day.
+    
+    Hours are clamped at 23 the same way the schedulers always did, so a
+    value past midnight never raises.
+    
+    Args:
+        minutes: Minutes since midnight
+        
+    Returns:
+        time object
+    """
+    return time(min(minutes // 60, 23), minutes % 60)
@@ -0,0 +1,283 @@
+"""
+Warm Start - Seed an optimization run with the previous schedule
+
+Daily rolling plans overlap heavily: most of today's orders were already
+in yesterday's schedule, where they sat in good batches on suitable
+machines. Starting every run from scratch throws that work away.
+warm_start() maps the previous schedule onto the current job list
+instead, and the improvers (e.g. incremental bottleneck relief) continue
+from there.
+
+    1. Jobs that still exist keep their machine and their order on it,
+       packed from the start of the shift
+    2. Jobs that were removed are dropped
+    3. New jobs (and kept jobs that can no longer run on their old
+       machine) are inserted greedily, rush first then by due time, at the
+       cheapest position of any compatible machine: weighted tardiness of
+       the job and of every job it pushes back, plus the setup change
+
+Key Features:
+    - Keeps the seed's machine choice and batch order for surviving jobs
+    - Current job data wins (changed due times, quantities, priorities)
+    - Cheapest-position insertion for new jobs (vectorised per machine)
+    - Final timing respects downtime, rest breaks, operators and the
+      shift end; jobs that fit nowhere are reported as unplaced
+    - optimize(), compare_strategies(), solve_decomposed() and batch
+      scenarios accept the seed (see utils.anytime.WarmStartStrategy)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from models.job import Job
+from models.machine import Machine, Constraint
+from models.schedule import Schedule, JobAssignment
+from utils.placement import MachineTimeline
+from utils.processing_times import ProcessingTimeMatrix
+from utils.resources import OperatorPool
+from utils.time_utils import to_minutes
+
+
+@dataclass
+class WarmStartReport:
+    """How the seed schedule was mapped onto the current jobs."""
+    kept: int = 0                                          # Jobs on their seed machine, in seed order
+    dropped: List[str] = field(default_factory=list)       # Seed jobs no longer in the job list
+    inserted: List[str] = field(default_factory=list)      # New jobs placed greedily
+    relocated: List[str] = field(default_factory=list)     # Seed jobs that had to change machine
+    unplaced: List[str] = field(default_factory=list)      # Jobs that fit nowhere
+
+    def __str__(self) -> str:
+        return (f"WarmStartReport({self.kept} kept, {len(self.dropped)} dropped, "
+                f"{len(self.inserted)} inserted, {len(self.relocated)} relocated, "
+                f"{len(self.unplaced)} unplaced)")
+
+
+def _seed_order(assignment: JobAssignment) -> Tuple[int, int]:
+    """Position of an assignment in the seed: day, then block start."""
+    day = assignment.start_date.toordinal() if assignment.start_date else 0
+    return day, to_minutes(assignment.start_time) - assignment.setup_time_before
+
+
+def _job_weight(job: Job, constraint: Constraint) -> float:
+    return constraint.rush_job_weight if job.is_rush else constraint.normal_job_weight
+
+
+class _Sequence:
+    """
+    One machine's job order, with the arrays needed to price insertions.
+
+    The machine is assumed to run the sequence back to back from the
+    shift start. Downtime and operators are ignored here; the final
+    timing takes them into account.
+    """
+
+    def __init__(self, machine_id: str, constraint: Constraint, setup_matrix: np.ndarray,
+                 product_codes: Dict[str, int], durations: ProcessingTimeMatrix):
+        self.machine_id = machine_id
+        self.constraint = constraint
+        self.setup_matrix = setup_matrix
+        self.product_codes = product_codes
+        self.durations = durations
+        self.jobs: List[Job] = []
+        self._stale = True
+
+    def append(self, job: Job):
+        self.jobs.append(job)
+        self._stale = True
+
+    def insert(self, position: int, job: Job):
+        self.jobs.insert(position, job)
+        self._stale = True
+
+    def _refresh(self):
+        jobs = self.jobs
+        self.codes = np.array([self.product_codes[j.product_type] for j in jobs], dtype=np.int64)
+        self.setup = np.zeros(len(jobs), dtype=np.int64)
+        if len(jobs) > 1:
+            self.setup[1:] = self.setup_matrix[self.codes[:-1], self.codes[1:]]
+        work = np.array([self.durations.duration(j.job_id, self.machine_id) for j in jobs], dtype=np.int64)
+        self.end = to_minutes(self.constraint.shift_start) + np.cumsum(self.setup + work)
+        self.due = np.array([to_minutes(j.due_time) for j in jobs], dtype=np.int64)
+        self.weight = np.array([_job_weight(j, self.constraint) for j in jobs], dtype=float)
+        self.late = np.maximum(self.end - self.due, 0)
+        self._stale = False
+
+    def cheapest(self, job: Job) -> Tuple[float, int]:
+        """
+        Best position for a job: weighted tardiness of the job itself,
+        the extra weighted tardiness of every later job (they all shift by
+        the inserted block, net of the setup it saves or adds), and the
+        change in setup time.
+
+        Returns:
+            (cost, position); position len(jobs) means "append"
+        """
+        if self._stale:
+            self._refresh()
+        n = len(self.jobs)
+        code = self.product_codes[job.product_type]
+        duration = self.durations.duration(job.job_id, self.machine_id)
+
+        before = np.zeros(n + 1, dtype=np.int64)   # Setup of the new job
+        before[1:] = self.setup_matrix[self.codes, code]
+        after = np.zeros(n + 1, dtype=np.int64)    # New setup of the job after it
+        after[:n] = self.setup_matrix[code, self.codes]
+        replaced = np.zeros(n + 1, dtype=np.int64)  # Old setup of the job after it
+        replaced[:n] = self.setup
+
+        own_end = np.concatenate(([to_minutes(self.constraint.shift_start)], self.end)) + before + duration
+        # Every job from position k on moves by shift[k]
+        shift = before + duration + after - replaced
+        extra = np.maximum(self.end[None, :] + shift[:, None] - self.due[None, :], 0) - self.late[None, :]
+        extra = np.where(np.arange(n)[None, :] >= np.arange(n + 1)[:, None], extra, 0)
+
+        cost = (self.constraint.tardiness_weight * (
+                    _job_weight(job, self.constraint) * np.maximum(own_end - to_minutes(job.due_time), 0)
+                    + extra @ self.weight)
+                + self.constraint.setup_weight * (before + after - replaced))
+        position = int(np.argmin(cost))
+        return float(cost[position]), position
+
+
+def _insert_earliest_finish(
+    job: Job,
+    timelines: Dict[str, MachineTimeline],
+    durations: ProcessingTimeMatrix
+) -> bool:
+    """Insert a job into the gap on a compatible machine where it finishes first."""
+    best = None
+    for machine in durations.compatible(job):
+        timeline = timelines[machine.machine_id]
+        slot = timeline.find_slot(job, duration=durations.duration(job.job_id, machine.machine_id))
+        if slot is not None and (best is None or slot.end < best[0].end):
+            best = (slot, timeline)
+    if best is None:
+        return False
+    best[1].commit(best[0], job)
+    return True
+
+
+def warm_start(
+    seed: Schedule,
+    jobs: List[Job],
+    machines: List[Machine],
+    constraint: Constraint,
+    created_by: str = "Warm Start"
+) -> Tuple[Schedule, WarmStartReport]:
+    """
+    Map a previous schedule onto the current job list.
+
+    The seed only provides machines and order; all times are recomputed
+    for the current shift, downtime and operators. The seed is not
+    modified.
+
+    Args:
+        seed: Previous schedule (e.g. yesterday's plan)
+        jobs: Current job list
+        machines: Available machines
+        constraint: Scheduling constraints
+        created_by: Label for the new schedule
+
+    Returns:
+        Tuple of (Schedule, WarmStartReport); KPIs not yet calculated
+    """
+    jobs_by_id = {job.job_id: job for job in jobs}
+    durations = ProcessingTimeMatrix(jobs, machines)
+    report = WarmStartReport()
+
+    # 1. Surviving jobs: same machine, same order
+    products = sorted({job.product_type for job in jobs})
+    product_codes = {product: i for i, product in enumerate(products)}
+    setup_matrix = np.array([[constraint.get_setup_time(a, b) for b in products] for a in products],
+                            dtype=np.int64).reshape(len(products), len(products))
+    sequences: Dict[str, _Sequence] = {
+        m.machine_id: _Sequence(m.machine_id, constraint, setup_matrix, product_codes, durations) for m in machines
+    }
+    seen = set()
+    relocated: List[Job] = []
+    for machine_id, assignments in seed.assignments.items():
+        for assignment in sorted(assignments, key=_seed_order):
+            job = jobs_by_id.get(assignment.job.job_id)
+            if job is None:
+                report.dropped.append(assignment.job.job_id)
+                continue
+            if job.job_id in seen:
+                continue  # Listed twice in the seed; keep the first
+            seen.add(job.job_id)
+            if machine_id in sequences and durations.duration(job.job_id, machine_id) >= 0:
+                sequences[machine_id].append(job)
+            else:
+                relocated.append(job)
+
+    # 2. New jobs and jobs that lost their machine, most urgent first,
+    #    at the cheapest position of any compatible machine
+    new_jobs = [job for job in jobs if job.job_id not in seen]
+    for job in sorted(relocated + new_jobs, key=lambda j: (0 if j.is_rush else 1, j.due_time, j.job_id)):
+        options = [sequences[m.machine_id].cheapest(job) + (m.machine_id,) for m in durations.compatible(job)]
+        if not options:
+            report.unplaced.append(job.job_id)
+            continue
+        _, position, machine_id = min(options)
+        sequences[machine_id].insert(position, job)
+        if job.job_id in seen:
+            report.relocated.append(job.job_id)
+        else:
+            report.inserted.append(job.job_id)
+
+    # 3. Time every sequence in order; jobs that no longer fit the shift
+    #    (plus overtime) go to the first gap where they finish earliest
+    operators = OperatorPool(constraint.operators, machines)
+    window_end = to_minutes(constraint.shift_end) + constraint.max_overtime_minutes
+    timelines: Dict[str, MachineTimeline] = {
+        m.machine_id: MachineTimeline(m, constraint, end=window_end, operators=operators) for m in machines
+    }
+    overflow: List[Job] = []
+    for machine_id, sequence in sequences.items():
+        ready = None
+        for job in sequence.jobs:
+            placed = timelines[machine_id].place(job, ready, durations.duration(job.job_id, machine_id))
+            if placed is None:
+                overflow.append(job)
+                continue
+            ready = to_minutes(placed.end_time)
+    for job in overflow:
+        if not _insert_earliest_finish(job, timelines, durations):
+            report.unplaced.append(job.job_id)
+        elif job.job_id in seen and job.job_id not in report.relocated:
+            report.relocated.append(job.job_id)
+    report.kept = sum(1 for job_id in seen if job_id not in report.relocated and job_id not in report.unplaced)
+
+    schedule = Schedule(created_by=created_by)
+    for machine_id, timeline in timelines.items():
+        assignments = timeline.assignments()
+        if assignments:
+            schedule.set_machine_jobs(machine_id, assignments)
+    return schedule, report
+
+
+# Example usage
+if __name__ == "__main__":
+    import random
+    import time as clock
+    from utils.baseline_scheduler import BaselineScheduler
+    from utils.data_generator import generate_random_jobs, get_demo_machines, get_demo_constraint
+
+    machines = get_demo_machines()
+    constraint = get_demo_constraint()
+    yesterday = generate_random_jobs(40)
+    seed, _ = BaselineScheduler("atcs").schedule(yesterday, machines, constraint)
+
+    # Today: 80% of yesterday's orders plus some new ones
+    random.seed(1)
+    today = random.sample(yesterday, 32) + [
+        job for job in generate_random_jobs(48) if job.job_id not in {j.job_id for j in yesterday}
+    ][:8]
+
+    started = clock.perf_counter()
+    schedule, report = warm_start(seed, today, machines, constraint)
+    schedule.calculate_kpis(machines, constraint)
+    print(f"{report} in {(clock.perf_counter() - started) * 1000:.1f} ms")
+    print(schedule)